@@ -1,15 +1,190 @@
 """GoogleAds Authentication."""
 
+import hashlib
 import json
-from typing import Optional
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional
 
 import requests
 from singer_sdk.authenticators import OAuthAuthenticator, SingletonMeta
 from singer_sdk.helpers._util import utc_now
 from singer_sdk.streams import Stream as RESTStreamBase
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-class ProxyGoogleAdsAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
+# refresh access tokens this long before they expire
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+
+class TokenCache:
+    """JSON file of access tokens shared between tap processes.
+
+    Tokens are keyed by a hash of the credentials used to obtain them. Reads and
+    writes are serialised across processes with a lock file where supported.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the cache."""
+        if fcntl is None:
+            yield
+            return
+
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as cache_file:
+                return json.load(cache_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached token for a key, if any."""
+        return self._read().get(key)
+
+    def set(self, key: str, token: dict) -> None:
+        """Cache a token, replacing the cache file atomically."""
+        tokens = {**self._read(), key: token}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+
+        with os.fdopen(fd, "w") as temp_file:
+            json.dump(tokens, temp_file)
+
+        os.replace(temp_path, self.path)
+
+
+class ProactiveRefreshMixin:
+    """Refresh access tokens ahead of expiry, off the request path.
+
+    After each refresh, a background timer refreshes the token again shortly
+    before it expires, so requests only block on a
+    refresh if the token could not be refreshed in time. If `token_cache_path` is
+    configured, tokens are shared with other tap processes through a `TokenCache`.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._token_lock = threading.Lock()
+        self._refresh_timer: Optional[threading.Timer] = None
+
+    @property
+    def token_cache(self) -> Optional[TokenCache]:
+        path = self.config.get("token_cache_path")
+        return TokenCache(path) if path else None
+
+    @property
+    def token_cache_key(self) -> str:
+        """Return a hash identifying the credentials the token is obtained with."""
+        credentials = json.dumps(
+            [self.auth_endpoint, self.config.get("oauth_credentials")],
+            sort_keys=True,
+        )
+        return hashlib.sha256(credentials.encode()).hexdigest()
+
+    @property
+    def refresh_margin_seconds(self) -> float:
+        # never refresh short-lived tokens continuously
+        return min(TOKEN_REFRESH_MARGIN_SECONDS, (self.expires_in or 0) / 2)
+
+    @property
+    def token_seconds_remaining(self) -> Optional[float]:
+        if self.last_refreshed is None:
+            return 0
+        if not self.expires_in:
+            return None
+
+        return self.expires_in - (utc_now() - self.last_refreshed).total_seconds()
+
+    def authenticate_request(
+        self,
+        request: requests.PreparedRequest,
+    ) -> requests.PreparedRequest:
+        if not self.is_token_valid():
+            with self._token_lock:
+                if not self.is_token_valid():
+                    self.refresh_access_token()
+
+        return super().authenticate_request(request)
+
+    def refresh_access_token(self) -> None:
+        """Obtain a new access token, from the token cache if it has a fresh one."""
+        token_cache = self.token_cache
+
+        if token_cache is None:
+            self.update_access_token()
+        else:
+            with token_cache.lock():
+                cached_token = token_cache.get(self.token_cache_key)
+
+                if cached_token:
+                    self.access_token = cached_token["access_token"]
+                    self.expires_in = cached_token["expires_in"]
+                    self.last_refreshed = datetime.fromisoformat(
+                        cached_token["last_refreshed"]
+                    )
+
+                remaining = self.token_seconds_remaining
+                if not cached_token or (
+                    remaining is not None and remaining <= self.refresh_margin_seconds
+                ):
+                    self.update_access_token()
+                    token_cache.set(
+                        self.token_cache_key,
+                        {
+                            "access_token": self.access_token,
+                            "expires_in": self.expires_in,
+                            "last_refreshed": self.last_refreshed.isoformat(),
+                        },
+                    )
+                else:
+                    self.logger.info("Using cached OAuth access token.")
+
+        self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+
+        remaining = self.token_seconds_remaining
+        if remaining is None:
+            return
+
+        self._refresh_timer = threading.Timer(
+            max(remaining - self.refresh_margin_seconds, 0),
+            self._refresh_in_background,
+        )
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            with self._token_lock:
+                self.refresh_access_token()
+        except Exception as e:
+            # the token is refreshed on the request path once it expires
+            self.logger.warning("Background OAuth token refresh failed: %s", e)
+
+
+class ProxyGoogleAdsAuthenticator(
+    ProactiveRefreshMixin, OAuthAuthenticator, metaclass=SingletonMeta
+):
     """API Authenticator for Proxy OAuth 2.0 flows."""
 
     def __init__(
@@ -70,7 +245,9 @@ class ProxyGoogleAdsAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
 
 # The SingletonMeta metaclass makes your streams reuse the same authenticator instance.
 # If this behaviour interferes with your use-case, you can remove the metaclass.
-class GoogleAdsAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
+class GoogleAdsAuthenticator(
+    ProactiveRefreshMixin, OAuthAuthenticator, metaclass=SingletonMeta
+):
     """Authenticator class for GoogleAds."""
 
     @property
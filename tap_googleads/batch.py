@@ -0,0 +1,185 @@
+"""Columnar batch output for tap-googleads."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import typing as t
+from uuid import uuid4
+
+from singer_sdk.batch import BaseBatcher
+
+if t.TYPE_CHECKING:
+    import pyarrow as pa
+    from singer_sdk.helpers._batch import BatchConfig
+
+
+def _non_null_type(property_schema: dict) -> str:
+    types = property_schema.get("type", "string")
+
+    if isinstance(types, str):
+        return types
+
+    return next((type_ for type_ in types if type_ != "null"), "string")
+
+
+def arrow_type(property_schema: dict) -> pa.DataType:
+    """Return the Arrow data type for a JSON schema property."""
+    import pyarrow as pa
+
+    json_type = _non_null_type(property_schema)
+
+    if json_type == "array":
+        return pa.list_(arrow_type(property_schema.get("items", {})))
+    if json_type == "integer":
+        return pa.int64()
+    if json_type == "number":
+        return pa.float64()
+    if json_type == "boolean":
+        return pa.bool_()
+    if property_schema.get("format") == "date":
+        return pa.date32()
+
+    return pa.string()
+
+
+def arrow_schema(json_schema: dict) -> pa.Schema:
+    """Return the Arrow schema for a stream JSON schema."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field(name, arrow_type(property_schema))
+            for name, property_schema in json_schema["properties"].items()
+        ]
+    )
+
+
+def _converter(data_type: pa.DataType) -> t.Callable[[t.Any], t.Any]:
+    import pyarrow as pa
+
+    if pa.types.is_list(data_type):
+        convert_item = _converter(data_type.value_type)
+        return lambda v: [convert_item(i) for i in v]
+    if pa.types.is_integer(data_type):
+        return int
+    if pa.types.is_floating(data_type):
+        return float
+    if pa.types.is_boolean(data_type):
+        return bool
+    if pa.types.is_date(data_type):
+        return lambda v: datetime.date.fromisoformat(v[:10])
+
+    # some fields are returned as JSON objects under a string-typed property
+    return lambda v: v if isinstance(v, str) else json.dumps(v)
+
+
+class ColumnarBuffer:
+    """Accumulates records into typed columns for a given Arrow schema."""
+
+    def __init__(self, schema: pa.Schema) -> None:
+        self.schema = schema
+        self._converters = {f.name: _converter(f.type) for f in schema}
+        self._columns: dict[str, list] = {f.name: [] for f in schema}
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append(self, record: dict) -> None:
+        """Append a record, casting each value to its column type."""
+        for name, column in self._columns.items():
+            value = record.get(name)
+            column.append(None if value is None else self._converters[name](value))
+
+        self._length += 1
+
+    def to_table(self) -> pa.Table:
+        """Return the buffered columns as an Arrow table."""
+        import pyarrow as pa
+
+        return pa.Table.from_pydict(self._columns, schema=self.schema)
+
+    def clear(self) -> None:
+        """Drop all buffered values."""
+        for column in self._columns.values():
+            column.clear()
+
+        self._length = 0
+
+
+class ParquetBatcher(BaseBatcher):
+    """Writes one Parquet file per stream/customer/chunk of records."""
+
+    def __init__(
+        self,
+        tap_name: str,
+        stream_name: str,
+        batch_config: BatchConfig,
+        schema: dict,
+        customer_id: str | None = None,
+        date_key: str | None = None,
+    ) -> None:
+        super().__init__(tap_name, stream_name, batch_config)
+        self.schema = schema
+        self.customer_id = customer_id
+        self.date_key = date_key
+
+    def _filename(self, sync_id: str, index: int, dates: list[str]) -> str:
+        prefix = self.batch_config.storage.prefix or ""
+        parts = [f"{self.tap_name}--{self.stream_name}"]
+
+        if self.customer_id:
+            parts.append(self.customer_id)
+
+        if dates:
+            parts.append(f"{min(dates)}_{max(dates)}")
+
+        parts.append(f"{sync_id}={index}")
+        return prefix + "-".join(parts) + ".parquet"
+
+    def _write(self, buffer: ColumnarBuffer, filename: str) -> str:
+        import pyarrow.parquet as pq
+
+        compression = (
+            "GZIP" if self.batch_config.encoding.compression == "gzip" else "SNAPPY"
+        )
+
+        with self.batch_config.storage.fs(create=True) as fs:
+            with fs.open(filename, "wb") as f:
+                pq.write_table(buffer.to_table(), f, compression=compression)
+
+            return fs.geturl(filename)
+
+    def get_batches(
+        self,
+        records: t.Iterator[dict],
+    ) -> t.Iterator[list[str]]:
+        """Yield a manifest for each Parquet file written.
+
+        Args:
+            records: The records to batch.
+
+        Yields:
+            A list of file paths (called a manifest).
+        """
+        buffer = ColumnarBuffer(arrow_schema(self.schema))
+        sync_id = str(uuid4())
+        dates: list[str] = []
+        index = 0
+
+        for record in records:
+            buffer.append(record)
+
+            if self.date_key and record.get(self.date_key):
+                dates.append(record[self.date_key])
+
+            if len(buffer) >= self.batch_config.batch_size:
+                index += 1
+                yield [self._write(buffer, self._filename(sync_id, index, dates))]
+                buffer.clear()
+                dates.clear()
+
+        if buffer:
+            index += 1
+            yield [self._write(buffer, self._filename(sync_id, index, dates))]
@@ -0,0 +1,124 @@
+"""Archive of raw API responses, to replay syncs without network access."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from singer_sdk.exceptions import FatalAPIError
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMissError(FatalAPIError):
+    """Raised when a replayed request was not recorded."""
+
+
+def request_key(prepared_request: requests.PreparedRequest) -> Dict[str, Any]:
+    """Return what identifies the response to a request: path, query and page."""
+    url = urlparse(prepared_request.url)
+    body: Dict[str, Any] = {}
+
+    if prepared_request.body:
+        body = json.loads(prepared_request.body)
+
+    page_token = parse_qs(url.query).get("pageToken", [body.get("pageToken")])[0]
+    query = body.get("query")
+
+    return {
+        "method": prepared_request.method,
+        "path": url.path,
+        "query": query and " ".join(query.split()),
+        "page_token": page_token,
+    }
+
+
+class Cassette:
+    """Directory of API responses, content-addressed by request path, query and page.
+
+    In `record` mode, responses are archived as they are received. In `replay`
+    mode, requests are served from the archive and never sent. Page tokens of
+    replayed responses are those that were recorded, so paginated queries replay
+    in full.
+    """
+
+    def __init__(self, directory: str, mode: str = RECORD) -> None:
+        if mode not in (RECORD, REPLAY):
+            msg = f"Cassette mode must be '{RECORD}' or '{REPLAY}', got '{mode}'"
+            raise ValueError(msg)
+
+        self.directory = Path(directory)
+        self.mode = mode
+
+        if mode == RECORD:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def _path(self, key: Dict[str, Any]) -> Path:
+        content = json.dumps(key, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json.gz"
+
+    def record(
+        self,
+        prepared_request: requests.PreparedRequest,
+        response: requests.Response,
+    ) -> None:
+        """Archive the response to a request."""
+        key = request_key(prepared_request)
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        entry = {
+            "request": key,
+            "status_code": response.status_code,
+            "content_type": response.headers.get("Content-Type"),
+            "body": response.text,
+        }
+
+        fd, temp_path = tempfile.mkstemp(dir=path.parent)
+        os.close(fd)
+
+        with gzip.open(temp_path, "wt") as temp_file:
+            json.dump(entry, temp_file)
+
+        os.replace(temp_path, path)
+
+    def replay(self, prepared_request: requests.PreparedRequest) -> requests.Response:
+        """Return the archived response to a request."""
+        key = request_key(prepared_request)
+        entry = self._read(key)
+
+        if entry is None:
+            msg = f"No recorded response in {self.directory} for request {key}"
+            raise CassetteMissError(msg)
+
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response._content = entry["body"].encode()
+        response.encoding = "utf-8"
+        response.url = prepared_request.url
+        response.request = prepared_request
+
+        if entry["content_type"]:
+            response.headers["Content-Type"] = entry["content_type"]
+
+        return response
+
+    def _read(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(self._path(key), "rt") as entry_file:
+                return json.load(entry_file)
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+import humps
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+
+CHANGE_STATUS_STATE_KEY = "change_status"
+
+# https://developers.google.com/google-ads/api/docs/change-status
+CHANGE_STATUS_LOOKBACK_DAYS = 90
+CHANGE_STATUS_LIMIT = 10000
+CHANGE_STATUS_DATETIME_FORMAT = r"%Y-%m-%d %H:%M:%S"
+
+RESOURCE_NAMES_PER_QUERY = 500
+
+
+class ChangeStatusStream(DynamicQueryStream):
+    """Define entity stream class that can sync only changed entities.
+
+    When `enable_change_status_sync` is set, the `change_status` resource is queried
+    for entities changed since the last sync of a customer, and only those entities
+    are requested. A full sync is run on the first sync of a customer, every
+    `change_status_full_refresh_days` and whenever changes cannot be fully
+    resolved from `change_status`.
+    """
+
+    change_status_resource_type: str  # e.g. AD_GROUP_CRITERION
+
+    _changed_resource_names: Optional[List[str]] = None
+
+    @property
+    def resource_name_field(self) -> str:
+        return f"{self.change_status_resource_type.lower()}.resource_name"
+
+    def get_query_filters(self, context) -> List[str]:
+        conditions = super().get_query_filters(context)
+
+        if self._changed_resource_names is not None:
+            resource_names = ", ".join(f"'{r}'" for r in self._changed_resource_names)
+            conditions.append(f"{self.resource_name_field} IN ({resource_names})")
+
+        return conditions
+
+    def _requires_full_refresh(self, change_status_state: Optional[dict]) -> bool:
+        if not change_status_state:
+            return True
+
+        now = datetime.now(timezone.utc)
+        last_change_date_time = datetime.strptime(
+            change_status_state["last_change_date_time"][:19],
+            CHANGE_STATUS_DATETIME_FORMAT,
+        ).replace(tzinfo=timezone.utc)
+
+        lookback = timedelta(days=CHANGE_STATUS_LOOKBACK_DAYS - 1)
+        if now - last_change_date_time >= lookback:
+            return True
+
+        full_refresh_date = datetime.fromisoformat(
+            change_status_state["full_refresh_date"]
+        ).replace(tzinfo=timezone.utc)
+        full_refresh_days = self.config["change_status_full_refresh_days"]
+
+        return now - full_refresh_date >= timedelta(days=full_refresh_days)
+
+    def get_changed_resource_names(
+        self, context, since: str
+    ) -> Optional[Tuple[List[str], str]]:
+        """Return entities changed since a change date time, and the latest change.
+
+        Returns `None` if there are too many changes to resolve from `change_status`.
+        """
+        until = (datetime.now(timezone.utc) + timedelta(days=1)).strftime(
+            CHANGE_STATUS_DATETIME_FORMAT
+        )
+        resource_field = f"change_status.{self.change_status_resource_type.lower()}"
+
+        rows = list(
+            self.search(
+                context,
+                f"""
+                SELECT
+                  {resource_field},
+                  change_status.last_change_date_time
+                FROM change_status
+                WHERE change_status.resource_type = '{self.change_status_resource_type}'
+                  AND change_status.last_change_date_time >= '{since}'
+                  AND change_status.last_change_date_time <= '{until}'
+                ORDER BY change_status.last_change_date_time
+                LIMIT {CHANGE_STATUS_LIMIT}
+                """,
+            )
+        )
+
+        if len(rows) >= CHANGE_STATUS_LIMIT:
+            return None
+
+        resource_key = humps.camelize(self.change_status_resource_type.lower())
+        resource_names = sorted(
+            {
+                r["changeStatus"][resource_key]
+                for r in rows
+                if resource_key in r["changeStatus"]
+            }
+        )
+        last_change_date_time = max(
+            (r["changeStatus"]["lastChangeDateTime"] for r in rows), default=since
+        )
+
+        return resource_names, last_change_date_time
+
+    def request_records(self, context):
+        if not self.config.get("enable_change_status_sync") or not context:
+            yield from super().request_records(context)
+            return
+
+        state = self.get_context_state(context)
+        change_status_state = state.get(CHANGE_STATUS_STATE_KEY)
+        changes = None
+
+        if not self._requires_full_refresh(change_status_state):
+            changes = self.get_changed_resource_names(
+                context, change_status_state["last_change_date_time"]
+            )
+
+        if changes is None:
+            self.logger.info("Running full sync of %s for %s", self.name, context)
+
+            # allow for the account time zone - changes in the overlap are synced again
+            last_change_date_time = (
+                datetime.now(timezone.utc) - timedelta(days=1)
+            ).strftime(CHANGE_STATUS_DATETIME_FORMAT)
+
+            yield from super().request_records(context)
+
+            state[CHANGE_STATUS_STATE_KEY] = {
+                "last_change_date_time": last_change_date_time,
+                "full_refresh_date": datetime.now(timezone.utc).date().isoformat(),
+            }
+            return
+
+        resource_names, last_change_date_time = changes
+        self.logger.info(
+            "Syncing %d changed entities of %s for %s",
+            len(resource_names),
+            self.name,
+            context,
+        )
+
+        try:
+            for start in range(0, len(resource_names), RESOURCE_NAMES_PER_QUERY):
+                end = start + RESOURCE_NAMES_PER_QUERY
+                self._changed_resource_names = resource_names[start:end]
+                yield from super().request_records(context)
+        finally:
+            self._changed_resource_names = None
+
+        state[CHANGE_STATUS_STATE_KEY] = {
+            **change_status_state,
+            "last_change_date_time": last_change_date_time,
+        }
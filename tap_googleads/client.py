@@ -3,13 +3,16 @@
 from datetime import datetime
 from functools import cached_property
 from http import HTTPStatus
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 import requests
 from singer_sdk.authenticators import OAuthAuthenticator
+from singer_sdk.exceptions import FatalAPIError
 from singer_sdk.streams import RESTStream
 
 from tap_googleads.auth import GoogleAdsAuthenticator, ProxyGoogleAdsAuthenticator
+from tap_googleads.denied_customers import denied_customer_error_code
+from tap_googleads.record_hashes import RecordHashStore
 
 # remove old versions once they have been sunset
 # https://developers.google.com/google-ads/api/docs/sunset-dates#timetable
@@ -31,6 +34,10 @@ class ResumableAPIError(Exception):
         self.response = response
 
 
+class InvalidPageTokenError(FatalAPIError):
+    """Raised when a page token is expired or does not match the query."""
+
+
 class GoogleAdsStream(RESTStream):
     """GoogleAds stream class."""
 
@@ -80,6 +87,13 @@ class GoogleAdsStream(RESTStream):
             msg = self.response_error_message(response)
             raise ResumableAPIError(msg, response)
 
+        # e.g. EXPIRED_PAGE_TOKEN, INVALID_PAGE_TOKEN
+        if (
+            response.status_code == HTTPStatus.BAD_REQUEST
+            and "PAGE_TOKEN" in response.text
+        ):
+            raise InvalidPageTokenError(self.response_error_message(response))
+
         super().validate_response(response)
 
     @cached_property
@@ -148,11 +162,170 @@ class GoogleAdsStream(RESTStream):
         #     params["order_by"] = self.replication_key
         return params
 
+    @property
+    def record_hash_store(self) -> Optional[RecordHashStore]:
+        """Return the store used to suppress unchanged records, if enabled.
+
+        Streams with children always emit all records, as child contexts are
+        generated from them.
+        """
+        if not self.primary_keys or self.child_streams:
+            return None
+
+        return self._tap.record_hash_store
+
+    def build_prepared_request(self, *args, **kwargs) -> requests.PreparedRequest:
+        cassette = self._tap.cassette
+
+        # replayed requests are never sent, so need no access token
+        if cassette and cassette.replaying:
+            request = requests.Request(*args, **kwargs)
+            return self.requests_session.prepare_request(request)
+
+        return super().build_prepared_request(*args, **kwargs)
+
+    def _send_request(self, prepared_request, context) -> requests.Response:
+        hedger = self._tap.hedger
+
+        # search requests are read-only, so can be sent twice
+        if not (
+            hedger and prepared_request.path_url.split("?")[0].endswith(":search")
+        ):
+            return super()._request(prepared_request, context)
+
+        # attempts run on other threads, so do not share the stream session
+        def send(session: requests.Session) -> requests.Response:
+            response = session.send(
+                prepared_request.copy(),
+                timeout=self.timeout,
+                allow_redirects=self.allow_redirects,
+            )
+            self.validate_response(response)
+            return response
+
+        response = hedger.send(self.name, send)
+
+        # logged for the attempt that was used only
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        return response
+
+    def _request(self, prepared_request, context) -> requests.Response:
+        cassette = self._tap.cassette
+
+        if cassette is None:
+            return self._send_request(prepared_request, context)
+
+        if cassette.replaying:
+            response = cassette.replay(prepared_request)
+            self.validate_response(response)
+            return response
+
+        try:
+            response = self._send_request(prepared_request, context)
+        except ResumableAPIError as e:
+            cassette.record(prepared_request, e.response)
+            raise
+
+        cassette.record(prepared_request, response)
+        return response
+
+    def _write_state_message(self) -> None:
+        if not self._is_state_flushed and self._tap.withhold_state_message():
+            return
+
+        super()._write_state_message()
+
+    def sync(self, context=None):
+        profiler = self._tap.profiler
+
+        if profiler is None:
+            return super().sync(context)
+
+        with profiler.profile(self.name):
+            return super().sync(context)
+
     def get_records(self, context):
+        """Yield the records of the context.
+
+        Returns whether the context was synced completely, rather than skipped or
+        cut short by a resumable API error.
+        """
+        customer_id = context and context.get("customer_id")
+        denied_customers = self._tap.denied_customers
+
+        if customer_id in denied_customers:
+            self.logger.info(
+                "Skipping %s for customer %s, access was denied (%s)",
+                self.name,
+                customer_id,
+                denied_customers.reason(customer_id),
+            )
+            return False
+
+        record_hash_store = self.record_hash_store
+        rows = 0
+        unchanged_rows = 0
+        completed = True
+
         try:
-            yield from super().get_records(context)
+            for record in super().get_records(context):
+                rows += 1
+
+                if record_hash_store and not record_hash_store.update(
+                    self.name, self.primary_keys, record, context
+                ):
+                    unchanged_rows += 1
+                    continue
+
+                yield record
         except ResumableAPIError as e:
             self.logger.warning(e)
+            completed = False
+            error_code = denied_customer_error_code(e.response)
+
+            # skip requests for the customer in other streams
+            if customer_id and error_code:
+                denied_customers.add(customer_id, error_code)
+
+        if record_hash_store:
+            record_hash_store.commit()
+            self.logger.info(
+                "Suppressed %d of %d unchanged records for %s",
+                unchanged_rows,
+                rows,
+                context,
+            )
+
+        return completed
+
+    def search(self, context, query: str) -> Iterable[dict]:
+        """Yield the result rows of a GAQL query for the context customer."""
+        decorated_request = self.request_decorator(self._request)
+        params: Dict[str, Any] = {}
+
+        while True:
+            prepared_request = self.build_prepared_request(
+                method="POST",
+                url=self.get_url(context),
+                params=params,
+                headers=self.http_headers,
+                json={"query": " ".join(query.split())},
+            )
+            response_data = decorated_request(prepared_request, context).json()
+
+            yield from response_data.get("results", [])
+
+            if not response_data.get("nextPageToken"):
+                return
+
+            params["pageToken"] = response_data["nextPageToken"]
 
     @property
     def gaql(self) -> str:
@@ -176,6 +349,25 @@ class GoogleAdsStream(RESTStream):
 
         return None
 
+    def get_starting_replication_key_value(self, context) -> Optional[Any]:
+        """Return the starting replication value of a context.
+
+        Outside of a sync, e.g. when planning queries, no starting value has been
+        written to the context state, so it is taken from the bookmark as a sync would.
+        """
+        value = super().get_starting_replication_key_value(context)
+
+        if value is None and self.replication_key:
+            state = self.get_context_state(context)
+
+            if state.get("replication_key") == self.replication_key:
+                value = state.get("replication_key_value")
+
+            if value:
+                value = self.compare_start_date(value, self.config["start_date"])
+
+        return value
+
     @property
     def start_date(self):
         start_value = (
@@ -0,0 +1,119 @@
+"""Registry of customers the tap is not permitted to access."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# authorization errors that deny access to all resources of a customer
+# https://developers.google.com/google-ads/api/reference/rpc/latest/AuthorizationErrorEnum.AuthorizationError
+DENIED_CUSTOMER_ERROR_CODES = ("USER_PERMISSION_DENIED", "CUSTOMER_NOT_ENABLED")
+
+
+def denied_customer_error_code(response: requests.Response) -> Optional[str]:
+    """Return the error code of a response denying access to a customer, if any."""
+    try:
+        details = response.json()["error"].get("details", [])
+    except (ValueError, KeyError, AttributeError):
+        return None
+
+    for detail in details:
+        for error in detail.get("errors", []):
+            for error_code in error.get("errorCode", {}).values():
+                if error_code in DENIED_CUSTOMER_ERROR_CODES:
+                    return error_code
+
+    return None
+
+
+class DeniedCustomers:
+    """Customers that were denied access, so requests for them can be skipped.
+
+    If a path is given, denied customers are persisted to that JSON file and
+    skipped by later runs until `ttl` has passed. Updates of the file are
+    serialised across processes with a lock file where supported.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: timedelta = timedelta(0)):
+        self.path = path
+        self.ttl = ttl
+        self._customers: Dict[str, dict] = {}
+
+        if path:
+            self._customers = {
+                customer_id: denial
+                for customer_id, denial in self._read().items()
+                if not self._expired(denial)
+            }
+
+    def _expired(self, denial: dict) -> bool:
+        denied_at = datetime.fromisoformat(denial["denied_at"])
+        return datetime.now(timezone.utc) - denied_at >= self.ttl
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the file."""
+        if fcntl is None:
+            yield
+            return
+
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as denied_customers_file:
+                return json.load(denied_customers_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self) -> None:
+        # keep denials recorded by other processes since this one started
+        customers = {
+            customer_id: denial
+            for customer_id, denial in self._read().items()
+            if not self._expired(denial)
+        }
+        customers.update(self._customers)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+
+        with os.fdopen(fd, "w") as temp_file:
+            json.dump(customers, temp_file)
+
+        os.replace(temp_path, self.path)
+
+    def __contains__(self, customer_id: str) -> bool:
+        return customer_id in self._customers
+
+    def reason(self, customer_id: str) -> Optional[str]:
+        """Return why access to a customer was denied, if it was."""
+        denial = self._customers.get(customer_id)
+        return denial and denial["reason"]
+
+    def add(self, customer_id: str, reason: str) -> None:
+        """Record that access to a customer was denied."""
+        self._customers[customer_id] = {
+            "reason": reason,
+            "denied_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        if self.path:
+            with self.lock():
+                self._write()
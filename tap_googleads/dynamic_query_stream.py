@@ -1,25 +1,192 @@
 from __future__ import annotations
 
+import dataclasses
 import fnmatch
+import hashlib
+import re
+from datetime import date, datetime, timedelta, timezone
 from functools import cached_property
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 import humps
 import requests
 import sqlparse
 from singer_sdk.exceptions import FatalAPIError
+from singer_sdk.helpers._batch import BatchFileFormat, JSONLinesEncoding
 from singer_sdk.helpers._flattening import flatten_record
-
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk.pagination import BaseAPIPaginator
+
+from tap_googleads.batch import ParquetBatcher
+from tap_googleads.client import InvalidPageTokenError, ResumableAPIError
+from tap_googleads.denied_customers import denied_customer_error_code
+from tap_googleads.progress import QueryProgress
+from tap_googleads.query_split import (
+    QUERY_SPLIT_STATE_KEY,
+    QueryPiece,
+    plan_query_pieces,
+    remember_query_split,
+    split_query_piece,
+)
 from tap_googleads.streams import ReportsStream
 
 DATE_TYPES = ("segments.date", "segments.month", "segments.quarter", "segments.week")
 
+# some fields are returned under a single JSON object for some reason
+OBJECT_FIELD_PATTERNS = (
+    "ad_group_ad.ad.*_ad.*",
+    "segments.keyword.info.*",
+    "ad_group_criterion.webpage.sample.*",
+)
+
+PARAMETERS_PATTERN = re.compile(r"\s+PARAMETERS\s+(.*)$", re.IGNORECASE | re.DOTALL)
+TRAILING_CLAUSES_PATTERN = re.compile(r"\s+(ORDER\s+BY|LIMIT)\s", re.IGNORECASE)
+FIELD_PATTERN = re.compile(r"\b[a-z_]+(?:\.[a-z0-9_]+)+\b")
+QUOTED_LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+CAMPAIGN_ID_PATTERN = re.compile(r"\bcampaign\.id\b")
+
+# errors of queries that take too long or return too much to run as one request
+QUERY_TOO_LARGE_ERRORS = ("DEADLINE_EXCEEDED", "RESPONSE_MESSAGE_TOO_LARGE")
+
+# key of the last completed page of an interrupted query in stream partition state
+PAGE_CHECKPOINT_STATE_KEY = "page_checkpoint"
+
+# key of the time of the last complete sync in stream partition state
+REFRESHED_AT_STATE_KEY = "refreshed_at"
+
+
+class PageTokenPaginator(BaseAPIPaginator[Optional[str]]):
+    """Paginator for page tokens in the response body, starting from a given token.
+
+    Used to resume a query from the page token of its last completed page.
+    """
+
+    def __init__(self, jsonpath: str, start_value: Optional[str] = None) -> None:
+        super().__init__(start_value)
+        self.jsonpath = jsonpath
+
+    def get_next(self, response: requests.Response) -> Optional[str]:
+        return next(extract_jsonpath(self.jsonpath, response.json()), None)
+
+
+class QueryTooLargeError(FatalAPIError):
+    """Raised when a query times out or its response is too large."""
+
+
+def is_object_field(field: str) -> bool:
+    """Whether a GAQL field is returned as part of its parent JSON object."""
+    return any(fnmatch.fnmatch(field, p) for p in OBJECT_FIELD_PATTERNS)
+
+
+def field_property_name(field: str) -> str:
+    """Return the schema property name for a GAQL field."""
+    if is_object_field(field):
+        field = field.rsplit(".", 1)[0]
+
+    # GAQL fields look like metrics.cost_micros and response looks like
+    # {'metrics': {'costMicros': 1000000}} which gets converted to metrics__costMicros
+    return "__".join([humps.camelize(i) for i in field.split(".")])
+
 
 class DynamicQueryStream(ReportsStream):
     """Define dynamic query stream class."""
 
     records_jsonpath = "$.results[*]"
     add_date_filter_to_query = False
+    supports_snapshot_mode = False
+
+    # skip syncs within this interval of the last complete sync, for data that
+    # rarely changes - overridden per stream by `min_refresh_interval_hours`
+    min_refresh_interval: Optional[timedelta] = None
+
+    _page_checkpoint: Optional[dict] = None
+    _query_progress: Optional[QueryProgress] = None
+    _query_piece: Optional[QueryPiece] = None
+    _split_campaign_ids: Optional[List[int]] = None
+
+    def __init__(self, tap, *args, **kwargs) -> None:
+        # sync current entity attributes once, rather than once per day - set before
+        # the schema is evaluated, so it is not extended with `segments.date`
+        if self.supports_snapshot_mode and tap.config.get("snapshot_dimension_streams"):
+            self.add_date_filter_to_query = False
+
+        super().__init__(tap, *args, **kwargs)
+        self._apply_snapshot_mode_keys()
+
+        # contexts refreshed since are not synced again in the same run
+        self._run_started_at = datetime.now(timezone.utc)
+
+    def apply_catalog(self, catalog) -> None:
+        super().apply_catalog(catalog)
+
+        # a catalog discovered before snapshot mode was enabled has daily row keys
+        self._apply_snapshot_mode_keys()
+
+    def _apply_snapshot_mode_keys(self) -> None:
+        if not self.snapshot_mode:
+            return
+
+        self.replication_key = None
+        self.forced_replication_method = None
+        self.primary_keys = [
+            key for key in self.primary_keys or [] if key != "segments__date"
+        ]
+
+    @property
+    def snapshot_mode(self) -> bool:
+        return self.supports_snapshot_mode and self.config.get(
+            "snapshot_dimension_streams", False
+        )
+
+    @cached_property
+    def refresh_interval(self) -> Optional[timedelta]:
+        hours = self.config["min_refresh_interval_hours"].get(self.name)
+
+        if hours is None:
+            return self.min_refresh_interval
+
+        return timedelta(hours=hours) if hours > 0 else None
+
+    def is_refresh_due(self, context) -> bool:
+        """Whether the context was last synced longer than the refresh interval ago.
+
+        A context is synced at most once per run.
+        """
+        refreshed_at = self.get_context_state(context).get(REFRESHED_AT_STATE_KEY)
+
+        if refreshed_at is None:
+            return True
+
+        refreshed_at = datetime.fromisoformat(refreshed_at)
+
+        if refreshed_at >= self._run_started_at:
+            return False
+
+        return (
+            self.refresh_interval is None
+            or datetime.now(timezone.utc) - refreshed_at >= self.refresh_interval
+        )
+
+    def get_records(self, context):
+        if not self.is_refresh_due(context):
+            self.logger.info(
+                "Skipping %s for %s, last refreshed at %s",
+                self.name,
+                context,
+                self.get_context_state(context)[REFRESHED_AT_STATE_KEY],
+            )
+            return False
+
+        refreshed_at = datetime.now(timezone.utc)
+        completed = yield from super().get_records(context)
+
+        # not recorded for syncs that were skipped or cut short, e.g. by a 403
+        if completed and self.refresh_interval is not None:
+            self.get_context_state(context)[REFRESHED_AT_STATE_KEY] = (
+                refreshed_at.isoformat()
+            )
+
+        return completed
 
     @cached_property
     def is_sorted(self):
@@ -48,18 +215,97 @@ class DynamicQueryStream(ReportsStream):
         """Return the GAQL query."""
         return self._get_gaql()
 
+    @property
+    def versioned_gaql(self) -> str:
+        gaql = super().versioned_gaql
+
+        if self.snapshot_mode:
+            gaql = self._filter_select_list(
+                gaql, lambda field, _: field != "segments.date"
+            )
+
+        return gaql
+
+    @property
+    def start_date(self):
+        # a query resumed from a page checkpoint must be identical to the original
+        if self._page_checkpoint:
+            return self._page_checkpoint["start_date"]
+
+        return super().start_date
+
     def _apply_date_filter_to_query(self, gaql: str):
         """Apply date filter to the query at request time."""
+        start_date, end_date = self.start_date, self.end_date
+
+        if self._query_piece and self._query_piece.days is not None:
+            start_date = f"'{self._query_piece.start_date.isoformat()}'"
+            end_date = f"'{self._query_piece.end_date.isoformat()}'"
+
         if "WHERE" in gaql.upper():
             return (
                 gaql.rstrip()
-                + f" AND segments.date >= {self.start_date} AND segments.date <= {self.end_date} ORDER BY segments.date ASC"
+                + f" AND segments.date >= {start_date} AND segments.date <= {end_date} ORDER BY segments.date ASC"
             )
 
         return (
             gaql.rstrip()
-            + f" WHERE segments.date >= {self.start_date} AND segments.date <= {self.end_date} ORDER BY segments.date ASC"
+            + f" WHERE segments.date >= {start_date} AND segments.date <= {end_date} ORDER BY segments.date ASC"
+        )
+
+    @cached_property
+    def stream_filters(self) -> List[str]:
+        """Return the configured filter conditions for this stream.
+
+        Every field referenced by a condition must be a filterable field known to
+        the API.
+        """
+        conditions = self.config.get("stream_filters", {}).get(self.name, [])
+
+        if not conditions:
+            return []
+
+        # string literals may contain dotted text, e.g. 'example.com'
+        fields = sorted(
+            {
+                field
+                for condition in conditions
+                for field in FIELD_PATTERN.findall(
+                    QUOTED_LITERAL_PATTERN.sub("''", condition)
+                )
+            }
         )
+        fields_metadata = self.get_fields_metadata(fields)
+
+        unfilterable_fields = [
+            field
+            for field in fields
+            if not fields_metadata[field].get("filterable", True)
+        ]
+
+        if unfilterable_fields:
+            msg = (
+                f"Fields cannot be used in {self.name} stream filters: "
+                f"{unfilterable_fields}"
+            )
+            raise ValueError(msg)
+
+        return conditions
+
+    def get_query_filters(self, context) -> List[str]:
+        """Return the conditions to add to the WHERE clause of the query."""
+        return list(self.stream_filters)
+
+    @staticmethod
+    def _apply_filters_to_query(gaql: str, conditions: List[str]) -> str:
+        """Add conditions to the WHERE clause of the query."""
+        match = TRAILING_CLAUSES_PATTERN.search(gaql)
+        end = match.start() if match else len(gaql)
+        query, trailing_clauses = gaql[:end], gaql[end:]
+        keyword = "AND" if "WHERE" in query.upper() else "WHERE"
+        predicate = " AND ".join(f"({c})" for c in conditions)
+
+        return f"{query.rstrip()} {keyword} {predicate}{trailing_clauses}"
 
     def get_fields_metadata(self, fields: List[str]) -> Dict[str, Dict[str, Any]]:
         """
@@ -82,7 +328,8 @@ class DynamicQueryStream(ReportsStream):
           name,
           data_type,
           enum_values,
-          is_repeated
+          is_repeated,
+          filterable
         WHERE name in ({fields_sql})
         """
 
@@ -92,12 +339,22 @@ class DynamicQueryStream(ReportsStream):
             "developer-token": self.config["developer_token"],
         }
 
-        response = requests.post(
-            base_url,
-            json=payload,
-            headers=headers,
-            auth=self.authenticator,
-        )
+        cassette = self._tap.cassette
+
+        if cassette and cassette.replaying:
+            response = cassette.replay(
+                requests.Request("POST", base_url, json=payload).prepare()
+            )
+        else:
+            response = requests.post(
+                base_url,
+                json=payload,
+                headers=headers,
+                auth=self.authenticator,
+            )
+
+            if cassette:
+                cassette.record(response.request, response)
 
         if not response.ok:
             msg = self.response_error_message(response)
@@ -181,23 +438,11 @@ class DynamicQueryStream(ReportsStream):
             if node.get("isRepeated", False):
                 field_value = {"type": ["null", "array"], "items": field_value}
 
-            # some fields are returned under a single JSON object for some reason -
-            # update schema to reflect this
-            if any(
-                fnmatch.fnmatch(field, p)
-                for p in [
-                    "ad_group_ad.ad.*_ad.*",
-                    "segments.keyword.info.*",
-                    "ad_group_criterion.webpage.sample.*",
-                ]
-            ):
-                field = field.rsplit(".", 1)[0]
+            # update schema to reflect fields returned under a single JSON object
+            if is_object_field(field):
                 field_value = {"type": ["string", "null"]}
 
-            # GAQL fields look like metrics.cost_micros and response looks like
-            # {'metrics': {'costMicros': 1000000}} which gets converted to metrics__costMicros
-            field_name = "__".join([humps.camelize(i) for i in field.split(".")])
-            local_json_schema["properties"][field_name] = field_value
+            local_json_schema["properties"][field_property_name(field)] = field_value
 
         # these are injected from context
         local_json_schema["properties"]["customer_id"] = {"type": ["string", "null"]}
@@ -221,14 +466,439 @@ class DynamicQueryStream(ReportsStream):
 
         return flattened_row
 
+    def get_batches(self, batch_config, context=None):
+        """Write Parquet batches typed from the stream schema."""
+        if batch_config.encoding.format != BatchFileFormat.PARQUET:
+            yield from super().get_batches(batch_config, context)
+            return
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.logger.warning(
+                "pyarrow is not installed, falling back to JSONL batches "
+                "(install with `pip install tap-googleads[parquet]`)"
+            )
+            jsonl_config = dataclasses.replace(
+                batch_config,
+                encoding=JSONLinesEncoding(
+                    compression=batch_config.encoding.compression
+                ),
+            )
+            yield from super().get_batches(jsonl_config, context)
+            return
+
+        batcher = ParquetBatcher(
+            tap_name=self.tap_name,
+            stream_name=self.name,
+            batch_config=batch_config,
+            schema=self.schema,
+            customer_id=context and context.get("customer_id"),
+            date_key=self.replication_key,
+        )
+        records = self._sync_records(context, write_messages=False)
+
+        for manifest in batcher.get_batches(records):
+            yield batch_config.encoding, manifest
+
+    @staticmethod
+    def _filter_select_list(gaql: str, keep_field: Callable[[str, str], bool]) -> str:
+        """Remove fields from the SELECT list of the query.
+
+        `keep_field` is called with each field and the query clauses following the
+        SELECT list. Returns the query unchanged if no fields would be left.
+        """
+        query_object = sqlparse.parse(gaql)[0]
+        select_list = next(
+            (
+                token
+                for token in query_object.tokens
+                if isinstance(token, sqlparse.sql.IdentifierList)
+            ),
+            None,
+        )
+
+        if select_list is None:
+            return gaql
+
+        fields = [field.strip() for field in select_list.value.split(",")]
+        _, clauses = gaql.split(select_list.value, 1)
+        kept_fields = [field for field in fields if keep_field(field, clauses)]
+
+        if not kept_fields or len(kept_fields) == len(fields):
+            return gaql
+
+        return "".join(
+            ",".join(kept_fields) if token is select_list else str(token)
+            for token in query_object.tokens
+        )
+
+    def _select_catalog_fields(self, gaql: str) -> str:
+        """Prune the SELECT list of the query to properties selected in the catalog.
+
+        Primary and replication keys are always kept, as are fields referenced
+        outside of the SELECT list (e.g. in WHERE or ORDER BY clauses).
+        """
+        if not self.mask[()]:
+            return gaql
+
+        key_properties = {*(self.primary_keys or []), self.replication_key}
+
+        return self._filter_select_list(
+            gaql,
+            lambda field, clauses: field_property_name(field) in key_properties
+            or self.mask[("properties", field_property_name(field))]
+            or re.search(rf"\b{re.escape(field)}\b", clauses) is not None,
+        )
+
+    @staticmethod
+    def _split_query_parameters(gaql: str):
+        """Split a trailing PARAMETERS clause from the query."""
+        match = PARAMETERS_PATTERN.search(gaql)
+
+        if not match:
+            return gaql, {}
+
+        parameters = {}
+        for parameter in match.group(1).split(","):
+            name, _, value = parameter.partition("=")
+            parameters[name.strip()] = value.strip()
+
+        return gaql[: match.start()], parameters
+
     def prepare_request_payload(self, context, next_page_token):
         if self.rest_method != "POST":
             return None
 
-        gaql = self.versioned_gaql
+        gaql, parameters = self._split_query_parameters(self.versioned_gaql)
+        conditions = self.get_query_filters(context)
+
+        if self._query_piece:
+            conditions += self._query_piece.campaign_conditions()
+
+        if conditions:
+            gaql = self._apply_filters_to_query(gaql, conditions)
+
+        gaql = self._select_catalog_fields(gaql)
 
         if self.add_date_filter_to_query:
             gaql = self._apply_date_filter_to_query(gaql)
 
+        if self.config.get("omit_unselected_resource_names"):
+            parameters["omit_unselected_resource_names"] = "true"
+
+        if parameters:
+            gaql = gaql.rstrip() + " PARAMETERS " + ", ".join(
+                f"{name} = {value}" for name, value in parameters.items()
+            )
+
         santised_query = " ".join(gaql.split())
-        return {"query": santised_query}
+        payload = {"query": santised_query}
+
+        # the total is only returned for the first page, for progress reporting
+        if next_page_token is None and self.config["progress_log_interval_seconds"]:
+            payload["returnTotalResultsCount"] = True
+
+        return payload
+
+    def plan_queries(self, context) -> Iterable[str]:
+        """Yield the GAQL of each query a sync of the context would run."""
+        query_split = context and self.get_context_state(context).get(
+            QUERY_SPLIT_STATE_KEY
+        )
+        pieces = self._plan_query_pieces(query_split) if query_split else [None]
+
+        try:
+            for piece in pieces:
+                self._query_piece = piece
+                payload = self.prepare_request_payload(context, None)
+
+                if payload:
+                    yield payload["query"]
+        finally:
+            self._query_piece = None
+
+    def estimate_rows(self, context, query: str) -> Optional[int]:
+        """Return the number of rows a query would return, fetching at most one.
+
+        Returns None if the customer cannot be queried, e.g. because access to it was
+        denied.
+        """
+        customer_id = context["customer_id"]
+        denied_customers = self._tap.denied_customers
+
+        if customer_id in denied_customers:
+            return None
+
+        gaql, parameters = self._split_query_parameters(query)
+
+        # the total results count ignores the LIMIT clause
+        if not re.search(r"\sLIMIT\s", gaql, re.IGNORECASE):
+            gaql += " LIMIT 1"
+
+        if parameters:
+            gaql += " PARAMETERS " + ", ".join(
+                f"{name} = {value}" for name, value in parameters.items()
+            )
+
+        decorated_request = self.request_decorator(self._request)
+        prepared_request = self.build_prepared_request(
+            method="POST",
+            url=self.get_url(context),
+            headers=self.http_headers,
+            json={"query": gaql, "returnTotalResultsCount": True},
+        )
+
+        try:
+            response_data = decorated_request(prepared_request, context).json()
+        except ResumableAPIError as e:
+            self.logger.warning(e)
+            error_code = denied_customer_error_code(e.response)
+
+            # skip the customer in the queries of other streams
+            if error_code:
+                denied_customers.add(customer_id, error_code)
+
+            return None
+
+        return int(response_data.get("totalResultsCount", 0))
+
+    @staticmethod
+    def _query_fingerprint(payload: dict) -> str:
+        return hashlib.sha256(payload["query"].encode()).hexdigest()
+
+    def get_new_paginator(self):
+        page_checkpoint = self._page_checkpoint or {}
+
+        return PageTokenPaginator(
+            self.next_page_token_jsonpath, page_checkpoint.get("page_token")
+        )
+
+    def parse_response(self, response: requests.Response):
+        rows = 0
+
+        for row in super().parse_response(response):
+            rows += 1
+            yield row
+
+        # all records of the page have been processed once the consumer asks for more
+        response_data = response.json()
+
+        if self._query_progress is not None:
+            self._query_progress.add_page(
+                rows, response_data.get("totalResultsCount")
+            )
+
+        if self.context and self._page_checkpoint is not None:
+            next_page_token = response_data.get("nextPageToken")
+            self._page_checkpoint["page_token"] = next_page_token
+            self._page_checkpoint["checkpointed_at"] = datetime.now(
+                timezone.utc
+            ).isoformat()
+
+            state = self.get_context_state(self.context)
+            if next_page_token:
+                state[PAGE_CHECKPOINT_STATE_KEY] = dict(self._page_checkpoint)
+            else:
+                state.pop(PAGE_CHECKPOINT_STATE_KEY, None)
+
+    def _resumable_page_checkpoint(self, context) -> Optional[dict]:
+        """Return the page checkpoint of an interrupted sync of the same query."""
+        checkpoint = self.get_context_state(context).get(PAGE_CHECKPOINT_STATE_KEY)
+
+        if not checkpoint:
+            return None
+
+        self._page_checkpoint = checkpoint
+        payload = self.prepare_request_payload(context, None)
+        self._page_checkpoint = None
+
+        if payload is None or self._query_fingerprint(payload) != checkpoint["query"]:
+            self.logger.info("Discarding page checkpoint of a different query")
+            return None
+
+        return checkpoint
+
+    def validate_response(self, response):
+        if response.status_code >= 400 and any(
+            error in response.text for error in QUERY_TOO_LARGE_ERRORS
+        ):
+            raise QueryTooLargeError(self.response_error_message(response))
+
+        super().validate_response(response)
+
+    @cached_property
+    def splits_by_campaign(self) -> bool:
+        """Whether a query too large for a single day can be split by campaign."""
+        return CAMPAIGN_ID_PATTERN.search(self.versioned_gaql) is not None
+
+    def _plan_query_pieces(self, query_split: dict) -> List[QueryPiece]:
+        if self.add_date_filter_to_query:
+            return plan_query_pieces(
+                date.fromisoformat(self.start_date.strip("'")),
+                date.fromisoformat(self.end_date.strip("'")),
+                query_split,
+            )
+
+        return plan_query_pieces(None, None, query_split)
+
+    def _split_failed_query_piece(
+        self, context, piece: QueryPiece, error: QueryTooLargeError
+    ) -> List[QueryPiece]:
+        """Split a piece of a query that failed, and remember the split.
+
+        Raises the error if the piece cannot be split further.
+        """
+        campaign_ids = None
+
+        if self.splits_by_campaign and (piece.days is None or piece.days == 1):
+            if self._split_campaign_ids is None:
+                rows = self.search(context, "SELECT campaign.id FROM campaign")
+                self._split_campaign_ids = [int(r["campaign"]["id"]) for r in rows]
+
+            campaign_ids = self._split_campaign_ids
+
+        pieces = split_query_piece(piece, campaign_ids)
+
+        if not pieces:
+            raise error
+
+        self.logger.warning(
+            "Splitting %s query for %s (%s): %s", self.name, context, piece, error
+        )
+        state = self.get_context_state(context)
+        state[QUERY_SPLIT_STATE_KEY] = remember_query_split(
+            state.get(QUERY_SPLIT_STATE_KEY, {}), pieces
+        )
+
+        return pieces
+
+    def _request_split_records(self, context, pieces: List[QueryPiece]):
+        """Request records of each piece of a query, splitting pieces that fail.
+
+        A piece that fails after returning records cannot be split, as its records
+        would be emitted again.
+        """
+        pieces = list(pieces)
+
+        try:
+            while pieces:
+                self._query_piece = pieces.pop(0)
+                piece_records = 0
+
+                try:
+                    for record in super().request_records(context):
+                        piece_records += 1
+                        yield record
+                except QueryTooLargeError as e:
+                    if piece_records:
+                        raise
+
+                    pieces[:0] = self._split_failed_query_piece(
+                        context, self._query_piece, e
+                    )
+        finally:
+            self._query_piece = None
+
+    def request_records(self, context):
+        """Request records, splitting queries that are too large for one request.
+
+        Queries with a remembered split are requested in pieces. Otherwise, the
+        query is requested as a whole, and split if it fails before returning any
+        records.
+        """
+        if not context or self.rest_method != "POST":
+            yield from super().request_records(context)
+            return
+
+        query_split = self.get_context_state(context).get(QUERY_SPLIT_STATE_KEY)
+
+        try:
+            if query_split:
+                self.logger.info(
+                    "Requesting %s for %s in pieces, as previously split",
+                    self.name,
+                    context,
+                )
+                yield from self._request_split_records(
+                    context, self._plan_query_pieces(query_split)
+                )
+                return
+
+            records = 0
+
+            try:
+                for record in self._request_checkpointed_records(context):
+                    records += 1
+                    yield record
+                return
+            except QueryTooLargeError as e:
+                if records:
+                    raise
+
+                error = e
+
+            (query,) = self._plan_query_pieces({})
+            yield from self._request_split_records(
+                context, self._split_failed_query_piece(context, query, error)
+            )
+        finally:
+            self._split_campaign_ids = None
+
+    def _request_checkpointed_records(self, context):
+        """Request records, checkpointing the page token of each completed page.
+
+        If a previous sync of the context was interrupted, the same query is resumed
+        from the page after the last completed page.
+        """
+        state = self.get_context_state(context)
+        checkpoint = self._resumable_page_checkpoint(context)
+        state.pop(PAGE_CHECKPOINT_STATE_KEY, None)
+
+        if checkpoint:
+            self.logger.info(
+                "Resuming %s for %s from page checkpoint at %s",
+                self.name,
+                context,
+                checkpoint["checkpointed_at"],
+            )
+            self._page_checkpoint = dict(checkpoint)
+        else:
+            self._page_checkpoint = {
+                "query": self._query_fingerprint(
+                    self.prepare_request_payload(context, None)
+                ),
+                "start_date": self.start_date,
+            }
+
+        progress_interval = self.config["progress_log_interval_seconds"]
+        if progress_interval:
+            self._query_progress = QueryProgress(
+                self.logger, self.name, context.get("customer_id"), progress_interval
+            )
+
+        try:
+            resumed_records = 0
+
+            try:
+                for record in super().request_records(context):
+                    resumed_records += 1
+                    yield record
+            except InvalidPageTokenError as e:
+                if not checkpoint or resumed_records:
+                    raise
+
+                self.logger.warning(
+                    "Page checkpoint no longer valid, restarting: %s", e
+                )
+                self._page_checkpoint = None
+                yield from self._request_checkpointed_records(context)
+                return
+
+            # report completion of queries long enough to have reported progress
+            query_progress = self._query_progress
+            if query_progress and query_progress.elapsed >= progress_interval:
+                query_progress.log()
+        finally:
+            self._page_checkpoint = None
+            self._query_progress = None
@@ -61,4 +61,5 @@ class AdGroupAdStream(DynamicQueryStream):
     name = "ad_group_ad"
     primary_keys = ["adGroup__id","adGroupAd__ad__id","segments__date"]
     replication_key = "segments__date"
-    add_date_filter_to_query = True
\ No newline at end of file
+    add_date_filter_to_query = True
+    supports_snapshot_mode = True
\ No newline at end of file
@@ -1,9 +1,9 @@
 """AdGroupCriterionStream for Google Ads tap."""
 
-from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.change_status_stream import ChangeStatusStream
 
 
-class AdGroupCriterionStream(DynamicQueryStream):
+class AdGroupCriterionStream(ChangeStatusStream):
     """Ad Group Criterion stream"""
 
     @property
@@ -80,4 +80,5 @@ class AdGroupCriterionStream(DynamicQueryStream):
         """
 
     name = "ad_group_criterion"
-    primary_keys = ["adGroup__id", "adGroupCriterion__criterionId"]
\ No newline at end of file
+    primary_keys = ["adGroup__id", "adGroupCriterion__criterionId"]
+    change_status_resource_type = "AD_GROUP_CRITERION"
@@ -1,9 +1,9 @@
 """AdListingGroupCriterionStream for Google Ads tap."""
 
-from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.change_status_stream import ChangeStatusStream
 
 
-class AdListingGroupCriterionStream(DynamicQueryStream):
+class AdListingGroupCriterionStream(ChangeStatusStream):
     """Ad Listing Group Criterion stream"""
 
     @property
@@ -39,4 +39,5 @@ class AdListingGroupCriterionStream(DynamicQueryStream):
         """
 
     name = "ad_listing_group_criterion"
-    primary_keys = ["adGroup__id", "adGroupCriterion__criterionId"]
\ No newline at end of file
+    primary_keys = ["adGroup__id", "adGroupCriterion__criterionId"]
+    change_status_resource_type = "AD_GROUP_CRITERION"
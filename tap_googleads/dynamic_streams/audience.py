@@ -1,5 +1,7 @@
 """AudienceStream for Google Ads tap."""
 
+from datetime import timedelta
+
 from tap_googleads.dynamic_query_stream import DynamicQueryStream
 
 
@@ -23,4 +25,5 @@ class AudienceStream(DynamicQueryStream):
         """
 
     name = "audience"
-    primary_keys = ["customer__id", "audience__id"]
\ No newline at end of file
+    primary_keys = ["customer__id", "audience__id"]
+    min_refresh_interval = timedelta(days=1)
@@ -1,9 +1,9 @@
 """CampaignCriterionStream for Google Ads tap."""
 
-from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.change_status_stream import ChangeStatusStream
 
 
-class CampaignCriterionStream(DynamicQueryStream):
+class CampaignCriterionStream(ChangeStatusStream):
     """Campaign Criterion stream"""
 
     @property
@@ -23,4 +23,5 @@ class CampaignCriterionStream(DynamicQueryStream):
         """
 
     name = "campaign_criterion"
-    primary_keys = ["campaign__id", "campaignCriterion__resourceName"]
\ No newline at end of file
+    primary_keys = ["campaign__id", "campaignCriterion__resourceName"]
+    change_status_resource_type = "CAMPAIGN_CRITERION"
@@ -37,3 +37,4 @@ class CampaignHistoryStream(DynamicQueryStream):
     primary_keys = ["campaign__id","segments__date"]
     replication_key = "segments__date"
     add_date_filter_to_query = True
+    supports_snapshot_mode = True
@@ -9,6 +9,7 @@ from functools import cached_property
 from singer_sdk import typing as th
 
 from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.query_split import plan_query_pieces
 
 
 class ClickViewReportStream(DynamicQueryStream):
@@ -82,8 +83,7 @@ class ClickViewReportStream(DynamicQueryStream):
             params["pageToken"] = next_page_token
         return params
 
-    def request_records(self, context):
-
+    def _sync_dates(self, context):
         ninety_days_ago = datetime.date.today() - datetime.timedelta(days=90)
         start_value = datetime.date.fromisoformat(self.get_starting_replication_key_value(context) or self.config["start_date"])
         if start_value < ninety_days_ago:
@@ -94,9 +94,15 @@ class ClickViewReportStream(DynamicQueryStream):
         end_date = datetime.date.fromisoformat(self.config["end_date"])
 
         delta = end_date - start_date
-        dates = (start_date + datetime.timedelta(days=i) for i in range(delta.days))
+        return (start_date + datetime.timedelta(days=i) for i in range(delta.days))
+
+    def plan_queries(self, context):
+        # one query per day
+        for self.date in self._sync_dates(context):
+            yield from super().plan_queries(context)
 
-        for self.date in dates:
+    def request_records(self, context):
+        for self.date in self._sync_dates(context):
             self.logger.info(f"Requesting records for date: {self.date} | customer_id: {context.get('customer_id')}")
             records = super().request_records(context)
             record = next(records, None)
@@ -109,10 +115,18 @@ class ClickViewReportStream(DynamicQueryStream):
 
             yield from itertools.chain([record], records)
 
+    def _plan_query_pieces(self, query_split):
+        # queries are for a single day, so can only be split by campaign
+        return plan_query_pieces(self.date, self.date, query_split)
+
     def _apply_date_filter_to_query(self, gaql):
         clause = "AND" if "WHERE" in gaql.upper() else "WHERE"
+        query_date = self.date
+
+        if self._query_piece and self._query_piece.days is not None:
+            query_date = self._query_piece.start_date
 
         return (
             gaql.rstrip()
-            + f" {clause} segments.date = '{self.date.isoformat()}' ORDER BY segments.date ASC"
+            + f" {clause} segments.date = '{query_date.isoformat()}' ORDER BY segments.date ASC"
         )
@@ -27,4 +27,5 @@ class CustomerStream(DynamicQueryStream):
     name = "customer"
     primary_keys = ["customer__id", "segments__date"]
     replication_key = "segments__date"
-    add_date_filter_to_query = True
\ No newline at end of file
+    add_date_filter_to_query = True
+    supports_snapshot_mode = True
\ No newline at end of file
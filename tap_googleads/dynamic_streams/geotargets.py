@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, Iterable
+from datetime import timedelta
+from functools import cached_property
+from typing import Optional
 
 from tap_googleads.dynamic_query_stream import DynamicQueryStream
 
-if TYPE_CHECKING:
-    from singer_sdk.helpers.types import Context
-
 
 class GeotargetsStream(DynamicQueryStream):
     """Geotargets, worldwide, constant across all customers"""
@@ -27,19 +26,13 @@ class GeotargetsStream(DynamicQueryStream):
     """
     name = "geo_target_constant"
     primary_keys = ["geoTargetConstant__id"]
+    min_refresh_interval = timedelta(days=7)
 
+    # one state for all customers, so the stream is synced for the first only
+    state_partitioning_keys = []
 
-    def get_records(self, context: Context) -> Iterable[Dict[str, Any]]:
-        """Return a generator of record-type dictionary objects.
-
-        Each record emitted should be a dictionary of property names to their values.
-
-        Args:
-            context: Stream partition or context dictionary.
-
-        Yields:
-            One item per (possibly processed) record in the API.
-
-        """
-        yield from super().get_records(context)
-        self.selected = False  # sync once only 
+    @cached_property
+    def refresh_interval(self) -> Optional[timedelta]:
+        # sync once per run, even without a refresh interval
+        refresh_interval = super().refresh_interval
+        return timedelta(0) if refresh_interval is None else refresh_interval
@@ -1,5 +1,7 @@
 """LabelStream for Google Ads tap."""
 
+from datetime import timedelta
+
 from tap_googleads.dynamic_query_stream import DynamicQueryStream
 
 
@@ -21,4 +23,5 @@ class LabelStream(DynamicQueryStream):
 
     name = "label"
     primary_keys = ["label__id"]
+    min_refresh_interval = timedelta(days=1)
     replication_key = None 
\ No newline at end of file
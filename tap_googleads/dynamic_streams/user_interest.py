@@ -1,5 +1,7 @@
 """UserInterestStream for Google Ads tap."""
 
+from datetime import timedelta
+
 from tap_googleads.dynamic_query_stream import DynamicQueryStream
 
 
@@ -21,4 +23,5 @@ class UserInterestStream(DynamicQueryStream):
         """
 
     name = "user_interest"
-    primary_keys = ["userInterest__userInterestId"]
\ No newline at end of file
+    primary_keys = ["userInterest__userInterestId"]
+    min_refresh_interval = timedelta(days=7)
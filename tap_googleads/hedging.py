@@ -0,0 +1,176 @@
+"""Hedged search requests, to cut the tail latency of slow pages.
+
+Search requests are read-only, so a request that has not returned within the
+usual latency of its stream can safely be sent again. Whichever attempt
+succeeds first is used, and the other is abandoned.
+
+Attempts run on their own threads, so each is sent with a session of its own:
+`requests.Session` is not thread-safe, and an abandoned attempt may still be in
+flight when the next request is sent.
+"""
+
+from __future__ import annotations
+
+import enum
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Deque, Dict, List, Optional
+
+import requests
+from singer_sdk import metrics
+
+# latencies a stream must have before its requests are hedged, and the number kept
+HEDGE_MIN_SAMPLES = 20
+HEDGE_LATENCY_WINDOW = 1000
+
+
+class HedgeMetric(str, enum.Enum):
+    """Metrics of hedged requests, logged like the SDK metrics."""
+
+    HEDGED_REQUEST_COUNT = "hedged_request_count"
+    HEDGE_WIN_COUNT = "hedge_win_count"
+
+
+def _run_in_thread(function: Callable[[], requests.Response]) -> Future:
+    # a thread per attempt, so abandoned attempts never delay later requests
+    future: Future = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(function())
+        except BaseException as e:  # noqa: BLE001
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def _close_response(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class RequestHedger:
+    """Sends requests, hedging those slower than a percentile of their stream.
+
+    The latency percentile is learned per stream, from the latency of its last
+    `HEDGE_LATENCY_WINDOW` requests. Requests are not hedged until a stream has
+    `HEDGE_MIN_SAMPLES` latencies.
+    """
+
+    def __init__(self, percentile: float) -> None:
+        self.percentile = percentile
+        self.hedged_requests: Counter = Counter()
+        self.hedge_wins: Counter = Counter()
+        self._latencies: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=HEDGE_LATENCY_WINDOW)
+        )
+        self._idle_sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def hedge_delay(self, stream_name: str) -> Optional[float]:
+        """Return the latency after which to hedge a request of the stream."""
+        with self._lock:
+            latencies = sorted(self._latencies[stream_name])
+
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+
+        index = math.ceil(self.percentile / 100 * len(latencies)) - 1
+        return latencies[min(max(index, 0), len(latencies) - 1)]
+
+    def _timed(
+        self, stream_name: str, send: Callable[[requests.Session], requests.Response]
+    ) -> Callable[[], requests.Response]:
+        def timed_send() -> requests.Response:
+            with self._lock:
+                session = (
+                    self._idle_sessions.pop()
+                    if self._idle_sessions
+                    else requests.Session()
+                )
+
+            start_time = time.monotonic()
+
+            try:
+                response = send(session)
+            finally:
+                with self._lock:
+                    self._idle_sessions.append(session)
+
+            with self._lock:
+                self._latencies[stream_name].append(time.monotonic() - start_time)
+
+            return response
+
+        return timed_send
+
+    def send(
+        self, stream_name: str, send: Callable[[requests.Session], requests.Response]
+    ) -> requests.Response:
+        """Send a request with a session, and send it again if it is slow to return.
+
+        Each attempt is sent with a session no other attempt is using. Returns the
+        response of the first attempt to succeed, or raises the error of the first
+        attempt if both fail. The other attempt is not cancelled, as `requests`
+        cannot cancel a request in flight: it still counts against the API quota,
+        and its response is closed when it arrives.
+        """
+        delay = self.hedge_delay(stream_name)
+        timed_send = self._timed(stream_name, send)
+
+        if delay is None:
+            return timed_send()
+
+        attempt = _run_in_thread(timed_send)
+        done, _ = wait([attempt], timeout=delay)
+
+        if done:
+            return attempt.result()
+
+        self.hedged_requests[stream_name] += 1
+        hedge = _run_in_thread(timed_send)
+        pending = {attempt, hedge}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [f for f in done if f.exception() is None]
+
+            if succeeded:
+                winner, loser = (
+                    (attempt, hedge) if attempt in succeeded else (hedge, attempt)
+                )
+
+                if winner is hedge:
+                    self.hedge_wins[stream_name] += 1
+
+                loser.add_done_callback(_close_response)
+                return winner.result()
+
+        return attempt.result()
+
+    def log_metrics(self, logger: logging.Logger) -> None:
+        """Log the number of hedged requests, and hedges that won, per stream."""
+        for stream_name, count in sorted(self.hedged_requests.items()):
+            for metric, value in (
+                (HedgeMetric.HEDGED_REQUEST_COUNT, count),
+                (HedgeMetric.HEDGE_WIN_COUNT, self.hedge_wins[stream_name]),
+            ):
+                metrics.log(
+                    metrics.get_metrics_logger(),
+                    metrics.Point("counter", metric, value, {"stream": stream_name}),
+                )
+
+            logger.info(
+                "Hedged %d slow requests of %s, %d returned first",
+                count,
+                stream_name,
+                self.hedge_wins[stream_name],
+            )
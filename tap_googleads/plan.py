@@ -0,0 +1,152 @@
+"""Query plan for tap-googleads - the requests a sync would issue."""
+
+from __future__ import annotations
+
+import math
+import sys
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, List, Optional, Union
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.runner import GLOBAL_STREAM_NAMES, resolve_customer_contexts
+
+if TYPE_CHECKING:
+    from singer_sdk import Tap
+
+# rows per page of googleAds:search results
+PAGE_SIZE = 10000
+
+# shown for rows of queries that could not be estimated
+UNKNOWN = "?"
+
+
+@dataclass
+class PlannedQuery:
+    """A query a sync would run for a stream and customer."""
+
+    stream: str
+    customer_id: Optional[str]
+    query: str
+    rows: Optional[int] = None
+
+    @property
+    def pages(self) -> Optional[int]:
+        if self.rows is None:
+            return None
+
+        return max(math.ceil(self.rows / PAGE_SIZE), 1)
+
+
+class QueryPlan:
+    """Resolves the customer hierarchy and compiles every query a sync would run.
+
+    Only the customer hierarchy is requested. If `estimate_rows` is set, the number
+    of rows of each query is also requested, fetching at most one row per query.
+    """
+
+    def __init__(self, tap: Tap, estimate_rows: bool = False) -> None:
+        self.tap = tap
+        self.estimate_rows = estimate_rows
+
+    def _selected_streams(self) -> List[DynamicQueryStream]:
+        return [
+            stream
+            for stream in self.tap.streams.values()
+            if isinstance(stream, DynamicQueryStream) and stream.selected
+        ]
+
+    def queries(self) -> Iterator[PlannedQuery]:
+        """Yield the planned queries of all selected report streams."""
+        customer_contexts = resolve_customer_contexts(self.tap)
+
+        for stream in self._selected_streams():
+            contexts = customer_contexts
+
+            # synced once, for the first customer
+            if stream.name in GLOBAL_STREAM_NAMES:
+                contexts = customer_contexts[:1]
+
+            for context in contexts:
+                customer_id = context["customer_id"]
+
+                if customer_id in self.tap.denied_customers:
+                    continue
+
+                if customer_id in self.tap.dormant_customer_ids and stream.has_metrics:
+                    continue
+
+                if not stream.is_refresh_due(context):
+                    continue
+
+                stream.context = context
+
+                for query in stream.plan_queries(context):
+                    planned_query = PlannedQuery(stream.name, customer_id, query)
+
+                    if self.estimate_rows:
+                        planned_query.rows = stream.estimate_rows(context, query)
+
+                    yield planned_query
+
+            stream.context = None
+
+    @staticmethod
+    def _total(values: Iterable) -> Union[int, str]:
+        values = list(values)
+        return UNKNOWN if UNKNOWN in values else sum(values)
+
+    def write(self, output: IO[str] = sys.stdout) -> None:
+        """Write a table of queries per stream and customer, followed by the queries."""
+        planned_queries = list(self.queries())
+        header = ("stream", "customer_id", "queries", "rows", "pages")
+        rows = []
+
+        for planned_query in planned_queries:
+            key = (planned_query.stream, planned_query.customer_id or "")
+
+            if rows and rows[-1][:2] == key:
+                row = rows[-1]
+            else:
+                row = [*key, 0, None, None]
+                rows.append(row)
+
+            row[2] += 1
+
+            if not self.estimate_rows:
+                continue
+
+            # unknown if any query of the stream and customer could not be estimated
+            if planned_query.rows is None or row[3] == UNKNOWN:
+                row[3] = row[4] = UNKNOWN
+            else:
+                row[3] = (row[3] or 0) + planned_query.rows
+                row[4] = (row[4] or 0) + planned_query.pages
+
+        totals = [
+            "TOTAL",
+            str(len({q.customer_id for q in planned_queries})),
+            sum(row[2] for row in rows),
+            self._total(row[3] for row in rows) if self.estimate_rows else None,
+            self._total(row[4] for row in rows) if self.estimate_rows else None,
+        ]
+        table = [
+            [str(value) if value is not None else "-" for value in row]
+            for row in [header, *rows, totals]
+        ]
+        widths = [max(len(row[i]) for row in table) for i in range(len(header))]
+
+        for row in table:
+            output.write(
+                "  ".join(
+                    value.ljust(width) for value, width in zip(row, widths)
+                ).rstrip()
+                + "\n"
+            )
+
+        output.write("\n")
+
+        for planned_query in planned_queries:
+            output.write(
+                f"{planned_query.stream}\t{planned_query.customer_id}\t"
+                f"{planned_query.query}\n"
+            )
@@ -0,0 +1,111 @@
+"""Per-stream CPU and allocation profiling."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# number of functions and allocation sites in summaries
+TOP_N = 20
+
+
+@dataclass
+class AllocationStats:
+    """Traced memory of the syncs of a stream, including its child streams."""
+
+    syncs: int = 0
+    net_bytes: int = 0
+    peak_bytes: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.syncs} syncs, net growth {self.net_bytes / 2**20:.1f} MiB, "
+            f"peak traced memory {self.peak_bytes / 2**20:.1f} MiB"
+        )
+
+
+class StreamProfiler:
+    """Profiles the sync of each stream with `cProfile` and `tracemalloc`.
+
+    Profiles are exclusive to a stream - while a child stream syncs, its parent
+    stream is not profiled. For each stream, `<stream>.prof` (loadable with
+    `pstats` or e.g. snakeviz) is written to the profile directory, along with a
+    `summary.txt` of the hottest functions and an `allocations.txt` of the traced
+    memory of each stream and the top allocation sites of the sync.
+    """
+
+    def __init__(self, directory: str, logger: logging.Logger) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.logger = logger
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._allocations: Dict[str, AllocationStats] = defaultdict(AllocationStats)
+        self._stack: List[Tuple[str, int]] = []
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        # the only snapshot before `write`, as snapshots are slow to take
+        self._start_snapshot = tracemalloc.take_snapshot()
+
+    @contextmanager
+    def profile(self, stream_name: str) -> Iterator[None]:
+        """Profile the enclosed code as part of a stream."""
+        if self._stack:
+            self._profiles[self._stack[-1][0]].disable()
+
+        profile = self._profiles.setdefault(stream_name, cProfile.Profile())
+        self._stack.append((stream_name, tracemalloc.get_traced_memory()[0]))
+        profile.enable()
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            _, start_size = self._stack.pop()
+            size, peak = tracemalloc.get_traced_memory()
+
+            allocations = self._allocations[stream_name]
+            allocations.syncs += 1
+            allocations.net_bytes += size - start_size
+            allocations.peak_bytes = max(allocations.peak_bytes, peak)
+
+            if self._stack:
+                self._profiles[self._stack[-1][0]].enable()
+
+    def _write_allocations(self) -> None:
+        snapshot = tracemalloc.take_snapshot()
+        statistics = snapshot.compare_to(self._start_snapshot, "lineno")[:TOP_N]
+
+        with open(self.directory / "allocations.txt", "w") as alloc_file:
+            alloc_file.writelines(
+                f"{stream_name}: {allocations}\n"
+                for stream_name, allocations in self._allocations.items()
+            )
+            alloc_file.write("\ntop allocation sites:\n")
+            alloc_file.writelines(f"{statistic}\n" for statistic in statistics)
+
+    def write(self) -> None:
+        """Write the profile of each stream and function and allocation summaries."""
+        summary = io.StringIO()
+
+        for stream_name, profile in self._profiles.items():
+            profile.dump_stats(self.directory / f"{stream_name}.prof")
+
+            summary.write(f"=== {stream_name} ===\n")
+            pstats.Stats(profile, stream=summary).sort_stats(
+                pstats.SortKey.TIME
+            ).print_stats(TOP_N)
+
+        summary_path = self.directory / "summary.txt"
+        summary_path.write_text(summary.getvalue())
+        self._write_allocations()
+        self.logger.info("Wrote stream profiles to %s", self.directory)
@@ -0,0 +1,89 @@
+"""Progress and ETA reporting for long running syncs."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from typing import Optional
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Return a duration as `H:MM:SS`, or `unknown`."""
+    if seconds is None:
+        return "unknown"
+
+    return str(timedelta(seconds=round(seconds)))
+
+
+def estimate_remaining(elapsed: float, done: float, total: float) -> Optional[float]:
+    """Return the estimated remaining seconds at the average rate so far."""
+    if not done or done > total:
+        return None
+
+    return elapsed / done * (total - done)
+
+
+class QueryProgress:
+    """Tracks the rows and pages of a query, logging progress at most every interval.
+
+    The total number of rows is taken from `totalResultsCount` of the first page.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        stream_name: str,
+        customer_id: Optional[str],
+        interval: float,
+    ) -> None:
+        self.logger = logger
+        self.stream_name = stream_name
+        self.customer_id = customer_id
+        self.interval = interval
+        self.rows = 0
+        self.pages = 0
+        self.total_rows: Optional[int] = None
+        self._start_time = time.monotonic()
+        self._last_logged = self._start_time
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start_time
+
+    @property
+    def eta(self) -> Optional[float]:
+        if self.total_rows is None:
+            return None
+
+        return estimate_remaining(self.elapsed, self.rows, self.total_rows)
+
+    def add_page(self, rows: int, total_rows: Optional[int] = None) -> None:
+        """Record a completed page of rows."""
+        self.rows += rows
+        self.pages += 1
+
+        if total_rows is not None:
+            self.total_rows = int(total_rows)
+
+        if time.monotonic() - self._last_logged >= self.interval:
+            self.log()
+
+    def log(self) -> None:
+        """Log the current progress."""
+        self._last_logged = time.monotonic()
+        elapsed = self.elapsed
+        total_rows = "?" if self.total_rows is None else self.total_rows
+
+        self.logger.info(
+            "Progress of %s for customer %s: %d/%s rows, %d pages, %.0f rows/s, "
+            "elapsed %s, ETA %s",
+            self.stream_name,
+            self.customer_id,
+            self.rows,
+            total_rows,
+            self.pages,
+            self.rows / elapsed if elapsed else 0,
+            format_duration(elapsed),
+            format_duration(self.eta),
+        )
@@ -0,0 +1,146 @@
+"""Splitting of report queries that are too large for a single request.
+
+A query that fails with `DEADLINE_EXCEEDED` or a too large response is split into
+pieces - by date range first, then by `campaign.id` range - until each piece
+succeeds. The split is remembered in the state of the customer partition, e.g.
+
+    {"query_split": {"days": 4, "campaign_id_boundaries": [1200, 3400]}}
+
+so later syncs plan pieces of at most `days` days, each split at the campaign ID
+boundaries, rather than failing the whole query again. Campaign ID ranges are
+only split once a piece covers a single day, so records of the pieces remain in
+date order.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import List, Optional, Sequence
+
+# key of the remembered split of a query in stream partition state
+QUERY_SPLIT_STATE_KEY = "query_split"
+
+
+@dataclass(frozen=True)
+class QueryPiece:
+    """A part of a query, by date range and `campaign.id` range.
+
+    Unset bounds are not filtered on. The campaign ID range includes
+    `min_campaign_id` and excludes `max_campaign_id`.
+    """
+
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    min_campaign_id: Optional[int] = None
+    max_campaign_id: Optional[int] = None
+
+    @property
+    def days(self) -> Optional[int]:
+        if self.start_date is None or self.end_date is None:
+            return None
+
+        return (self.end_date - self.start_date).days + 1
+
+    def includes_campaign(self, campaign_id: int) -> bool:
+        above_min = self.min_campaign_id is None or campaign_id >= self.min_campaign_id
+        below_max = self.max_campaign_id is None or campaign_id < self.max_campaign_id
+        return above_min and below_max
+
+    def campaign_conditions(self) -> List[str]:
+        """Return the conditions to add to the WHERE clause of the query."""
+        conditions = []
+
+        if self.min_campaign_id is not None:
+            conditions.append(f"campaign.id >= {self.min_campaign_id}")
+
+        if self.max_campaign_id is not None:
+            conditions.append(f"campaign.id < {self.max_campaign_id}")
+
+        return conditions
+
+    def __str__(self) -> str:
+        parts = []
+
+        if self.days is not None:
+            parts.append(f"{self.start_date} to {self.end_date}")
+
+        if self.min_campaign_id is not None or self.max_campaign_id is not None:
+            min_campaign_id = self.min_campaign_id or ""
+            max_campaign_id = self.max_campaign_id or ""
+            parts.append(f"campaign.id {min_campaign_id}..{max_campaign_id}")
+
+        return ", ".join(parts) or "whole query"
+
+
+def split_query_piece(
+    piece: QueryPiece, campaign_ids: Optional[Sequence[int]] = None
+) -> Optional[List[QueryPiece]]:
+    """Split a piece in two, by date range or by the given campaign IDs.
+
+    Returns `None` if the piece covers a single day and at most one campaign.
+    """
+    if piece.days is not None and piece.days > 1:
+        middle_date = piece.start_date + timedelta(days=piece.days // 2 - 1)
+
+        return [
+            replace(piece, end_date=middle_date),
+            replace(piece, start_date=middle_date + timedelta(days=1)),
+        ]
+
+    campaign_ids = sorted(i for i in campaign_ids or [] if piece.includes_campaign(i))
+
+    if len(campaign_ids) < 2:
+        return None
+
+    boundary = campaign_ids[len(campaign_ids) // 2]
+
+    return [
+        replace(piece, max_campaign_id=boundary),
+        replace(piece, min_campaign_id=boundary),
+    ]
+
+
+def plan_query_pieces(
+    start_date: Optional[date], end_date: Optional[date], query_split: dict
+) -> List[QueryPiece]:
+    """Return the pieces of a query with a remembered split, in date order."""
+    days = query_split.get("days")
+
+    if start_date is None or end_date is None or not days:
+        date_ranges = [(start_date, end_date)]
+    else:
+        date_ranges = []
+        while start_date <= end_date:
+            piece_end_date = min(start_date + timedelta(days=days - 1), end_date)
+            date_ranges.append((start_date, piece_end_date))
+            start_date = piece_end_date + timedelta(days=1)
+
+    boundaries = query_split.get("campaign_id_boundaries", [])
+    campaign_id_ranges = list(zip([None, *boundaries], [*boundaries, None]))
+
+    return [
+        QueryPiece(start_date, end_date, min_campaign_id, max_campaign_id)
+        for start_date, end_date in date_ranges
+        for min_campaign_id, max_campaign_id in campaign_id_ranges
+    ]
+
+
+def remember_query_split(query_split: dict, pieces: Sequence[QueryPiece]) -> dict:
+    """Return the remembered split, updated with the pieces of a split."""
+    query_split = dict(query_split)
+    days = [piece.days for piece in pieces if piece.days is not None]
+
+    if days:
+        query_split["days"] = min(days + [query_split.get("days") or min(days)])
+
+    boundaries = set(query_split.get("campaign_id_boundaries", []))
+    for piece in pieces:
+        boundaries.update(
+            b for b in (piece.min_campaign_id, piece.max_campaign_id) if b is not None
+        )
+
+    if boundaries:
+        query_split["campaign_id_boundaries"] = sorted(boundaries)
+
+    return query_split
@@ -0,0 +1,110 @@
+"""Local store of record content hashes, to detect unchanged records across runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# hashes written per write transaction, so workers sharing a store are not blocked
+HASH_WRITE_BATCH_SIZE = 1000
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """Return a stable hash of the record content."""
+    content = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class RecordHashStore:
+    """SQLite-backed mapping of stream records to record content hashes.
+
+    Records are identified by their partition context and primary key values, as
+    records of different customers can share primary key values.
+
+    Hashes are only written once their records have been emitted, so an
+    interrupted sync does not cause records to be suppressed on the next run. They
+    are written in short transactions of at most `HASH_WRITE_BATCH_SIZE` hashes,
+    and the database uses write-ahead logging, so several processes (e.g. workers
+    or shards) can share a store.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS record_hashes (
+                stream TEXT NOT NULL,
+                key TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                PRIMARY KEY (stream, key)
+            )
+            """
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def record_key(
+        record: Dict[str, Any],
+        primary_keys: Sequence[str],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Return the store key of a record from its context and primary key values."""
+        return json.dumps(
+            [context, [record.get(k) for k in primary_keys]],
+            sort_keys=True,
+            default=str,
+        )
+
+    def update(
+        self,
+        stream_name: str,
+        primary_keys: Sequence[str],
+        record: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Store the hash of a record, returning whether it changed since stored."""
+        key = self.record_key(record, primary_keys, context)
+        content_hash = record_hash(record)
+
+        with self._lock:
+            # records of pending hashes have been emitted since they were stored
+            if len(self._pending) >= HASH_WRITE_BATCH_SIZE:
+                self._write_pending()
+
+            stored_hash = self._pending.get((stream_name, key))
+
+            if stored_hash is None:
+                row = self._connection.execute(
+                    "SELECT hash FROM record_hashes WHERE stream = ? AND key = ?",
+                    (stream_name, key),
+                ).fetchone()
+                stored_hash = row and row[0]
+
+            if stored_hash == content_hash:
+                return False
+
+            self._pending[(stream_name, key)] = content_hash
+
+        return True
+
+    def commit(self) -> None:
+        """Persist hashes stored since the last commit."""
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO record_hashes (stream, key, hash) "
+                "VALUES (?, ?, ?)",
+                [(stream, key, h) for (stream, key), h in self._pending.items()],
+            )
+
+        self._pending.clear()
@@ -0,0 +1,395 @@
+"""Multi-process runner for tap-googleads."""
+
+from __future__ import annotations
+
+import copy
+import json
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from tap_googleads.dynamic_streams import GeotargetsStream
+from tap_googleads.state import compact_state, expand_state
+from tap_googleads.streams import (
+    SYNC_SECONDS_KEY,
+    AccessibleCustomers,
+    CustomerHierarchyStream,
+    assign_weighted_shards,
+)
+
+if TYPE_CHECKING:
+    from singer_sdk import Tap
+
+# streams whose records do not depend on the customer, synced by the first worker only
+GLOBAL_STREAM_NAMES = (AccessibleCustomers.name, GeotargetsStream.name)
+
+
+def resolve_customers(tap: Tap) -> List[dict]:
+    """Return all client customers the tap would sync.
+
+    Each customer has its `customer_hierarchy` record, its context and whether it
+    is dormant.
+    """
+    accessible_customers = tap.streams[AccessibleCustomers.name]
+    customer_hierarchy = tap.streams[CustomerHierarchyStream.name]
+    customers = []
+
+    for record in accessible_customers.get_records(None):
+        for context in accessible_customers.generate_child_contexts(record, None):
+            customer_hierarchy.context = context
+
+            for customer in customer_hierarchy.get_records(context):
+                for customer_context in customer_hierarchy.generate_child_contexts(
+                    customer, context
+                ):
+                    customers.append(
+                        {
+                            "record": customer,
+                            "context": customer_context,
+                            "dormant": customer_context["customer_id"]
+                            in tap.dormant_customer_ids,
+                        }
+                    )
+
+    # allow the customers to be synced again by the same tap
+    customer_hierarchy.context = None
+    customer_hierarchy.seen_customer_ids.clear()
+
+    return customers
+
+
+def resolve_customer_contexts(tap: Tap) -> List[dict]:
+    """Return the contexts of all client customers the tap would sync."""
+    return [customer["context"] for customer in resolve_customers(tap)]
+
+
+def partition_customer_ids(
+    customer_ids: Iterable[str],
+    workers: int,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[List[str]]:
+    """Split customers into balanced subsets, one per worker.
+
+    Customers without a weight are given the mean weight of the others.
+    """
+    weights = weights or {}
+    default_weight = sum(weights.values()) / len(weights) if weights else 1
+    customer_workers = assign_weighted_shards(
+        {c: weights.get(c, default_weight) for c in customer_ids},
+        workers,
+    )
+
+    partitions: List[List[str]] = [[] for _ in range(workers)]
+    for customer_id, worker in sorted(customer_workers.items()):
+        partitions[worker].append(customer_id)
+
+    return [p for p in partitions if p]
+
+
+def prune_sync_seconds(state: dict, customer_ids: Iterable[str]) -> None:
+    """Drop the recorded sync durations of customers that are not synced."""
+    hierarchy_state = state.get("bookmarks", {}).get(CustomerHierarchyStream.name, {})
+    sync_seconds = hierarchy_state.get(SYNC_SECONDS_KEY)
+
+    if sync_seconds is not None:
+        hierarchy_state[SYNC_SECONDS_KEY] = {
+            c: seconds for c, seconds in sync_seconds.items() if c in customer_ids
+        }
+
+
+def _partition_key(partition: dict) -> str:
+    return json.dumps(partition.get("context"), sort_keys=True)
+
+
+def _merge_partition_changes(
+    stream_partitions: Dict[str, dict],
+    previous_partitions: List[dict],
+    partitions: List[dict],
+) -> List[dict]:
+    """Apply the partitions changed from the previous partitions, by context."""
+    previous_partitions_by_key = {_partition_key(p): p for p in previous_partitions}
+
+    for partition in partitions:
+        partition_key = _partition_key(partition)
+
+        if partition != previous_partitions_by_key.get(partition_key):
+            stream_partitions[partition_key] = copy.deepcopy(partition)
+
+    return list(stream_partitions.values())
+
+
+def _merge_object_changes(
+    merged_value: Optional[dict],
+    previous_value: Optional[dict],
+    value: dict,
+) -> dict:
+    """Apply the items of an object changed from the previous object, by key."""
+    merged_value = merged_value if isinstance(merged_value, dict) else {}
+    previous_value = previous_value if isinstance(previous_value, dict) else {}
+
+    for item_key, item_value in value.items():
+        if item_value != previous_value.get(item_key):
+            merged_value[item_key] = copy.deepcopy(item_value)
+
+    return merged_value
+
+
+def _merge_stream_state_changes(
+    merged_stream_state: dict,
+    stream_partitions: Dict[str, dict],
+    previous_stream_state: dict,
+    stream_state: dict,
+) -> None:
+    for key, value in stream_state.items():
+        previous_value = previous_stream_state.get(key)
+
+        if key == "partitions":
+            merged_stream_state[key] = _merge_partition_changes(
+                stream_partitions, previous_value or [], value
+            )
+        elif isinstance(value, dict):
+            merged_stream_state[key] = _merge_object_changes(
+                merged_stream_state.get(key), previous_value, value
+            )
+        elif value != previous_value:
+            merged_stream_state[key] = copy.deepcopy(value)
+
+
+def _merge_state_changes(
+    merged_state: dict,
+    merged_partitions: Dict[str, Dict[str, dict]],
+    previous_state: dict,
+    state: dict,
+) -> None:
+    """Apply the bookmarks (and state partitions) a state changed to the merged state.
+
+    `merged_partitions` indexes the partitions of the merged state by context, per
+    stream. Bookmarks that are objects, e.g. of values per customer, are merged by
+    key.
+    """
+    merged_bookmarks = merged_state.setdefault("bookmarks", {})
+    previous_bookmarks = previous_state.get("bookmarks", {})
+
+    for stream_name, stream_state in state.get("bookmarks", {}).items():
+        merged_stream_state = merged_bookmarks.setdefault(stream_name, {})
+
+        if stream_name not in merged_partitions:
+            merged_partitions[stream_name] = {
+                _partition_key(p): p for p in merged_stream_state.get("partitions", [])
+            }
+
+        _merge_stream_state_changes(
+            merged_stream_state,
+            merged_partitions[stream_name],
+            previous_bookmarks.get(stream_name, {}),
+            stream_state,
+        )
+
+
+def merge_states(base_state: dict, states: Iterable[dict]) -> dict:
+    """Merge the states of several workers that started from the same base state.
+
+    Bookmarks (and state partitions) that a worker changed from the base state
+    take precedence over the base state. Bookmarks that are objects, e.g. of
+    values per customer, are merged by key.
+    """
+    merged_state = copy.deepcopy(base_state)
+    merged_partitions: Dict[str, Dict[str, dict]] = {}
+
+    for state in states:
+        _merge_state_changes(merged_state, merged_partitions, base_state, state)
+
+    return merged_state
+
+
+class SingerOutputMerger:
+    """Merges the Singer output of several workers into one valid Singer stream.
+
+    SCHEMA messages are written once per stream, RECORD (and any other) messages
+    are passed through and STATE messages are replaced by the merged state of all
+    workers, compacted if `compact` is set. Each STATE message of a worker is
+    merged by the changes since its previous STATE message.
+    """
+
+    def __init__(
+        self, base_state: dict, output: IO[str], compact: bool = False
+    ) -> None:
+        self.base_state = base_state
+        self.output = output
+        self.compact = compact
+        self.worker_states: Dict[int, dict] = {}
+        self._state = copy.deepcopy(base_state)
+        self._partitions: Dict[str, Dict[str, dict]] = {}
+        self._schemas: Dict[str, dict] = {}
+
+    @property
+    def state(self) -> dict:
+        """Return the merged state of all workers."""
+        return self._state
+
+    def write_state(self) -> None:
+        """Write a STATE message with the merged state of all workers."""
+        state = self.state
+
+        if self.compact:
+            state = compact_state(state)
+
+        self._write({"type": "STATE", "value": state})
+
+    def process(self, worker: int, line: str) -> None:
+        """Process a single line of worker output."""
+        message = json.loads(line)
+        message_type = message.get("type")
+
+        if message_type == "STATE":
+            state = expand_state(message["value"])
+            _merge_state_changes(
+                self._state,
+                self._partitions,
+                self.worker_states.get(worker, self.base_state),
+                state,
+            )
+            self.worker_states[worker] = state
+            self.write_state()
+            return
+
+        if message_type == "SCHEMA":
+            if self._schemas.get(message["stream"]) == message:
+                return
+
+            self._schemas[message["stream"]] = message
+
+        self.output.write(line if line.endswith("\n") else line + "\n")
+
+    def _write(self, message: dict) -> None:
+        self.output.write(json.dumps(message) + "\n")
+        self.output.flush()
+
+
+class WorkerPool:
+    """Syncs customer subsets in worker processes, merging their Singer output."""
+
+    def __init__(self, tap: Tap, workers: int) -> None:
+        self.tap = tap
+        self.workers = workers
+        self.logger = tap.logger
+        self.base_state = copy.deepcopy(tap.state)
+
+    def _write_worker_files(
+        self,
+        directory: Path,
+        index: int,
+        customers: Dict[str, dict],
+    ) -> List[str]:
+        config = {**self.tap.config, "customer_ids": list(customers)}
+        catalog = self.tap.catalog.to_dict()
+
+        if index > 0:
+            for stream in catalog["streams"]:
+                if stream["tap_stream_id"] not in GLOBAL_STREAM_NAMES:
+                    continue
+
+                for metadata in stream["metadata"]:
+                    if not metadata["breadcrumb"]:
+                        metadata["metadata"]["selected"] = False
+
+        files = {
+            "config": config,
+            "catalog": catalog,
+            "state": self.base_state,
+            "resolved-customers": customers,
+        }
+        args = []
+
+        for name, content in files.items():
+            path = directory / f"{name}-{index}.json"
+            path.write_text(json.dumps(content, default=str))
+            args.extend([f"--{name}", str(path)])
+
+        return args
+
+    @staticmethod
+    def _read_output(index: int, stdout: IO[str], lines: queue.Queue) -> None:
+        for line in stdout:
+            lines.put((index, line))
+
+        lines.put((index, None))
+
+    def run(self) -> None:
+        """Resolve customers, run the workers and write merged output to stdout."""
+        self.tap.validate_stream_filters()
+        customers = {
+            customer["context"]["customer_id"]: customer
+            for customer in resolve_customers(self.tap)
+        }
+        partitions = partition_customer_ids(
+            customers,
+            self.workers,
+            self.tap.config.get("shard_weights")
+            or self.tap.streams[CustomerHierarchyStream.name].customer_costs,
+        )
+
+        # workers sync the resolved customers, rather than resolving them again
+        self.tap.resolved_customers = customers
+
+        # workers only record the durations of their own customers, so those of
+        # customers that are no longer synced are dropped here
+        prune_sync_seconds(self.base_state, customers)
+
+        if len(partitions) < 2:
+            self.logger.info("Not enough customers to split, syncing in-process")
+            self.tap.sync_all()
+            return
+
+        self.logger.info(
+            "Syncing %d customers across %d workers", len(customers), len(partitions)
+        )
+
+        merger = SingerOutputMerger(
+            self.base_state, sys.stdout, self.tap.config["compact_state"]
+        )
+        lines: queue.Queue = queue.Queue()
+
+        with tempfile.TemporaryDirectory() as directory:
+            processes = []
+
+            for index, partition in enumerate(partitions):
+                args = self._write_worker_files(
+                    Path(directory),
+                    index,
+                    {customer_id: customers[customer_id] for customer_id in partition},
+                )
+                process = subprocess.Popen(
+                    [sys.executable, "-m", "tap_googleads", *args],
+                    stdout=subprocess.PIPE,
+                    text=True,
+                )
+                threading.Thread(
+                    target=self._read_output,
+                    args=(index, process.stdout, lines),
+                    daemon=True,
+                ).start()
+                processes.append(process)
+
+            running = len(processes)
+            while running:
+                index, line = lines.get()
+
+                if line is None:
+                    running -= 1
+                    continue
+
+                merger.process(index, line)
+
+            return_codes = [process.wait() for process in processes]
+
+        merger.write_state()
+
+        failed_workers = [i for i, code in enumerate(return_codes) if code != 0]
+        if failed_workers:
+            msg = f"Workers failed: {failed_workers}"
+            raise RuntimeError(msg)
@@ -0,0 +1,173 @@
+"""Compact encoding of per-customer stream state partitions.
+
+The SDK keeps one state partition per stream and context, e.g.
+
+    {"partitions": [
+        {"context": {"customer_id": "1", "parent_customer_id": "9"},
+         "replication_key": "segments__date",
+         "replication_key_value": "2025-01-31"},
+        ...
+    ]}
+
+which for thousands of customers repeats the same keys and values in every
+partition. The compact encoding keeps values shared by most partitions once, the
+parent of each customer once per parent, and maps each customer ID to only what
+differs - or to its replication key value, if that is all that differs:
+
+    {"compact_partitions": {
+        "defaults": {"replication_key": "segments__date",
+                     "replication_key_value": "2025-01-31"},
+        "parents": {"9": ["1", ...]},
+        "customers": {"1": {}, "2": "2025-01-30", ...}
+    }}
+
+Partitions with other contexts are kept as they are. Both encodings are read.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from collections import Counter, defaultdict
+from typing import Any, Dict, List
+
+COMPACT_PARTITIONS_KEY = "compact_partitions"
+REPLICATION_KEY_VALUE_KEY = "replication_key_value"
+
+# keys of the contexts of customer partitions
+CUSTOMER_CONTEXT_KEYS = {"customer_id", "parent_customer_id"}
+
+
+def _is_customer_partition(partition: dict) -> bool:
+    context = partition.get("context") or {}
+    return "customer_id" in context and context.keys() <= CUSTOMER_CONTEXT_KEYS
+
+
+def _shared_values(values: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the most common value of each key present in all values, if repeated."""
+    shared_values = {}
+
+    for key in set.intersection(*(set(v) for v in values)):
+        counts = Counter(json.dumps(v[key], sort_keys=True) for v in values)
+        value, count = counts.most_common(1)[0]
+
+        if count > 1:
+            shared_values[key] = json.loads(value)
+
+    return shared_values
+
+
+def compact_stream_state(stream_state: dict) -> dict:
+    """Return the compact encoding of the state of a stream."""
+    customer_partitions = {}
+    other_partitions = []
+
+    for partition in stream_state.get("partitions", []):
+        # a customer may have been synced with a different parent before
+        if (
+            not _is_customer_partition(partition)
+            or partition["context"]["customer_id"] in customer_partitions
+        ):
+            other_partitions.append(partition)
+            continue
+
+        customer_partitions[partition["context"]["customer_id"]] = partition
+
+    if not customer_partitions:
+        return stream_state
+
+    values = {
+        customer_id: {k: v for k, v in partition.items() if k != "context"}
+        for customer_id, partition in customer_partitions.items()
+    }
+    defaults = _shared_values(list(values.values()))
+    parents: Dict[str, List[str]] = defaultdict(list)
+    customers: Dict[str, Any] = {}
+
+    for customer_id, partition in customer_partitions.items():
+        parent_customer_id = partition["context"].get("parent_customer_id")
+
+        if parent_customer_id:
+            parents[parent_customer_id].append(customer_id)
+
+        value = {
+            k: v
+            for k, v in values[customer_id].items()
+            if k not in defaults or defaults[k] != v
+        }
+
+        if value.keys() == {REPLICATION_KEY_VALUE_KEY} and isinstance(
+            value[REPLICATION_KEY_VALUE_KEY], str
+        ):
+            value = value[REPLICATION_KEY_VALUE_KEY]
+
+        customers[customer_id] = value
+
+    compact_state = {k: v for k, v in stream_state.items() if k != "partitions"}
+    compact_state[COMPACT_PARTITIONS_KEY] = {
+        "defaults": defaults,
+        "parents": dict(parents),
+        "customers": customers,
+    }
+
+    if other_partitions:
+        compact_state["partitions"] = other_partitions
+
+    return compact_state
+
+
+def expand_stream_state(stream_state: dict) -> dict:
+    """Return the state of a stream with compact partitions expanded for the SDK."""
+    compact_partitions = stream_state.get(COMPACT_PARTITIONS_KEY)
+
+    if compact_partitions is None:
+        return stream_state
+
+    defaults = compact_partitions["defaults"]
+    parent_customer_ids = {
+        customer_id: parent_customer_id
+        for parent_customer_id, customer_ids in compact_partitions["parents"].items()
+        for customer_id in customer_ids
+    }
+    partitions = []
+
+    for customer_id, value in compact_partitions["customers"].items():
+        if isinstance(value, str):
+            value = {REPLICATION_KEY_VALUE_KEY: value}
+
+        context = {"customer_id": customer_id}
+
+        if customer_id in parent_customer_ids:
+            context["parent_customer_id"] = parent_customer_ids[customer_id]
+
+        partitions.append({"context": context, **copy.deepcopy(defaults), **value})
+
+    expanded_state = {
+        k: v for k, v in stream_state.items() if k != COMPACT_PARTITIONS_KEY
+    }
+    expanded_state["partitions"] = partitions + stream_state.get("partitions", [])
+
+    return expanded_state
+
+
+def _map_bookmarks(state: dict, function) -> dict:
+    if "bookmarks" not in state:
+        return state
+
+    return {
+        **state,
+        "bookmarks": {
+            stream_name: function(stream_state)
+            for stream_name, stream_state in state["bookmarks"].items()
+        },
+    }
+
+
+def compact_state(state: dict) -> dict:
+    """Return tap state with customer partitions of each stream compacted."""
+    return _map_bookmarks(state, compact_stream_state)
+
+
+def expand_state(state: dict) -> dict:
+    """Return tap state with compact partitions expanded, as the SDK expects."""
+    return _map_bookmarks(state, expand_stream_state)
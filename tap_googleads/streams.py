@@ -2,21 +2,28 @@
 
 from __future__ import annotations
 
+import math
+import time
+import zlib
 from collections import defaultdict
 from enum import Enum
-from http import HTTPStatus
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Iterable
 
 from singer_sdk import typing as th  # JSON Schema typing helpers
 
-from tap_googleads.client import GoogleAdsStream, ResumableAPIError
+from tap_googleads.client import GoogleAdsStream, _sanitise_customer_id
+from tap_googleads.progress import estimate_remaining, format_duration
 
 if TYPE_CHECKING:
     from singer_sdk.helpers.types import Context, Record
 
 SCHEMAS_DIR = Path(__file__).parent / "./schemas"
 
+# key of the last sync duration of each customer in customer_hierarchy stream state
+SYNC_SECONDS_KEY = "sync_seconds"
+
 
 class AccessibleCustomers(GoogleAdsStream):
     """Accessible Customers."""
@@ -54,12 +61,31 @@ class AccessibleCustomers(GoogleAdsStream):
             yield {"customer_id": customer_id}
 
 
+def assign_weighted_shards(
+    weights: dict[str, float],
+    shard_count: int,
+) -> dict[str, int]:
+    """Assign weighted customers to shards, heaviest first onto the least loaded."""
+    shard_loads = [0.0] * shard_count
+    customer_shards = {}
+
+    for customer_id, weight in sorted(weights.items(), key=lambda w: (-w[1], w[0])):
+        shard = min(range(shard_count), key=lambda s: (shard_loads[s], s))
+        customer_shards[customer_id] = shard
+        shard_loads[shard] += weight
+
+    return customer_shards
+
+
 class SkippedReason(Enum):
     """Reasons why a customer might be skipped"""
 
     NOT_IN_CONFIG = "Not specified in customer_id(s) config"
     MANAGER_ACCOUNT = "Manager account(s)"
     NOT_ENABLED = "Not enabled"
+    OTHER_SHARD = "Assigned to another shard"
+    PERMISSION_DENIED = "Permission denied"
+    DORMANT = "No impressions or cost in date range (metric streams skipped)"
 
     def __str__(self):
         return self.value
@@ -117,8 +143,84 @@ class CustomerHierarchyStream(GoogleAdsStream):
                FROM customer_client
                """
 
+    @cached_property
+    def customer_costs(self) -> dict[str, float]:
+        """Return the sync duration of each customer recorded by the previous run."""
+        return dict(self.stream_state.get(SYNC_SECONDS_KEY, {}))
+
+    @cached_property
+    def sync_seconds(self) -> dict[str, float]:
+        """Return the sync duration of each customer in this run.
+
+        The durations replace those of the previous run in state, so customers that
+        are no longer synced are dropped.
+        """
+        self.customer_costs  # noqa: B018 - read before it is replaced
+        sync_seconds = self.stream_state[SYNC_SECONDS_KEY] = {}
+        return sync_seconds
+
+    def _sync_children(self, child_context: Context | None) -> None:
+        # defer until all customers are known, see `get_records`
+        self._pending_child_contexts.append(child_context)
+
+    def _resolved_records(self, context: Context) -> Iterable[Record]:
+        """Yield the customers a worker pool resolved under the manager."""
+        for customer in self._tap.resolved_customers.values():
+            customer_context = customer["context"]
+            manager_id = customer_context.get(
+                "parent_customer_id", customer_context["customer_id"]
+            )
+
+            if manager_id == context["customer_id"]:
+                yield customer["record"]
+
     def get_records(self, context):
-        yield from super().get_records(context)
+        self._pending_child_contexts: list[Context | None] = []
+
+        if self._tap.resolved_customers is None:
+            yield from super().get_records(context)
+        else:
+            yield from self._resolved_records(context)
+
+        start_time = time.monotonic()
+        customer_count = len(self._pending_child_contexts)
+
+        # sync the most expensive customers first (customers without recorded
+        # costs are assumed to be expensive), so that parallel syncs finish together
+        for i, child_context in enumerate(
+            sorted(
+                self._pending_child_contexts,
+                key=lambda c: -self.customer_costs.get(c["customer_id"], math.inf)
+                if c
+                else 0,
+            ),
+            start=1,
+        ):
+            child_start_time = time.monotonic()
+            super()._sync_children(child_context)
+
+            # recorded once per customer, rather than in each child stream partition
+            if child_context:
+                self.sync_seconds[child_context["customer_id"]] = round(
+                    time.monotonic() - child_start_time, 3
+                )
+
+            if self.config["progress_log_interval_seconds"]:
+                elapsed = time.monotonic() - start_time
+                self.logger.info(
+                    "Synced %d/%d customers of %s, elapsed %s, ETA %s",
+                    i,
+                    customer_count,
+                    context and context["customer_id"],
+                    format_duration(elapsed),
+                    format_duration(estimate_remaining(elapsed, i, customer_count)),
+                )
+
+            customer_id = child_context and child_context["customer_id"]
+            if customer_id in self._tap.denied_customers:
+                self.skipped_customer_ids[SkippedReason.PERMISSION_DENIED].append(
+                    customer_id
+                )
 
         if self.skipped_customer_ids:
             self.logger.info("Some customers were skipped")
@@ -127,11 +229,6 @@ class CustomerHierarchyStream(GoogleAdsStream):
 
         self.skipped_customer_ids.clear()
 
-    def validate_response(self, response):
-        if response.status_code == HTTPStatus.FORBIDDEN:
-            msg = self.response_error_message(response)
-            raise ResumableAPIError(msg, response)
-
     def post_process(self, row, context=None):
         row = super().post_process(row, context)
         customer = row["customerClient"]
@@ -151,6 +248,49 @@ class CustomerHierarchyStream(GoogleAdsStream):
 
         return row
 
+    @cached_property
+    def shard(self) -> tuple[int, int] | None:
+        """Return the `(shard_index, shard_count)` this tap process syncs, if any."""
+        shard_count = self.config.get("shard_count")
+
+        if shard_count is None:
+            return None
+
+        shard_index = self.config.get("shard_index", 0)
+
+        if not 0 <= shard_index < shard_count:
+            msg = (
+                f"shard_index must be between 0 and {shard_count - 1}, "
+                f"got {shard_index}"
+            )
+            raise ValueError(msg)
+
+        return shard_index, shard_count
+
+    @cached_property
+    def _weighted_customer_shards(self) -> dict[str, int]:
+        _, shard_count = self.shard
+        weights = self.config.get("shard_weights") or {}
+
+        return assign_weighted_shards(
+            {_sanitise_customer_id(c): w for c, w in weights.items()},
+            shard_count,
+        )
+
+    def customer_shard(self, customer_id: str) -> int:
+        """Return the shard a customer is assigned to.
+
+        Customers without a configured weight are assigned by a stable hash of their
+        ID, so every tap process computes the same assignment.
+        """
+        _, shard_count = self.shard
+        shard = self._weighted_customer_shards.get(customer_id)
+
+        if shard is None:
+            shard = zlib.crc32(customer_id.encode()) % shard_count
+
+        return shard
+
     def generate_child_contexts(
             self,
             record: Record,
@@ -159,6 +299,17 @@ class CustomerHierarchyStream(GoogleAdsStream):
         customer = record["customerClient"]
         customer_id = customer["id"]
 
+        # resolved customers were already checked by the worker pool
+        if self._tap.resolved_customers is not None:
+            resolved_customer = self._tap.resolved_customers[customer_id]
+
+            if resolved_customer["dormant"]:
+                self._tap.dormant_customer_ids.add(customer_id)
+                self.skipped_customer_ids[SkippedReason.DORMANT].append(customer_id)
+
+            yield resolved_customer["context"]
+            return
+
         if customer["manager"]:
             self.skipped_customer_ids[SkippedReason.MANAGER_ACCOUNT].append(customer_id)
             return
@@ -167,15 +318,76 @@ class CustomerHierarchyStream(GoogleAdsStream):
             self.skipped_customer_ids[SkippedReason.NOT_ENABLED].append(customer_id)
             return
 
+        if customer_id in self._tap.denied_customers:
+            skipped_customer_ids = self.skipped_customer_ids
+            skipped_customer_ids[SkippedReason.PERMISSION_DENIED].append(customer_id)
+            return
+
+        if self.shard and self.customer_shard(customer_id) != self.shard[0]:
+            self.skipped_customer_ids[SkippedReason.OTHER_SHARD].append(customer_id)
+            return
+
         customer_context = {"customer_id": customer_id}
 
         # Add parent manager account id if this is a child
         if customer_id != context["customer_id"]:
             customer_context["parent_customer_id"] = context["customer_id"]
 
+        if self.config.get("skip_dormant_customers") and self.is_dormant(
+            customer_context
+        ):
+            self._tap.dormant_customer_ids.add(customer_id)
+            self.skipped_customer_ids[SkippedReason.DORMANT].append(customer_id)
+
         yield customer_context
 
+    def is_dormant(self, customer_context: Context) -> bool:
+        """Whether a customer had no impressions or cost in the configured date range.
+
+        The whole `start_date` to `end_date` range is checked, rather than the
+        incremental window of each stream. Each window lies within that range, so a
+        dormant customer has no activity in any of them, but customers only active
+        before a stream's bookmark are still synced. Customers that cannot be
+        checked are assumed to be active.
+        """
+        query = f"""
+            SELECT metrics.impressions, metrics.cost_micros
+            FROM customer
+            WHERE segments.date >= '{self.config["start_date"]}'
+              AND segments.date <= '{self.config["end_date"]}'
+        """
+
+        try:
+            return not any(
+                int(row.get("metrics", {}).get("impressions", 0))
+                or int(row.get("metrics", {}).get("costMicros", 0))
+                for row in self.search(customer_context, query)
+            )
+        except Exception as e:
+            self.logger.warning(
+                "Could not check activity of customer %s: %s",
+                customer_context["customer_id"],
+                e,
+            )
+            return False
+
 
 class ReportsStream(GoogleAdsStream):
     """Base class for all report streams."""
     parent_stream_type = CustomerHierarchyStream
+
+    @cached_property
+    def has_metrics(self) -> bool:
+        """Whether the stream reports metrics, rather than only entity attributes."""
+        return "metrics." in self.versioned_gaql
+
+    def get_records(self, context):
+        customer_id = context and context.get("customer_id")
+
+        if customer_id in self._tap.dormant_customer_ids and self.has_metrics:
+            self.logger.info(
+                "Skipping %s for dormant customer %s", self.name, customer_id
+            )
+            return False
+
+        return (yield from super().get_records(context))
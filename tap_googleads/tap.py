@@ -1,11 +1,19 @@
 """GoogleAds tap class."""
 
+import json
+import math
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
+import click
 from singer_sdk import Stream, Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk._singerlib import Message, StateMessage
 
+from tap_googleads.cassette import Cassette
 from tap_googleads.custom_query_stream import CustomQueryStream
 from tap_googleads.dynamic_streams import (
     AdGroupAdLabelStream,
@@ -37,6 +45,14 @@ from tap_googleads.dynamic_streams import (
     SearchTermViewStream,
     VideoStream,
 )
+from tap_googleads.denied_customers import DeniedCustomers
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.hedging import RequestHedger
+from tap_googleads.plan import QueryPlan
+from tap_googleads.profiling import StreamProfiler
+from tap_googleads.record_hashes import RecordHashStore
+from tap_googleads.runner import WorkerPool
+from tap_googleads.state import compact_state, expand_state
 from tap_googleads.streams import AccessibleCustomers, CustomerHierarchyStream
 
 STREAM_TYPES = [
@@ -78,6 +94,12 @@ class TapGoogleAds(Tap):
 
     name = "tap-googleads"
 
+    # customers resolved by a worker pool, by ID, synced without resolving them again
+    resolved_customers: Optional[Dict[str, dict]] = None
+
+    _last_state_message_time = -math.inf
+    _state_message_withheld = False
+
     _refresh_token = th.Property(
         "refresh_token",
         th.StringType,
@@ -128,6 +150,11 @@ class TapGoogleAds(Tap):
             required=True,
             secret=True,
         ),
+        th.Property(
+            "token_cache_path",
+            th.StringType,
+            description="Path to a local file to cache OAuth access tokens in, so that tap processes started while a token is still valid do not request a new one. The file contains access tokens and should be kept private.",
+        ),
         th.Property(
             "login_customer_id",
             CUSTOMER_ID_TYPE,
@@ -143,6 +170,17 @@ class TapGoogleAds(Tap):
             CUSTOMER_ID_TYPE,
             description="Get data for the provided customer only, rather than all accessible customers. Superseeded by `customer_ids`.",
         ),
+        th.Property(
+            "denied_customers_cache_path",
+            th.StringType,
+            description="Path to a local file to record customers the tap was denied access to (`USER_PERMISSION_DENIED`, `CUSTOMER_NOT_ENABLED`), so later runs skip them without issuing requests for each stream.",
+        ),
+        th.Property(
+            "denied_customers_ttl_hours",
+            th.NumberType,
+            description="How long customers recorded in `denied_customers_cache_path` are skipped for, in hours.",
+            default=24,
+        ),
         th.Property(
             "start_date",
             th.DateType,
@@ -161,6 +199,12 @@ class TapGoogleAds(Tap):
             description="Enables the tap's ClickViewReportStream. This requires setting up / permission on your google ads account(s)",
             default=False,
         ),
+        th.Property(
+            "skip_dormant_customers",
+            th.BooleanType,
+            description="Check each client customer for impressions or cost between `start_date` and `end_date` with a single query, and skip streams that report metrics for customers without any.",
+            default=False,
+        ),
         th.Property(
             "custom_queries",
             th.ArrayType(
@@ -202,6 +246,110 @@ class TapGoogleAds(Tap):
             description="A list of custom queries to run. Each query will be assigned a stream with the name specified in the `name` field.",
             default=[],
         ),
+        th.Property(
+            "shard_count",
+            th.IntegerType,
+            description="Split client customers into this many shards, so that independent tap processes can each sync a disjoint subset of customers. Customers are assigned by a stable hash of their ID.",
+        ),
+        th.Property(
+            "shard_index",
+            th.IntegerType,
+            description="The zero-based shard of client customers to sync when `shard_count` is set.",
+            default=0,
+        ),
+        th.Property(
+            "shard_weights",
+            th.ObjectType(additional_properties=th.NumberType),
+            description="Optional mapping of customer IDs to relative sync cost (e.g. historical row counts). Weighted customers are spread across shards heaviest first, each onto the least loaded shard.",
+        ),
+        th.Property(
+            "stream_filters",
+            th.ObjectType(additional_properties=th.ArrayType(th.StringType)),
+            description="A mapping of stream names to lists of GAQL conditions added to the `WHERE` clause of the stream query (e.g. `{\"campaign_history\": [\"campaign.status != 'REMOVED'\"]}`). Applies to built-in and custom query streams.",
+            default={},
+        ),
+        th.Property(
+            "min_refresh_interval_hours",
+            th.ObjectType(additional_properties=th.NumberType),
+            description="A mapping of stream names to the minimum number of hours between syncs of the stream for a customer (e.g. `{\"label\": 6}`). Syncs within this interval of the last complete sync are skipped. Defaults to 168 hours for `geo_target_constant` and `user_interest`, and 24 hours for `label` and `audience`. Set to `0` to sync a stream on every run.",
+            default={},
+        ),
+        th.Property(
+            "omit_unselected_resource_names",
+            th.BooleanType,
+            description="Add `PARAMETERS omit_unselected_resource_names = true` to all report queries, so the API only returns the `resourceName` of resources explicitly selected in the query. Reduces response size for wide reports.",
+            default=False,
+        ),
+        th.Property(
+            "snapshot_dimension_streams",
+            th.BooleanType,
+            description="Sync `ad_group_ad`, `customer` and `campaign_history` as one row per entity with its current attributes, rather than one row per entity per day in the date range. These streams are then synced with full table replication.",
+            default=False,
+        ),
+        th.Property(
+            "record_hash_store_path",
+            th.StringType,
+            description="Path to a local SQLite file of record content hashes. When set, records whose content is unchanged since they were last emitted are not emitted again. Delete the file to emit all records on the next run.",
+        ),
+        th.Property(
+            "enable_change_status_sync",
+            th.BooleanType,
+            description="Sync only entities changed since the last sync for streams that support it (`ad_group_criterion`, `ad_listing_group_criterion` and `campaign_criterion`), using the `change_status` resource.",
+            default=False,
+        ),
+        th.Property(
+            "change_status_full_refresh_days",
+            th.IntegerType,
+            description="How often to run a full sync of streams synced with `enable_change_status_sync`, in days.",
+            default=7,
+        ),
+        th.Property(
+            "progress_log_interval_seconds",
+            th.IntegerType,
+            description="How often to log the progress of long running report queries (rows, pages, throughput and ETA, from the total row count returned with the first page), in seconds. Progress is logged as pages complete. Disabled by default (`0`).",
+            default=0,
+        ),
+        th.Property(
+            "compact_state",
+            th.BooleanType,
+            description="Write state with the partitions of each stream encoded as one map of customer IDs to what differs from values shared by most customers (e.g. the replication key value), rather than one partition object per customer. Reduces state size for many customers. Both encodings are read.",
+            default=False,
+        ),
+        th.Property(
+            "state_message_interval_seconds",
+            th.IntegerType,
+            description="Write `STATE` messages at most this often, in seconds, rather than after every customer of every stream. The latest state is always written at the end of the sync. Set to `0` to write every state change.",
+            default=0,
+        ),
+        th.Property(
+            "profile_dir",
+            th.StringType,
+            description="Directory to write per-stream CPU (`cProfile`) and memory allocation (`tracemalloc`) profiles of the sync to, with a summary of the hottest functions. Profiling slows down the sync, so only set this to investigate performance.",
+        ),
+        th.Property(
+            "cassette_dir",
+            th.StringType,
+            description="Directory to archive raw API responses to (`cassette_mode` `record`), or to serve API requests from without network access (`cassette_mode` `replay`), e.g. to reprocess previously synced data.",
+        ),
+        th.Property(
+            "cassette_mode",
+            th.StringType,
+            description="Whether to `record` API responses to `cassette_dir`, or `replay` them from it.",
+            default="record",
+            allowed_values=["record", "replay"],
+        ),
+        th.Property(
+            "hedge_requests",
+            th.BooleanType,
+            description="Send a search request again if it has not returned within `hedge_latency_percentile` of the latency of its stream, and use whichever response returns first. This cuts the time lost to slow pages, at the cost of a few more requests.",
+            default=False,
+        ),
+        th.Property(
+            "hedge_latency_percentile",
+            th.NumberType,
+            description="Percentile of the latency of search requests of a stream after which requests are hedged, with `hedge_requests`.",
+            default=95,
+        ),
         th.Property(
             "api_version",
             th.StringType,
@@ -210,6 +358,193 @@ class TapGoogleAds(Tap):
         ),
     ).to_dict()
 
+    @classmethod
+    def invoke(
+        cls,
+        *,
+        workers: int = 1,
+        plan: bool = False,
+        plan_row_estimates: bool = False,
+        resolved_customers: Optional[str] = None,
+        about: bool = False,
+        about_format: Optional[str] = None,
+        config: Tuple[str, ...] = (),
+        state: Optional[str] = None,
+        catalog: Optional[str] = None,
+    ) -> None:
+        """Invoke the tap's command line interface, with workers or a query plan."""
+        if about or (workers < 2 and not plan and not resolved_customers):
+            return super().invoke(
+                about=about,
+                about_format=about_format,
+                config=config,
+                state=state,
+                catalog=catalog,
+            )
+
+        cls.print_version(print_fn=cls.logger.info)
+        config_files, parse_env_config = cls.config_from_cli_args(*config)
+
+        tap = cls(
+            config=config_files,  # type: ignore[arg-type]
+            state=state,
+            catalog=catalog,
+            parse_env_config=parse_env_config,
+            validate_config=True,
+        )
+
+        if plan:
+            QueryPlan(tap, estimate_rows=plan_row_estimates).write()
+            return
+
+        if resolved_customers:
+            tap.resolved_customers = json.loads(Path(resolved_customers).read_text())
+            tap.sync_all()
+            return
+
+        WorkerPool(tap, workers).run()
+
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        """Add the `--workers` and `--plan` options to the tap CLI."""
+        command = super().get_singer_command()
+        command.params.append(
+            click.Option(
+                ["--workers"],
+                type=click.IntRange(min=1),
+                default=1,
+                help="Sync customers across this many worker processes, merging "
+                "their output into a single Singer stream.",
+            )
+        )
+        command.params.append(
+            click.Option(
+                ["--plan"],
+                is_flag=True,
+                help="Print the queries a sync would run per stream and customer, "
+                "without syncing.",
+            )
+        )
+        command.params.append(
+            click.Option(
+                ["--plan-row-estimates"],
+                is_flag=True,
+                help="With --plan, request the number of rows of each query.",
+            )
+        )
+        command.params.append(
+            click.Option(
+                ["--resolved-customers"],
+                hidden=True,
+                help="File of customers resolved by the worker pool, for its workers.",
+            )
+        )
+
+        return command
+
+    def validate_stream_filters(self) -> None:
+        """Validate the filters of all selected streams, before any are synced.
+
+        Raises:
+            ValueError: If a filter references a field that cannot be filtered on.
+        """
+        for stream in self.streams.values():
+            if isinstance(stream, DynamicQueryStream) and stream.selected:
+                stream.stream_filters  # noqa: B018
+
+    def sync_all(self) -> None:
+        self.validate_stream_filters()
+
+        try:
+            super().sync_all()
+        finally:
+            if self._state_message_withheld:
+                self.write_message(StateMessage(value=self.state))
+
+            if self.profiler:
+                self.profiler.write()
+
+            if self.hedger:
+                self.hedger.log_metrics(self.logger)
+
+    @cached_property
+    def denied_customers(self) -> DeniedCustomers:
+        """Return the customers the tap was denied access to."""
+        return DeniedCustomers(
+            self.config.get("denied_customers_cache_path"),
+            timedelta(hours=self.config["denied_customers_ttl_hours"]),
+        )
+
+    @cached_property
+    def dormant_customer_ids(self) -> Set[str]:
+        """Return the customers found to have no metrics in the configured range."""
+        return set()
+
+    @cached_property
+    def profiler(self) -> Optional[StreamProfiler]:
+        """Return the profiler of stream syncs, if configured."""
+        profile_dir = self.config.get("profile_dir")
+
+        if profile_dir is None:
+            return None
+
+        return StreamProfiler(profile_dir, self.logger)
+
+    @cached_property
+    def cassette(self) -> Optional[Cassette]:
+        """Return the archive of API responses to record or replay, if configured."""
+        cassette_dir = self.config.get("cassette_dir")
+
+        if cassette_dir is None:
+            return None
+
+        return Cassette(cassette_dir, self.config["cassette_mode"])
+
+    @cached_property
+    def hedger(self) -> Optional[RequestHedger]:
+        """Return the sender of hedged search requests, if configured."""
+        if not self.config["hedge_requests"]:
+            return None
+
+        return RequestHedger(self.config["hedge_latency_percentile"])
+
+    def load_state(self, state: dict) -> None:
+        super().load_state(expand_state(state))
+
+    def write_message(self, message: Message) -> None:
+        if isinstance(message, StateMessage):
+            self._last_state_message_time = time.monotonic()
+            self._state_message_withheld = False
+
+            if self.config["compact_state"]:
+                message = StateMessage(value=compact_state(message.value))
+
+        super().write_message(message)
+
+    def withhold_state_message(self) -> bool:
+        """Whether to withhold a STATE message, per `state_message_interval_seconds`.
+
+        Withheld state is written with a later STATE message, or at the end of the
+        sync.
+        """
+        interval = self.config["state_message_interval_seconds"]
+
+        if not interval or time.monotonic() - self._last_state_message_time >= interval:
+            return False
+
+        self._state_message_withheld = True
+        return True
+
+    @cached_property
+    def record_hash_store(self) -> Optional[RecordHashStore]:
+        """Return the store of emitted record hashes, if configured."""
+        path = self.config.get("record_hash_store_path")
+
+        if path is None:
+            return None
+
+        return RecordHashStore(path)
+
     def setup_mapper(self):
         self._config.setdefault("flattening_enabled", True)
         self._config.setdefault("flattening_max_depth", 2)
@@ -222,13 +557,28 @@ class TapGoogleAds(Tap):
         if self.config["enable_click_view_report_stream"]:
             streams.append(ClickViewReportStream(tap=self))
 
-        if not self.config["custom_queries"]:
-            return streams
+        if self.config["custom_queries"]:
+            streams.extend(self._discover_custom_query_streams())
 
+        unknown_filter_stream_names = self.config["stream_filters"].keys() - {
+            stream.name for stream in streams
+        }
+
+        if unknown_filter_stream_names:
+            self.logger.warning(
+                "Ignoring filters for unknown streams: %s",
+                sorted(unknown_filter_stream_names),
+            )
+
+        return streams
+
+    def _discover_custom_query_streams(self) -> List[Stream]:
         class _CustomClickViewReportStream(CustomQueryStream, ClickViewReportStream):
             def __init__(self, *args, **kwargs):
                 super().__init__(*args, **kwargs)
 
+        streams: List[Stream] = []
+
         for custom_query in self.config["custom_queries"]:
             stream_cls = (
                 _CustomClickViewReportStream
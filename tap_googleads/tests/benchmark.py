@@ -0,0 +1,255 @@
+"""Offline micro-benchmarks of DynamicQueryStream schema building and row processing.
+
+Field metadata and rows are generated from each built-in stream's GAQL with a fixed
+seed, so results are comparable between runs:
+
+    python -m tap_googleads.tests.benchmark --output baseline.json
+    python -m tap_googleads.tests.benchmark --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+import humps
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream, is_object_field
+from tap_googleads.dynamic_streams import ClickViewReportStream
+from tap_googleads.tap import STREAM_TYPES, TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "benchmark_client_id",
+        "client_secret": "benchmark_client_secret",
+        "refresh_token": "benchmark_refresh_token",
+    },
+    "developer_token": "benchmark_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+    "enable_click_view_report_stream": True,
+}
+
+INTEGER_METRIC_SUFFIXES = ("clicks", "impressions", "_micros", "views", "interactions")
+REPEATED_FIELD_SUFFIXES = ("labels", "urls", "descriptions", "headlines", "images")
+ENUM_FIELD_SUFFIXES = ("status", "type", "device", "level", "match_type", "slot")
+WORDS = ("summer", "sale", "brand", "shoes", "search", "display", "video", "exact")
+
+
+def field_metadata(field: str) -> Dict[str, Any]:
+    """Return plausible `googleAdsFields` metadata for a GAQL field."""
+    metadata: Dict[str, Any] = {"name": field, "dataType": "STRING"}
+    name = field.rsplit(".", 1)[-1]
+
+    if field.startswith("metrics."):
+        metadata["dataType"] = (
+            "INT64" if name.endswith(INTEGER_METRIC_SUFFIXES) else "DOUBLE"
+        )
+    elif name == "id":
+        metadata["dataType"] = "INT64"
+    elif field in ("segments.date",):
+        metadata["dataType"] = "DATE"
+    elif name.endswith(ENUM_FIELD_SUFFIXES):
+        metadata["dataType"] = "ENUM"
+        metadata["enumValues"] = ["UNSPECIFIED", "UNKNOWN", "ENABLED", "PAUSED"]
+    elif name.startswith(("manager", "test_account", "auto_tagging")):
+        metadata["dataType"] = "BOOLEAN"
+
+    if name.endswith(REPEATED_FIELD_SUFFIXES):
+        metadata["isRepeated"] = True
+
+    return metadata
+
+
+def fields_metadata(fields: List[str]) -> Dict[str, Dict[str, Any]]:
+    return {field: field_metadata(field) for field in fields}
+
+
+def field_value(metadata: Dict[str, Any], rng: random.Random) -> Any:
+    """Return a value as the API would return it for a field."""
+    data_type = metadata["dataType"]
+
+    if data_type == "INT64":
+        value: Any = str(rng.randrange(10**9))  # 64-bit integers are JSON strings
+    elif data_type == "DOUBLE":
+        value = rng.random()
+    elif data_type == "DATE":
+        value = f"2025-01-{rng.randrange(1, 32):02d}"
+    elif data_type == "ENUM":
+        value = rng.choice(metadata["enumValues"])
+    elif data_type == "BOOLEAN":
+        value = rng.random() < 0.5
+    else:
+        value = " ".join(rng.choice(WORDS) for _ in range(rng.randrange(1, 5)))
+
+    if metadata.get("isRepeated"):
+        return [value for _ in range(rng.randrange(1, 4))]
+
+    return value
+
+
+def generate_row(fields: List[str], rng: random.Random) -> Dict[str, Any]:
+    """Return a nested `googleAds:search` result row for the fields of a query."""
+    row: Dict[str, Any] = {}
+
+    for field in fields:
+        *parents, name = [humps.camelize(part) for part in field.split(".")]
+        node = row
+
+        for parent in parents:
+            node = node.setdefault(parent, {})
+
+        value = field_value(field_metadata(field), rng)
+        node[name] = {"text": value} if is_object_field(field) else value
+
+    return row
+
+
+def benchmark_stream(
+    stream: DynamicQueryStream,
+    rows: int,
+    repeat: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Return timings of schema building and `post_process` for a stream."""
+    fields = list(fields_metadata_calls(stream))
+    rng = random.Random(seed)
+    records = [generate_row(fields, rng) for _ in range(rows)]
+    context = {"customer_id": "1234567890"}
+
+    schema_seconds = []
+    for _ in range(repeat):
+        stream.__dict__.pop("schema", None)
+        start = time.perf_counter()
+        stream.schema
+        schema_seconds.append(time.perf_counter() - start)
+
+    post_process_seconds = []
+    for _ in range(repeat):
+        # post_process may modify rows in place
+        batch = json.loads(json.dumps(records))
+        start = time.perf_counter()
+        for record in batch:
+            stream.post_process(record, context)
+        post_process_seconds.append(time.perf_counter() - start)
+
+    batch = json.loads(json.dumps(records))
+    tracemalloc.start()
+    for record in batch:
+        stream.post_process(record, context)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "fields": len(fields),
+        "schema_us": min(schema_seconds) * 1e6,
+        "post_process_ns_per_row": min(post_process_seconds) / rows * 1e9,
+        "post_process_peak_bytes_per_row": peak / rows,
+    }
+
+
+def fields_metadata_calls(stream: DynamicQueryStream) -> List[str]:
+    """Return the fields the stream schema requests metadata for."""
+    with mock.patch.object(
+        DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+    ) as get_fields_metadata:
+        stream.__dict__.pop("schema", None)
+        stream.schema
+
+    return get_fields_metadata.call_args.args[0]
+
+
+def run(rows: int = 1000, repeat: int = 5, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """Benchmark all built-in report streams."""
+    stream_types = [
+        stream_type
+        for stream_type in [*STREAM_TYPES, ClickViewReportStream]
+        if issubclass(stream_type, DynamicQueryStream)
+    ]
+    catalog = {"streams": [{"tap_stream_id": t.name} for t in stream_types]}
+    tap = TapGoogleAds(config=CONFIG, catalog=catalog)
+    results = {}
+
+    with mock.patch.object(
+        DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+    ):
+        for stream_type in stream_types:
+            stream = stream_type(tap=tap)
+            results[stream.name] = benchmark_stream(stream, rows, repeat, seed)
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """Return descriptions of timings that regressed beyond the tolerance."""
+    regressions = []
+
+    for stream_name, result in results.items():
+        for key in ("schema_us", "post_process_ns_per_row"):
+            baseline_value = baseline.get(stream_name, {}).get(key)
+
+            if baseline_value and result[key] > baseline_value * (1 + tolerance):
+                regressions.append(
+                    f"{stream_name} {key}: {result[key]:.0f} "
+                    f"(baseline {baseline_value:.0f})"
+                )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", help="Baseline JSON results to compare with.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown allowed before --compare fails (default: 0.2).",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.repeat, args.seed)
+
+    print(
+        f"{'stream':<48} {'fields':>6} {'schema us':>10} "
+        f"{'ns/row':>10} {'peak B/row':>10}"
+    )
+    for stream_name, result in results.items():
+        print(
+            f"{stream_name:<48} {result['fields']:>6} {result['schema_us']:>10.0f} "
+            f"{result['post_process_ns_per_row']:>10.0f} "
+            f"{result['post_process_peak_bytes_per_row']:>10.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""Local stand-in for the Google Ads REST API, with injectable faults and latency.
+
+Requests are served through `responses`, so no network access is needed. Time is
+simulated: response latency, request timeouts and the backoff waits of the SDK
+retry path advance a virtual clock instead of sleeping, so the time a sync would
+take under faults can be measured in milliseconds of real time.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import backoff
+import requests
+import responses
+
+# faults, by HTTP status or TIMEOUT
+RATE_LIMITED = 429
+INTERNAL = 500
+UNAVAILABLE = 503
+PERMISSION_DENIED = 403
+DEADLINE_EXCEEDED = 504
+TIMEOUT = "timeout"
+
+FAULT_ERRORS = {
+    RATE_LIMITED: ("RESOURCE_EXHAUSTED", {"quotaError": "RESOURCE_EXHAUSTED"}),
+    INTERNAL: ("INTERNAL", {"internalError": "INTERNAL_ERROR"}),
+    UNAVAILABLE: ("UNAVAILABLE", {"internalError": "TRANSIENT_ERROR"}),
+    PERMISSION_DENIED: (
+        "PERMISSION_DENIED",
+        {"authorizationError": "USER_PERMISSION_DENIED"},
+    ),
+    DEADLINE_EXCEEDED: ("DEADLINE_EXCEEDED", {"internalError": "DEADLINE_EXCEEDED"}),
+}
+
+SEARCH_URL = re.compile(
+    r"https://googleads\.googleapis\.com/v\d+/customers/(\d+)/googleAds:search"
+)
+START_DATE = date(2025, 1, 1)
+
+# query conditions the stand-in filters report rows by
+CONDITION_PATTERN = re.compile(
+    r"(segments\.date|campaign\.id)\s*(>=|<=|<|=)\s*'?([\d-]+)'?"
+)
+CONDITION_OPERATORS = {
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    "<": lambda a, b: a < b,
+    "=": lambda a, b: a == b,
+}
+
+
+class VirtualClock:
+    """Simulated time, standing in for the `time` module of `backoff`."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept = 0.0
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def constant_latency(seconds: float) -> Callable[[random.Random], float]:
+    return lambda rng: seconds
+
+
+def lognormal_latency(median: float, sigma: float) -> Callable[[random.Random], float]:
+    """Return a long-tailed latency distribution, typical of search requests."""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+class FaultSchedule:
+    """Decides which requests fail, and how.
+
+    Faults are injected for a fraction of all requests (`rates`), for specific
+    requests by their zero-based index (`requests`), or for every request of a
+    customer (`customers`), e.g. to deny access to it.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[object, float]] = None,
+        requests: Optional[Dict[int, object]] = None,
+        customers: Optional[Dict[str, object]] = None,
+    ) -> None:
+        self.rates = rates or {}
+        self.requests = requests or {}
+        self.customers = customers or {}
+
+    def fault(
+        self,
+        index: int,
+        customer_id: Optional[str],
+        rng: random.Random,
+    ) -> Optional[object]:
+        if customer_id in self.customers:
+            return self.customers[customer_id]
+
+        if index in self.requests:
+            return self.requests[index]
+
+        draw = rng.random()
+
+        for fault, rate in self.rates.items():
+            if draw < rate:
+                return fault
+            draw -= rate
+
+        return None
+
+
+class ApiStandIn:
+    """Serves managers with client customers, and a report of rows per customer.
+
+    Reports have `rows_per_customer` rows of `campaign.id`, `segments.date` and
+    `metrics.clicks` per campaign, one per day from `start_date`, in pages of
+    `page_size`. Rows of `click_view` queries also have a `click_view.gclid`. Rows
+    are filtered by the date and campaign ID range conditions of the query.
+    Queries of more than `max_rows_per_query` rows fail with `DEADLINE_EXCEEDED`.
+
+    With `real_latency`, response latency is slept in real time rather than
+    simulated, e.g. to test concurrent requests.
+    """
+
+    def __init__(
+        self,
+        hierarchy: Dict[str, List[str]],
+        rows_per_customer: int = 1,
+        page_size: int = 10000,
+        faults: Optional[FaultSchedule] = None,
+        latency: Callable[[random.Random], float] = constant_latency(0),
+        timeout: float = 300,
+        seed: int = 0,
+        campaigns_per_customer: int = 1,
+        max_rows_per_query: Optional[int] = None,
+        real_latency: bool = False,
+        start_date: date = START_DATE,
+    ) -> None:
+        self.hierarchy = hierarchy
+        self.rows_per_customer = rows_per_customer
+        self.page_size = page_size
+        self.campaigns_per_customer = campaigns_per_customer
+        self.max_rows_per_query = max_rows_per_query
+        self.real_latency = real_latency
+        self.start_date = start_date
+        self.faults = faults or FaultSchedule()
+        self.latency = latency
+        self.timeout = timeout
+        self.clock = VirtualClock()
+        self.requests: List[str] = []
+        self.queries: List[str] = []
+        self.injected_faults: Counter = Counter()
+        self._rng = random.Random(seed)
+
+    @property
+    def client_ids(self) -> List[str]:
+        return [c for client_ids in self.hierarchy.values() for c in client_ids]
+
+    @contextmanager
+    def serve(self) -> Iterator[responses.RequestsMock]:
+        """Serve API requests and simulate time while in the context."""
+        with responses.RequestsMock(
+            assert_all_requests_are_fired=False
+        ) as rsps, mock.patch.object(backoff._sync, "time", self.clock):
+            rsps.add_callback(
+                responses.GET,
+                re.compile(r".*/customers:listAccessibleCustomers"),
+                callback=self._list_accessible_customers,
+            )
+            rsps.add_callback(responses.POST, SEARCH_URL, callback=self._search)
+            yield rsps
+
+    def _list_accessible_customers(self, request):
+        return self._respond(
+            "listAccessibleCustomers",
+            None,
+            {"resourceNames": [f"customers/{m}" for m in self.hierarchy]},
+        )
+
+    def _search(self, request):
+        customer_id = SEARCH_URL.match(request.url).group(1)
+        query = json.loads(request.body)["query"]
+        self.queries.append(query)
+        page_token = parse_qs(urlparse(request.url).query).get("pageToken", ["0"])[0]
+
+        resource = re.search(r"\bFROM\s+(\w+)", query).group(1)
+
+        if resource == "customer_client":
+            rows = self._hierarchy_rows(customer_id)
+            description = f"customer_client {customer_id}"
+        elif "metrics." in query:
+            rows = self._report_rows(customer_id, query, resource)
+            description = f"report {customer_id}"
+
+            if (
+                page_token == "0"
+                and self.max_rows_per_query is not None
+                and len(rows) > self.max_rows_per_query
+            ):
+                return self._respond(description, customer_id, {}, DEADLINE_EXCEEDED)
+        elif resource == "campaign":
+            rows = [{"campaign": {"id": i}} for i in self.campaign_ids(customer_id)]
+            description = f"campaign {customer_id}"
+        else:
+            # other entities are not served
+            rows = []
+            description = f"{resource} {customer_id}"
+
+        page = int(page_token)
+        start, end = page * self.page_size, (page + 1) * self.page_size
+        body = {"results": rows[start:end]}
+
+        if (page + 1) * self.page_size < len(rows):
+            body["nextPageToken"] = str(page + 1)
+
+        return self._respond(description, customer_id, body)
+
+    def _respond(
+        self,
+        description: str,
+        customer_id: Optional[str],
+        body: dict,
+        fault: Optional[object] = None,
+    ):
+        index = len(self.requests)
+        self.requests.append(description)
+        fault = fault or self.faults.fault(index, customer_id, self._rng)
+
+        if fault is None:
+            self._wait(self.latency(self._rng))
+            return 200, {}, json.dumps(body)
+
+        self.injected_faults[fault] += 1
+
+        if fault == TIMEOUT:
+            self.clock.advance(self.timeout)
+            return 0, {}, requests.exceptions.ReadTimeout("Read timed out")
+
+        self._wait(self.latency(self._rng))
+        status, error_code = FAULT_ERRORS[fault]
+        error = {
+            "error": {
+                "code": fault,
+                "message": status,
+                "status": status,
+                "details": [{"errors": [{"errorCode": error_code}]}],
+            }
+        }
+
+        return fault, {}, json.dumps(error)
+
+    def _wait(self, seconds: float) -> None:
+        if self.real_latency:
+            time.sleep(seconds)
+        else:
+            self.clock.advance(seconds)
+
+    def _hierarchy_rows(self, manager_id: str) -> List[dict]:
+        manager = {
+            "clientCustomer": f"customers/{manager_id}",
+            "id": manager_id,
+            "level": "0",
+            "manager": True,
+            "status": "ENABLED",
+        }
+        clients = [
+            {
+                "clientCustomer": f"customers/{client_id}",
+                "id": client_id,
+                "level": "1",
+                "manager": False,
+                "status": "ENABLED",
+            }
+            for client_id in self.hierarchy.get(manager_id, [])
+        ]
+
+        return [{"customerClient": customer} for customer in [manager, *clients]]
+
+    def campaign_ids(self, customer_id: str) -> List[str]:
+        if self.campaigns_per_customer == 1:
+            return [customer_id]
+
+        return [
+            str(int(customer_id) * 1000 + c) for c in range(self.campaigns_per_customer)
+        ]
+
+    def _report_rows(self, customer_id: str, query: str, resource: str) -> List[dict]:
+        rows = [
+            {
+                "campaign": {"id": campaign_id},
+                "segments": {"date": (self.start_date + timedelta(days=i)).isoformat()},
+                "metrics": {"clicks": str(i)},
+            }
+            for i in range(self.rows_per_customer)
+            for campaign_id in self.campaign_ids(customer_id)
+        ]
+
+        if resource == "click_view":
+            for row in rows:
+                row["clickView"] = {
+                    "gclid": f"{row['campaign']['id']}-{row['segments']['date']}"
+                }
+
+        for field, operator, value in CONDITION_PATTERN.findall(query):
+            compare = CONDITION_OPERATORS[operator]
+
+            if field == "campaign.id":
+                rows = [
+                    r for r in rows if compare(int(r["campaign"]["id"]), int(value))
+                ]
+            else:
+                rows = [r for r in rows if compare(r["segments"]["date"], value)]
+
+        return rows
@@ -0,0 +1,91 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+import responses
+
+from tap_googleads.auth import TOKEN_REFRESH_MARGIN_SECONDS, GoogleAdsAuthenticator
+from tap_googleads.streams import AccessibleCustomers
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+}
+
+AUTH_ENDPOINT = "https://www.googleapis.com/oauth2/v4/token"
+
+
+class TestTokenCache(unittest.TestCase):
+    def _authenticate(self, token_cache_path):
+        # authenticators are singletons, so use a new class per process
+        class Authenticator(GoogleAdsAuthenticator):
+            pass
+
+        catalog = {"streams": [{"tap_stream_id": AccessibleCustomers.name}]}
+        tap = TapGoogleAds(
+            config={**CONFIG, "token_cache_path": token_cache_path}, catalog=catalog
+        )
+        authenticator = Authenticator(
+            stream=AccessibleCustomers(tap=tap), auth_endpoint=AUTH_ENDPOINT
+        )
+        request = authenticator.authenticate_request(
+            requests.Request("GET", "https://example.com").prepare()
+        )
+        self.addCleanup(authenticator._refresh_timer.cancel)
+
+        return authenticator, request
+
+    @responses.activate
+    def test_token_shared_between_processes(self):
+        responses.add(
+            responses.POST,
+            AUTH_ENDPOINT,
+            json={"access_token": "access_token", "expires_in": 3600},
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "tokens.json")
+
+            authenticator, request = self._authenticate(path)
+            _, cached_request = self._authenticate(path)
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(request.headers["Authorization"], "Bearer access_token")
+        self.assertEqual(cached_request.headers["Authorization"], "Bearer access_token")
+        self.assertAlmostEqual(
+            authenticator._refresh_timer.interval,
+            3600 - TOKEN_REFRESH_MARGIN_SECONDS,
+            delta=5,
+        )
+
+    @responses.activate
+    def test_expiring_cached_token_is_refreshed(self):
+        responses.add(
+            responses.POST,
+            AUTH_ENDPOINT,
+            json={"access_token": "access_token", "expires_in": 3600},
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "tokens.json"
+
+            self._authenticate(str(path))
+
+            tokens = json.loads(path.read_text())
+            for token in tokens.values():
+                token["last_refreshed"] = (
+                    datetime.now(timezone.utc) - timedelta(seconds=3500)
+                ).isoformat()
+            path.write_text(json.dumps(tokens))
+
+            self._authenticate(str(path))
+
+        self.assertEqual(len(responses.calls), 2)
@@ -27,7 +27,11 @@ class TestTapGoogleadsWithBaseCredentials(unittest.TestCase):
         responses.reset()
         del test_utils.SINGER_MESSAGES[:]
 
-        TapGoogleAds.write_message = test_utils.accumulate_singer_messages
+        write_message_patcher = mock.patch.object(
+            TapGoogleAds, "write_message", test_utils.accumulate_singer_messages
+        )
+        write_message_patcher.start()
+        self.addCleanup(write_message_patcher.stop)
 
         patcher = mock.patch(
             "tap_googleads.dynamic_query_stream.DynamicQueryStream.get_fields_metadata"
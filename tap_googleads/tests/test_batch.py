@@ -0,0 +1,115 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from singer_sdk.helpers._batch import BatchConfig, BatchFileFormat
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+}
+
+ROWS = [
+    {
+        "campaign": {"id": "1", "name": "a"},
+        "metrics": {"costMicros": "1000", "ctr": 0.5},
+        "segments": {"date": "2025-01-01"},
+    },
+    {
+        "campaign": {"id": "2", "name": "b"},
+        "metrics": {"costMicros": "2000", "ctr": 0.25},
+        "segments": {"date": "2025-01-02"},
+    },
+    {
+        "campaign": {"id": "3", "name": "c"},
+        "segments": {"date": "2025-01-03"},
+    },
+]
+
+
+class FixedRowsStream(DynamicQueryStream):
+    name = "fixed_rows"
+    replication_key = "segments__date"
+    schema = {
+        "properties": {
+            "campaign__id": {"type": ["integer", "null"]},
+            "campaign__name": {"type": ["string", "null"]},
+            "metrics__costMicros": {"type": ["integer", "null"]},
+            "metrics__ctr": {"type": ["number", "null"]},
+            "segments__date": {"type": ["string", "null"], "format": "date"},
+            "customer_id": {"type": ["string", "null"]},
+        }
+    }
+
+    def request_records(self, context):
+        yield from ROWS
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+class TestParquetBatches(unittest.TestCase):
+    def test_parquet_batches_are_typed_and_chunked(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as root:
+            batch_config = BatchConfig.from_dict(
+                {
+                    "encoding": {"format": "parquet"},
+                    "storage": {"root": f"file://{root}"},
+                    "batch_size": 2,
+                }
+            )
+            catalog = {"streams": [{"tap_stream_id": FixedRowsStream.name}]}
+            tap = TapGoogleAds(config=CONFIG, catalog=catalog)
+            stream = FixedRowsStream(tap=tap)
+
+            batches = list(stream.get_batches(batch_config, {"customer_id": "123"}))
+
+            self.assertEqual(len(batches), 2)
+
+            filenames = sorted(Path(root).iterdir())
+            self.assertIn("-123-2025-01-01_2025-01-02-", filenames[0].name)
+            self.assertIn("-123-2025-01-03_2025-01-03-", filenames[1].name)
+
+            table = pa.concat_tables(pq.read_table(f) for f in filenames)
+
+        self.assertEqual(table.schema.field("campaign__id").type, pa.int64())
+        self.assertEqual(table.schema.field("metrics__ctr").type, pa.float64())
+        self.assertEqual(table.schema.field("segments__date").type, pa.date32())
+        self.assertEqual(
+            table.column("metrics__costMicros").to_pylist(), [1000, 2000, None]
+        )
+        self.assertEqual(table.column("customer_id").to_pylist(), ["123"] * 3)
+
+
+class TestParquetFallback(unittest.TestCase):
+    def test_missing_pyarrow_falls_back_to_jsonl_without_changing_config(self):
+        with tempfile.TemporaryDirectory() as root:
+            batch_config = BatchConfig.from_dict(
+                {
+                    "encoding": {"format": "parquet", "compression": "gzip"},
+                    "storage": {"root": f"file://{root}"},
+                }
+            )
+            catalog = {"streams": [{"tap_stream_id": FixedRowsStream.name}]}
+            tap = TapGoogleAds(config=CONFIG, catalog=catalog)
+            stream = FixedRowsStream(tap=tap)
+
+            with mock.patch.dict(sys.modules, {"pyarrow": None}):
+                batches = list(stream.get_batches(batch_config, {"customer_id": "123"}))
+
+        encoding, _ = batches[0]
+        self.assertEqual(encoding.format, BatchFileFormat.JSONL)
+        self.assertEqual(encoding.compression, "gzip")
+        self.assertEqual(batch_config.encoding.format, BatchFileFormat.PARQUET)
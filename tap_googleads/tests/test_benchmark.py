@@ -0,0 +1,22 @@
+import unittest
+
+from tap_googleads.tests import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_benchmark_runs_offline(self):
+        results = benchmark.run(rows=5, repeat=1)
+
+        self.assertIn("campaign_history", results)
+        self.assertTrue(all(r["post_process_ns_per_row"] > 0 for r in results.values()))
+
+        baseline = {"campaign_history": {**results["campaign_history"], "schema_us": 1}}
+        self.assertEqual(len(benchmark.compare(results, baseline, 0.2)), 1)
+
+    def test_rows_are_deterministic(self):
+        fields = ["campaign.id", "metrics.ctr", "segments.date"]
+
+        self.assertEqual(
+            benchmark.generate_row(fields, benchmark.random.Random(1)),
+            benchmark.generate_row(fields, benchmark.random.Random(1)),
+        )
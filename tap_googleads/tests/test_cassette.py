@@ -0,0 +1,124 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import responses
+
+from tap_googleads.cassette import CassetteMissError
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+}
+
+CONTEXT = {"customer_id": "1"}
+
+SEARCH_URL = "https://googleads.googleapis.com/v22/customers/1/googleAds:search"
+FIELDS_URL = "https://googleads.googleapis.com/v22/googleAdsFields:search"
+
+
+class CampaignStream(DynamicQueryStream):
+    name = "campaigns"
+    replication_key = "segments__date"
+    add_date_filter_to_query = True
+    schema = {
+        "properties": {
+            "campaign__id": {"type": ["string", "null"]},
+            "segments__date": {"type": ["string", "null"], "format": "date"},
+            "customer_id": {"type": ["string", "null"]},
+        }
+    }
+
+    gaql = """
+        SELECT
+            campaign.id,
+            segments.date
+        FROM campaign
+    """
+
+
+def page(campaign_id, next_page_token=None):
+    response = {
+        "results": [
+            {"campaign": {"id": campaign_id}, "segments": {"date": "2025-01-02"}}
+        ]
+    }
+
+    if next_page_token:
+        response["nextPageToken"] = next_page_token
+
+    return response
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cassette_dir = directory.name
+
+    def _tap(self, mode):
+        catalog = {"streams": [{"tap_stream_id": CampaignStream.name}]}
+        config = {**CONFIG, "cassette_dir": self.cassette_dir, "cassette_mode": mode}
+        return TapGoogleAds(config=config, catalog=catalog)
+
+    def _get_records(self, tap):
+        stream = CampaignStream(tap=tap)
+        stream.context = CONTEXT
+        return list(stream.get_records(CONTEXT))
+
+    def _record(self):
+        with responses.RequestsMock() as rsps, mock.patch(
+            "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+            side_effect=lambda request: request,
+        ):
+            rsps.add(responses.POST, SEARCH_URL, json=page("1", "token"))
+            rsps.add(responses.POST, SEARCH_URL, json=page("2"))
+
+            return self._get_records(self._tap("record"))
+
+    def test_replay_serves_recorded_pages_without_network(self):
+        recorded = self._record()
+
+        # no responses are registered, so any request fails
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            replayed = self._get_records(self._tap("replay"))
+
+        self.assertEqual(len(rsps.calls), 0)
+        self.assertEqual([r["campaign__id"] for r in recorded], ["1", "2"])
+        self.assertEqual(replayed, recorded)
+
+    def test_replay_of_unrecorded_query_fails(self):
+        self._record()
+        tap = self._tap("replay")
+        tap._config["end_date"] = "2025-02-28"
+
+        with responses.RequestsMock(assert_all_requests_are_fired=False):
+            with self.assertRaises(CassetteMissError):
+                self._get_records(tap)
+
+    def test_replay_serves_field_metadata(self):
+        metadata = {"name": "campaign.id", "dataType": "INT64"}
+
+        with responses.RequestsMock() as rsps, mock.patch(
+            "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+            side_effect=lambda request: request,
+        ):
+            rsps.add(responses.POST, FIELDS_URL, json={"results": [metadata]})
+            stream = CampaignStream(tap=self._tap("record"))
+            stream.get_fields_metadata(["campaign.id"])
+
+        with responses.RequestsMock(assert_all_requests_are_fired=False):
+            stream = CampaignStream(tap=self._tap("replay"))
+
+            self.assertEqual(
+                stream.get_fields_metadata(["campaign.id"]),
+                {"campaign.id": metadata},
+            )
@@ -0,0 +1,123 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
+
+from tap_googleads.change_status_stream import (
+    CHANGE_STATUS_STATE_KEY,
+    ChangeStatusStream,
+)
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "enable_change_status_sync": True,
+}
+
+CONTEXT = {"customer_id": "1"}
+
+
+class FakeChangeStatusStream(ChangeStatusStream):
+    name = "test_change_status"
+    schema = {"properties": {}}
+    change_status_resource_type = "AD_GROUP_CRITERION"
+
+    gaql = """
+        SELECT
+            ad_group_criterion.resource_name,
+            ad_group_criterion.status
+        FROM ad_group_criterion
+    """
+
+
+class TestChangeStatusSync(unittest.TestCase):
+    def _sync(self, change_status_state, changed_resource_names=()):
+        state = {"bookmarks": {}}
+        if change_status_state:
+            state["bookmarks"][FakeChangeStatusStream.name] = {
+                "partitions": [
+                    {"context": CONTEXT, CHANGE_STATUS_STATE_KEY: change_status_state}
+                ]
+            }
+
+        catalog = {"streams": [{"tap_stream_id": FakeChangeStatusStream.name}]}
+        tap = TapGoogleAds(config=CONFIG, catalog=catalog, state=state)
+        stream = FakeChangeStatusStream(tap=tap)
+        queries = []
+
+        def request_records(context):
+            queries.append(stream.prepare_request_payload(context, None)["query"])
+            return iter([])
+
+        change_status_rows = [
+            {
+                "changeStatus": {
+                    "adGroupCriterion": resource_name,
+                    "lastChangeDateTime": f"2030-01-0{i + 1} 00:00:00.000000",
+                }
+            }
+            for i, resource_name in enumerate(changed_resource_names)
+        ]
+
+        with mock.patch.object(
+            DynamicQueryStream, "request_records", side_effect=request_records
+        ), mock.patch.object(
+            FakeChangeStatusStream, "search", return_value=change_status_rows
+        ) as search:
+            list(stream.request_records(CONTEXT))
+
+        return queries, search, stream.get_context_state(CONTEXT)
+
+    def test_first_sync_is_full(self):
+        queries, search, state = self._sync(None)
+
+        search.assert_not_called()
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn(" IN ", queries[0])
+        self.assertEqual(
+            state[CHANGE_STATUS_STATE_KEY]["full_refresh_date"],
+            datetime.now(timezone.utc).date().isoformat(),
+        )
+
+    def test_changed_entities_only(self):
+        last_change_date_time = (
+            datetime.now(timezone.utc) - timedelta(days=1)
+        ).strftime("%Y-%m-%d %H:%M:%S")
+
+        queries, search, state = self._sync(
+            {
+                "last_change_date_time": last_change_date_time,
+                "full_refresh_date": date.today().isoformat(),
+            },
+            ["customers/1/adGroupCriteria/2~3", "customers/1/adGroupCriteria/2~4"],
+        )
+
+        self.assertIn(f">= '{last_change_date_time}'", search.call_args.args[1])
+        self.assertEqual(len(queries), 1)
+        self.assertIn(
+            "WHERE (ad_group_criterion.resource_name IN "
+            "('customers/1/adGroupCriteria/2~3', 'customers/1/adGroupCriteria/2~4'))",
+            queries[0],
+        )
+        self.assertEqual(
+            state[CHANGE_STATUS_STATE_KEY]["last_change_date_time"],
+            "2030-01-02 00:00:00.000000",
+        )
+
+    def test_periodic_full_refresh(self):
+        queries, search, _ = self._sync(
+            {
+                "last_change_date_time": datetime.now(timezone.utc).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+                "full_refresh_date": (date.today() - timedelta(days=7)).isoformat(),
+            }
+        )
+
+        search.assert_not_called()
+        self.assertNotIn(" IN ", queries[0])
@@ -0,0 +1,172 @@
+import unittest
+from unittest import mock
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.dynamic_streams import CampaignHistoryStream, CampaignPerformance
+from tap_googleads.streams import (
+    SYNC_SECONDS_KEY,
+    CustomerHierarchyStream,
+    SkippedReason,
+)
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+}
+
+CUSTOMER_IDS = [str(1000000000 + i) for i in range(100)]
+
+
+def customer_record(customer_id):
+    return {
+        "customerClient": {
+            "id": customer_id,
+            "manager": False,
+            "status": "ENABLED",
+        }
+    }
+
+
+class TestCustomerHierarchyShards(unittest.TestCase):
+    def setUp(self):
+        CustomerHierarchyStream.skipped_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.skipped_customer_ids.clear)
+
+    def _sharded_customer_ids(self, **shard_config):
+        catalog = {"streams": [{"tap_stream_id": CustomerHierarchyStream.name}]}
+        tap = TapGoogleAds(config={**CONFIG, **shard_config}, catalog=catalog)
+        stream = CustomerHierarchyStream(tap=tap)
+
+        return [
+            child_context["customer_id"]
+            for customer_id in CUSTOMER_IDS
+            for child_context in stream.generate_child_contexts(
+                customer_record(customer_id), {"customer_id": "1"}
+            )
+        ]
+
+    def test_shards_are_disjoint_and_complete(self):
+        shards = [
+            self._sharded_customer_ids(shard_count=3, shard_index=i) for i in range(3)
+        ]
+
+        self.assertEqual(sorted(sum(shards, [])), CUSTOMER_IDS)
+        self.assertTrue(all(shards))
+        self.assertEqual(
+            len(
+                CustomerHierarchyStream.skipped_customer_ids[SkippedReason.OTHER_SHARD]
+            ),
+            2 * len(CUSTOMER_IDS),
+        )
+
+    def test_weighted_customers_spread_across_shards(self):
+        shard_weights = {CUSTOMER_IDS[0]: 100, CUSTOMER_IDS[1]: 90, "100-000-0002": 80}
+        shards = [
+            self._sharded_customer_ids(
+                shard_count=3, shard_index=i, shard_weights=shard_weights
+            )
+            for i in range(3)
+        ]
+
+        self.assertIn(CUSTOMER_IDS[0], shards[0])
+        self.assertIn(CUSTOMER_IDS[1], shards[1])
+        self.assertIn(CUSTOMER_IDS[2], shards[2])
+
+    def test_invalid_shard_index(self):
+        with self.assertRaises(ValueError):
+            self._sharded_customer_ids(shard_count=3, shard_index=3)
+
+
+class TestCustomerHierarchyScheduling(unittest.TestCase):
+    def setUp(self):
+        CustomerHierarchyStream.seen_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.seen_customer_ids.clear)
+
+    def test_children_synced_longest_first(self):
+        # customer 6 is no longer synced
+        state = {
+            "bookmarks": {
+                CustomerHierarchyStream.name: {
+                    SYNC_SECONDS_KEY: {"2": 40, "3": 30, "4": 5, "6": 50}
+                },
+            }
+        }
+        catalog = {"streams": [{"tap_stream_id": CustomerHierarchyStream.name}]}
+        tap = TapGoogleAds(config=CONFIG, catalog=catalog, state=state)
+        stream = CustomerHierarchyStream(tap=tap)
+
+        records = [customer_record(c) for c in ("2", "3", "4", "5")]
+        synced_customer_ids = []
+
+        with mock.patch.object(
+            CustomerHierarchyStream, "request_records", return_value=records
+        ), mock.patch(
+            "singer_sdk.streams.core.Stream._sync_children",
+            lambda _, child_context: synced_customer_ids.append(
+                child_context["customer_id"]
+            ),
+        ):
+            stream.sync({"customer_id": "1"})
+
+        # customer 5 has no recorded cost, so is assumed to be the most expensive
+        self.assertEqual(synced_customer_ids, ["5", "2", "3", "4"])
+
+        # durations are recorded once per customer, and only for synced customers
+        self.assertEqual(
+            sorted(stream.stream_state[SYNC_SECONDS_KEY]), ["2", "3", "4", "5"]
+        )
+        self.assertEqual(list(tap.state["bookmarks"]), [CustomerHierarchyStream.name])
+
+
+class TestCustomerHierarchyDormantCustomers(unittest.TestCase):
+    def setUp(self):
+        CustomerHierarchyStream.skipped_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.skipped_customer_ids.clear)
+
+    def test_dormant_customers_skip_metric_streams(self):
+        catalog = {"streams": [{"tap_stream_id": CustomerHierarchyStream.name}]}
+        tap = TapGoogleAds(
+            config={**CONFIG, "skip_dormant_customers": True}, catalog=catalog
+        )
+        stream = CustomerHierarchyStream(tap=tap)
+
+        def search(context, query):
+            if context["customer_id"] == "3":
+                return [{"metrics": {"impressions": "10", "costMicros": "0"}}]
+            return []
+
+        with mock.patch.object(CustomerHierarchyStream, "search", side_effect=search):
+            child_contexts = [
+                child_context
+                for customer_id in ("2", "3")
+                for child_context in stream.generate_child_contexts(
+                    customer_record(customer_id), {"customer_id": "1"}
+                )
+            ]
+
+        self.assertEqual([c["customer_id"] for c in child_contexts], ["2", "3"])
+        self.assertEqual(stream.skipped_customer_ids[SkippedReason.DORMANT], ["2"])
+        self.assertEqual(tap.dormant_customer_ids, {"2"})
+
+        dormant_context = child_contexts[0]
+
+        with mock.patch.object(
+            DynamicQueryStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {f: {"name": f} for f in fields},
+        ):
+            campaign = CampaignPerformance(tap=tap)
+            campaign_history = CampaignHistoryStream(tap=tap)
+
+        self.assertTrue(campaign.has_metrics)
+        self.assertEqual(list(campaign.get_records(dormant_context)), [])
+
+        with mock.patch(
+            "tap_googleads.client.GoogleAdsStream.get_records", return_value=iter([{}])
+        ):
+            self.assertEqual(list(campaign_history.get_records(dormant_context)), [{}])
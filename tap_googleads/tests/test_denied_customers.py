@@ -0,0 +1,129 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+import responses
+
+from tap_googleads.denied_customers import DeniedCustomers
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.streams import CustomerHierarchyStream, SkippedReason
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+}
+
+CONTEXT = {"customer_id": "1"}
+
+SEARCH_URL = "https://googleads.googleapis.com/v22/customers/1/googleAds:search"
+
+
+class CampaignsStream(DynamicQueryStream):
+    name = "campaigns"
+    schema = {"properties": {}}
+    gaql = "SELECT campaign.id FROM campaign"
+
+
+class LabelsStream(CampaignsStream):
+    name = "labels"
+    gaql = "SELECT label.id FROM label"
+
+
+class TestDeniedCustomers(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch(
+            "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+            side_effect=lambda request: request,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        CustomerHierarchyStream.skipped_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.skipped_customer_ids.clear)
+
+    def _tap(self, config):
+        catalog = {
+            "streams": [
+                {"tap_stream_id": name}
+                for name in (CampaignsStream.name, LabelsStream.name)
+            ]
+        }
+        return TapGoogleAds(config={**CONFIG, **config}, catalog=catalog)
+
+    @responses.activate
+    def test_denied_customer_skipped_by_other_streams_and_runs(self):
+        responses.add(
+            responses.POST,
+            SEARCH_URL,
+            status=403,
+            json={
+                "error": {
+                    "code": 403,
+                    "message": "The caller does not have permission",
+                    "status": "PERMISSION_DENIED",
+                    "details": [
+                        {
+                            "errors": [
+                                {
+                                    "errorCode": {
+                                        "authorizationError": "CUSTOMER_NOT_ENABLED"
+                                    }
+                                }
+                            ]
+                        }
+                    ],
+                }
+            },
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "denied.json"
+            config = {"denied_customers_cache_path": str(path)}
+            tap = self._tap(config)
+
+            self.assertEqual(list(CampaignsStream(tap=tap).get_records(CONTEXT)), [])
+            self.assertEqual(list(LabelsStream(tap=tap).get_records(CONTEXT)), [])
+            self.assertEqual(len(responses.calls), 1)
+            self.assertEqual(tap.denied_customers.reason("1"), "CUSTOMER_NOT_ENABLED")
+
+            hierarchy = CustomerHierarchyStream(tap=self._tap(config))
+            record = {
+                "customerClient": {"id": "1", "manager": False, "status": "ENABLED"}
+            }
+
+            self.assertEqual(
+                list(hierarchy.generate_child_contexts(record, {"customer_id": "0"})),
+                [],
+            )
+            self.assertEqual(
+                hierarchy.skipped_customer_ids[SkippedReason.PERMISSION_DENIED], ["1"]
+            )
+
+            expired_config = {**config, "denied_customers_ttl_hours": 0}
+            self.assertNotIn("1", self._tap(expired_config).denied_customers)
+
+    def test_concurrent_denials_are_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "denied.json")
+            ttl = timedelta(hours=1)
+            customer_ids = [str(i) for i in range(20)]
+
+            # e.g. workers sharing the file
+            def deny(customer_id):
+                DeniedCustomers(path, ttl).add(customer_id, "USER_PERMISSION_DENIED")
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(deny, customer_ids))
+
+            denied_customers = DeniedCustomers(path, ttl)
+
+        for customer_id in customer_ids:
+            self.assertIn(customer_id, denied_customers)
@@ -1,6 +1,10 @@
 import unittest
+from unittest import mock
+
+from singer_sdk._singerlib import Catalog
 
 from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.dynamic_streams import CustomerStream
 from tap_googleads.tap import TapGoogleAds
 
 CONFIG = {
@@ -96,3 +100,248 @@ class TestDyanmicQueryStream(unittest.TestCase):
 
             with self.assertRaises(StopAfterVerification):
                 stream.sync(partition["context"])
+
+    def test_gaql_select_list_pruned_to_catalog_selection(self):
+        catalog = {
+            "streams": [
+                {
+                    "tap_stream_id": "assert_gaql_select_list",
+                    "metadata": [
+                        {"breadcrumb": [], "metadata": {"selected": True}},
+                        {
+                            "breadcrumb": ["properties", "testResource__attribute"],
+                            "metadata": {"selected": False},
+                        },
+                        {
+                            "breadcrumb": ["properties", "testResource__status"],
+                            "metadata": {"selected": False},
+                        },
+                        {
+                            "breadcrumb": ["properties", "metrics__clicks"],
+                            "metadata": {"selected": False},
+                        },
+                    ],
+                }
+            ]
+        }
+
+        class SelectListStream(DynamicQueryStream):
+            name = "assert_gaql_select_list"
+            schema = {
+                "properties": {
+                    "testResource__id": {"type": ["string", "null"]},
+                    "testResource__attribute": {"type": ["string", "null"]},
+                    "testResource__status": {"type": ["string", "null"]},
+                    "metrics__clicks": {"type": ["integer", "null"]},
+                    "metrics__impressions": {"type": ["integer", "null"]},
+                }
+            }
+            primary_keys = ["testResource__id"]
+
+            gaql = """
+                SELECT
+                    test_resource.id,
+                    test_resource.attribute,
+                    test_resource.status,
+                    metrics.clicks,
+                    metrics.impressions
+                FROM test_resource
+                WHERE test_resource.status = 'ENABLED'
+            """
+
+        tap = TapGoogleAds(config=CONFIG, catalog=catalog)
+        stream = SelectListStream(tap=tap)
+        stream.apply_catalog(Catalog.from_dict(catalog))
+
+        query = stream.prepare_request_payload(None, None)["query"]
+
+        self.assertEqual(
+            query,
+            "SELECT test_resource.id,test_resource.status,metrics.impressions "
+            "FROM test_resource WHERE test_resource.status = 'ENABLED'",
+        )
+
+    def test_gaql_omit_unselected_resource_names_parameter(self):
+        catalog = {"streams": [{"tap_stream_id": "assert_gaql_parameters"}]}
+
+        class ParametersStream(DynamicQueryStream):
+            name = "assert_gaql_parameters"
+            schema = {"properties": {}}
+            add_date_filter_to_query = True
+
+            gaql = """
+                SELECT
+                    test_resource.id,
+                    segments.date
+                FROM test_resource
+                PARAMETERS include_drafts = true
+            """
+
+        tap = TapGoogleAds(
+            config={**CONFIG, "omit_unselected_resource_names": True},
+            catalog=catalog,
+        )
+        stream = ParametersStream(tap=tap)
+
+        query = stream.prepare_request_payload(None, None)["query"]
+
+        self.assertTrue(
+            query.endswith(
+                "ORDER BY segments.date ASC "
+                "PARAMETERS include_drafts = true, "
+                "omit_unselected_resource_names = true"
+            ),
+            query,
+        )
+
+    def test_gaql_stream_filters(self):
+        catalog = {"streams": [{"tap_stream_id": "assert_gaql_stream_filters"}]}
+
+        class FilteredStream(DynamicQueryStream):
+            name = "assert_gaql_stream_filters"
+            schema = {"properties": {}}
+            add_date_filter_to_query = True
+
+            gaql = """
+                SELECT
+                    campaign.id,
+                    metrics.impressions,
+                    segments.date
+                FROM campaign
+            """
+
+        config = {
+            **CONFIG,
+            "end_date": "2025-01-31",
+            "stream_filters": {
+                FilteredStream.name: [
+                    "campaign.status != 'REMOVED'",
+                    "metrics.impressions > 0",
+                    "campaign.final_url_suffix LIKE '%example.com%'",
+                ]
+            },
+        }
+        tap = TapGoogleAds(config=config, catalog=catalog)
+        stream = FilteredStream(tap=tap)
+
+        with mock.patch.object(
+            FilteredStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {f: {"name": f} for f in fields},
+        ) as get_fields_metadata:
+            query = stream.prepare_request_payload(None, None)["query"]
+
+        # dotted text in string literals is not a field
+        get_fields_metadata.assert_called_once_with(
+            ["campaign.final_url_suffix", "campaign.status", "metrics.impressions"]
+        )
+        self.assertTrue(
+            query.endswith(
+                "FROM campaign WHERE (campaign.status != 'REMOVED') "
+                "AND (metrics.impressions > 0) "
+                "AND (campaign.final_url_suffix LIKE '%example.com%') "
+                "AND segments.date >= '2025-01-01' AND segments.date <= '2025-01-31' "
+                "ORDER BY segments.date ASC"
+            ),
+            query,
+        )
+
+        stream = FilteredStream(tap=tap)
+
+        with mock.patch.object(
+            FilteredStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {
+                f: {"name": f, "filterable": f != "metrics.impressions"}
+                for f in fields
+            },
+        ):
+            with self.assertRaises(ValueError):
+                stream.prepare_request_payload(None, None)
+
+    def test_gaql_snapshot_dimension_streams(self):
+        catalog = {"streams": [{"tap_stream_id": CustomerStream.name}]}
+        tap = TapGoogleAds(
+            config={**CONFIG, "snapshot_dimension_streams": True}, catalog=catalog
+        )
+
+        with mock.patch.object(
+            CustomerStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {f: {"name": f} for f in fields},
+        ):
+            stream = CustomerStream(tap=tap)
+            query = stream.prepare_request_payload(None, None)["query"]
+
+        self.assertNotIn("segments.date", query)
+        self.assertNotIn("segments__date", stream.schema["properties"])
+        self.assertTrue(query.endswith("FROM customer"), query)
+        self.assertIsNone(stream.replication_key)
+        self.assertEqual(stream.primary_keys, ["customer__id"])
+
+    def test_snapshot_mode_overrides_catalog_keys(self):
+        catalog = {"streams": [{"tap_stream_id": CustomerStream.name}]}
+
+        with mock.patch.object(
+            CustomerStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {f: {"name": f} for f in fields},
+        ):
+            # a catalog discovered before snapshot mode was enabled
+            stream = CustomerStream(tap=TapGoogleAds(config=CONFIG, catalog=catalog))
+            catalog = {"streams": [stream._singer_catalog_entry.to_dict()]}
+            self.assertEqual(catalog["streams"][0]["replication_key"], "segments__date")
+
+            tap = TapGoogleAds(
+                config={**CONFIG, "snapshot_dimension_streams": True}, catalog=catalog
+            )
+            stream = CustomerStream(tap=tap)
+            stream.apply_catalog(Catalog.from_dict(catalog))
+            query = stream.prepare_request_payload(None, None)["query"]
+
+        self.assertNotIn("segments.date", query)
+        self.assertIsNone(stream.replication_key)
+        self.assertEqual(stream.replication_method, "FULL_TABLE")
+        self.assertEqual(stream.primary_keys, ["customer__id"])
+
+    def test_stream_filters_are_validated_before_sync(self):
+        config = {
+            **CONFIG,
+            "end_date": "2025-01-31",
+            "custom_queries": [
+                {
+                    "name": "campaign_clicks",
+                    "query": (
+                        "SELECT campaign.id, metrics.clicks, segments.date "
+                        "FROM campaign"
+                    ),
+                    "add_date_filter_to_query": True,
+                    "replication_key": "segments__date",
+                    "primary_keys": ["campaign__id", "segments__date"],
+                }
+            ],
+            "stream_filters": {"campaign_clicks": ["metrics.clicks > 0"]},
+        }
+        catalog = {
+            "streams": [
+                {"tap_stream_id": "accessible_customers"},
+                {"tap_stream_id": "customer_hierarchy"},
+                {
+                    "tap_stream_id": "campaign_clicks",
+                    "replication_key": "segments__date",
+                },
+            ]
+        }
+        tap = TapGoogleAds(config=config, catalog=catalog)
+
+        with mock.patch("requests.Session.send") as send, mock.patch.object(
+            DynamicQueryStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {
+                f: {"name": f, "filterable": f != "metrics.clicks"} for f in fields
+            },
+        ), mock.patch.object(TapGoogleAds, "write_message"):
+            with self.assertRaises(ValueError):
+                tap.sync_all()
+
+        send.assert_not_called()
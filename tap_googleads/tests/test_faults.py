@@ -0,0 +1,200 @@
+import unittest
+from collections import Counter
+from unittest import mock
+
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.streams import CustomerHierarchyStream
+from tap_googleads.tap import TapGoogleAds
+from tap_googleads.tests.benchmark import fields_metadata
+from tap_googleads.tests.stand_in import (
+    INTERNAL,
+    PERMISSION_DENIED,
+    RATE_LIMITED,
+    TIMEOUT,
+    UNAVAILABLE,
+    ApiStandIn,
+    FaultSchedule,
+    constant_latency,
+)
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+    "progress_log_interval_seconds": 0,
+    "custom_queries": [
+        {
+            "name": "campaign_clicks",
+            "query": "SELECT campaign.id, metrics.clicks, segments.date FROM campaign",
+            "add_date_filter_to_query": True,
+            "replication_key": "segments__date",
+            "primary_keys": ["campaign__id", "segments__date"],
+        }
+    ],
+}
+
+CATALOG = {
+    "streams": [
+        {"tap_stream_id": "accessible_customers"},
+        {"tap_stream_id": "customer_hierarchy"},
+        {"tap_stream_id": "campaign_clicks", "replication_key": "segments__date"},
+    ]
+}
+
+HIERARCHY = {
+    str(9000000000 + m): [str(1000000000 + 10 * m + c) for c in range(10)]
+    for m in range(2)
+}
+LAST_CUSTOMER_ID = HIERARCHY[max(HIERARCHY)][-1]
+
+ROWS_PER_CUSTOMER = 5
+PAGE_SIZE = 2
+LATENCY = 0.2
+SDK_MAX_TRIES = 5
+
+
+class TestFaultInjection(unittest.TestCase):
+    def setUp(self):
+        for customer_ids in (
+            CustomerHierarchyStream.seen_customer_ids,
+            CustomerHierarchyStream.skipped_customer_ids,
+        ):
+            customer_ids.clear()
+            self.addCleanup(customer_ids.clear)
+
+        patches = [
+            mock.patch(
+                "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+                side_effect=lambda request: request,
+            ),
+            mock.patch.object(
+                DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _stand_in(self, faults=None):
+        return ApiStandIn(
+            HIERARCHY,
+            rows_per_customer=ROWS_PER_CUSTOMER,
+            page_size=PAGE_SIZE,
+            faults=faults,
+            latency=constant_latency(LATENCY),
+        )
+
+    def _sync(self, tap, stand_in):
+        records = []
+
+        def write_message(_, message):
+            if (
+                isinstance(message, RecordMessage)
+                and message.stream == "campaign_clicks"
+            ):
+                records.append(
+                    (message.record["customer_id"], message.record["segments__date"])
+                )
+
+        with stand_in.serve(), mock.patch.object(
+            TapGoogleAds, "write_message", write_message
+        ):
+            try:
+                tap.sync_all()
+            finally:
+                CustomerHierarchyStream.seen_customer_ids.clear()
+
+        return records
+
+    def _bookmarks(self, tap):
+        return {
+            partition["context"]["customer_id"]: partition["replication_key_value"]
+            for partition in tap.state["bookmarks"]["campaign_clicks"]["partitions"]
+            if "replication_key_value" in partition
+        }
+
+    def test_transient_faults_are_retried(self):
+        baseline_tap = TapGoogleAds(config=CONFIG, catalog=CATALOG)
+        baseline = self._stand_in()
+        baseline_records = self._sync(baseline_tap, baseline)
+
+        tap = TapGoogleAds(config=CONFIG, catalog=CATALOG)
+        stand_in = self._stand_in(
+            FaultSchedule(
+                rates={
+                    RATE_LIMITED: 0.1,
+                    INTERNAL: 0.05,
+                    UNAVAILABLE: 0.05,
+                    TIMEOUT: 0.02,
+                },
+                requests={10: TIMEOUT},
+            )
+        )
+        records = self._sync(tap, stand_in)
+
+        # every record is emitted exactly once, and state is unaffected
+        self.assertTrue(stand_in.injected_faults)
+        self.assertEqual(len(records), len(HIERARCHY) * 10 * ROWS_PER_CUSTOMER)
+        self.assertEqual(Counter(records), Counter(baseline_records))
+        self.assertEqual(self._bookmarks(tap), self._bookmarks(baseline_tap))
+
+        # time lost to faults: failed requests, timeouts and backoff waits
+        failed_requests = sum(stand_in.injected_faults.values())
+        timeouts = stand_in.injected_faults[TIMEOUT]
+        self.assertEqual(
+            len(stand_in.requests), len(baseline.requests) + failed_requests
+        )
+        self.assertAlmostEqual(
+            stand_in.clock.now - baseline.clock.now,
+            (failed_requests - timeouts) * LATENCY
+            + timeouts * stand_in.timeout
+            + stand_in.clock.slept,
+        )
+        self.assertGreater(stand_in.clock.slept, 0)
+        self.assertEqual(baseline.clock.slept, 0)
+
+    def test_denied_customer_is_skipped_without_retries(self):
+        denied_customer_id = HIERARCHY[min(HIERARCHY)][0]
+        tap = TapGoogleAds(config=CONFIG, catalog=CATALOG)
+        stand_in = self._stand_in(
+            FaultSchedule(customers={denied_customer_id: PERMISSION_DENIED})
+        )
+        records = self._sync(tap, stand_in)
+
+        self.assertEqual(stand_in.requests.count(f"report {denied_customer_id}"), 1)
+        self.assertEqual(stand_in.clock.slept, 0)
+        self.assertIn(denied_customer_id, tap.denied_customers)
+
+        synced_customer_ids = set(stand_in.client_ids) - {denied_customer_id}
+        self.assertEqual(
+            {customer_id for customer_id, _ in records}, synced_customer_ids
+        )
+        self.assertEqual(self._bookmarks(tap).keys(), synced_customer_ids)
+
+    def test_exhausted_retries_fail_sync_and_keep_completed_state(self):
+        tap = TapGoogleAds(config=CONFIG, catalog=CATALOG)
+        stand_in = self._stand_in(
+            FaultSchedule(customers={LAST_CUSTOMER_ID: UNAVAILABLE})
+        )
+
+        with self.assertRaises(RetriableAPIError):
+            self._sync(tap, stand_in)
+
+        self.assertEqual(
+            stand_in.requests.count(f"report {LAST_CUSTOMER_ID}"), SDK_MAX_TRIES
+        )
+        # exponential backoff of 2, 4, 8 and 16 seconds, with up to 1s jitter each
+        self.assertGreaterEqual(stand_in.clock.slept, 30)
+        self.assertLessEqual(stand_in.clock.slept, 34)
+        self.assertEqual(
+            self._bookmarks(tap).keys(),
+            set(stand_in.client_ids) - {LAST_CUSTOMER_ID},
+        )
@@ -0,0 +1,193 @@
+import itertools
+import threading
+import time
+import unittest
+from collections import Counter
+from unittest import mock
+
+import requests
+from singer_sdk._singerlib import RecordMessage
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.hedging import HEDGE_MIN_SAMPLES, RequestHedger
+from tap_googleads.streams import CustomerHierarchyStream
+from tap_googleads.tap import TapGoogleAds
+from tap_googleads.tests.benchmark import fields_metadata
+from tap_googleads.tests.stand_in import ApiStandIn
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-02-28",
+    "progress_log_interval_seconds": 0,
+    "custom_queries": [
+        {
+            "name": "campaign_clicks",
+            "query": "SELECT campaign.id, metrics.clicks, segments.date FROM campaign",
+            "add_date_filter_to_query": True,
+            "replication_key": "segments__date",
+            "primary_keys": ["campaign__id", "segments__date"],
+        }
+    ],
+}
+
+CATALOG = {
+    "streams": [
+        {"tap_stream_id": "accessible_customers"},
+        {"tap_stream_id": "customer_hierarchy"},
+        {"tap_stream_id": "campaign_clicks", "replication_key": "segments__date"},
+    ]
+}
+
+FAST = 0.002
+# slow requests wait until released by the test - this timeout is only reached if
+# a slow request is not hedged
+SLOW_TIMEOUT = 10
+
+
+def latencies(slow_requests, released):
+    """Return latencies that are fast, except for the given request indices."""
+    requests = itertools.count()
+
+    def latency(rng):
+        if next(requests) in slow_requests:
+            released.wait(SLOW_TIMEOUT)
+
+        return FAST
+
+    return latency
+
+
+class TestRequestHedger(unittest.TestCase):
+    def setUp(self):
+        self.released = threading.Event()
+        self.addCleanup(self.released.set)
+
+    def fast(self):
+        time.sleep(FAST)
+
+    def slow(self):
+        self.released.wait(SLOW_TIMEOUT)
+
+    def _send(self, hedger, attempts, error=None, sessions=None):
+        attempts = iter(attempts)
+
+        def send(session):
+            if sessions is not None:
+                sessions.append(session)
+
+            next(attempts)()
+
+            if error:
+                raise error
+
+            return requests.Response()
+
+        return hedger.send("stream", send)
+
+    def _learn_latency(self, hedger):
+        for _ in range(HEDGE_MIN_SAMPLES):
+            self._send(hedger, [self.fast])
+
+    def test_slow_request_is_hedged(self):
+        hedger = RequestHedger(percentile=90)
+        self._learn_latency(hedger)
+
+        self.assertFalse(hedger.hedged_requests)
+        self.assertGreaterEqual(hedger.hedge_delay("stream"), FAST)
+        self.assertIsNone(hedger.hedge_delay("other_stream"))
+
+        sessions = []
+        self._send(hedger, [self.slow, self.fast], sessions=sessions)
+        self.released.set()
+
+        self.assertEqual(hedger.hedged_requests, Counter(stream=1))
+        self.assertEqual(hedger.hedge_wins, Counter(stream=1))
+        # the slow attempt is still in flight, so the hedge has a session of its own
+        self.assertIsNot(sessions[0], sessions[1])
+
+    def test_error_of_both_attempts_is_raised(self):
+        hedger = RequestHedger(percentile=50)
+        self._learn_latency(hedger)
+
+        # the hedge fails, then releases the slow attempt to fail too
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self._send(
+                hedger,
+                [self.slow, self.released.set],
+                requests.exceptions.ReadTimeout(),
+            )
+
+        self.assertEqual(hedger.hedged_requests, Counter(stream=1))
+        self.assertFalse(hedger.hedge_wins)
+
+
+class TestHedgedSync(unittest.TestCase):
+    def setUp(self):
+        CustomerHierarchyStream.seen_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.seen_customer_ids.clear)
+
+        patches = [
+            mock.patch(
+                "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+                side_effect=lambda request: request,
+            ),
+            mock.patch.object(
+                DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_slow_page_is_hedged(self):
+        # one page per row, with a slow last page
+        pages = 50
+        released = threading.Event()
+        self.addCleanup(released.set)
+        stand_in = ApiStandIn(
+            {"9000000000": ["1000000000"]},
+            rows_per_customer=pages,
+            page_size=1,
+            latency=latencies({pages + 1}, released),
+            real_latency=True,
+        )
+        tap = TapGoogleAds(config={**CONFIG, "hedge_requests": True}, catalog=CATALOG)
+        records = []
+
+        def write_message(_, message):
+            if (
+                isinstance(message, RecordMessage)
+                and message.stream == "campaign_clicks"
+            ):
+                records.append(message.record["segments__date"])
+
+        with stand_in.serve(), mock.patch.object(
+            TapGoogleAds, "write_message", write_message
+        ), self.assertLogs("singer_sdk.metrics", "INFO") as logs:
+            tap.sync_all()
+            released.set()
+
+        self.assertEqual(len(records), pages)
+        self.assertEqual(len(set(records)), pages)
+        self.assertEqual(stand_in.requests.count("report 1000000000"), pages + 1)
+        self.assertEqual(tap.hedger.hedged_requests, Counter(campaign_clicks=1))
+        self.assertTrue(
+            any(
+                '"metric": "hedged_request_count", "value": 1' in o for o in logs.output
+            )
+        )
+        # the request duration of the abandoned attempt is not logged
+        self.assertEqual(
+            sum(
+                '"metric": "http_request_duration"' in o
+                and '"stream": "campaign_clicks"' in o
+                for o in logs.output
+            ),
+            pages,
+        )
@@ -0,0 +1,153 @@
+import json
+import unittest
+from unittest import mock
+
+import responses
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_googleads.dynamic_query_stream import (
+    PAGE_CHECKPOINT_STATE_KEY,
+    DynamicQueryStream,
+)
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+}
+
+CONTEXT = {"customer_id": "1"}
+
+SEARCH_URL = "https://googleads.googleapis.com/v22/customers/1/googleAds:search"
+
+
+class PagedStream(DynamicQueryStream):
+    name = "paged"
+    replication_key = "segments__date"
+    add_date_filter_to_query = True
+    schema = {
+        "properties": {
+            "campaign__id": {"type": ["string", "null"]},
+            "segments__date": {"type": ["string", "null"], "format": "date"},
+            "customer_id": {"type": ["string", "null"]},
+        }
+    }
+
+    gaql = """
+        SELECT
+            campaign.id,
+            segments.date
+        FROM campaign
+    """
+
+
+def page(campaign_id, next_page_token=None):
+    response = {
+        "results": [
+            {"campaign": {"id": campaign_id}, "segments": {"date": "2025-01-02"}}
+        ]
+    }
+
+    if next_page_token:
+        response["nextPageToken"] = next_page_token
+
+    return response
+
+
+class TestPageCheckpoint(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch(
+            "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+            side_effect=lambda request: request,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_records(self, state):
+        catalog = {"streams": [{"tap_stream_id": PagedStream.name}]}
+        tap = TapGoogleAds(config=CONFIG, catalog=catalog, state=state)
+        stream = PagedStream(tap=tap)
+        stream.context = CONTEXT
+        records = []
+
+        try:
+            for record in stream.get_records(CONTEXT):
+                records.append(record["campaign__id"])
+        except RetriableAPIError:
+            pass
+
+        return records, stream.get_context_state(CONTEXT)
+
+    @responses.activate
+    def test_resume_from_last_completed_page(self):
+        responses.add(responses.POST, SEARCH_URL, json=page("1", "page-2"))
+        responses.add(responses.POST, SEARCH_URL, json=page("2", "page-3"))
+        responses.add(responses.POST, SEARCH_URL, status=500, json={})
+
+        with mock.patch.object(PagedStream, "backoff_max_tries", return_value=1):
+            records, state = self._get_records({})
+
+        self.assertEqual(records, ["1", "2"])
+        self.assertEqual(state[PAGE_CHECKPOINT_STATE_KEY]["page_token"], "page-3")
+
+        # the bookmark moved on, but the interrupted query is resumed unchanged
+        state["replication_key"] = PagedStream.replication_key
+        state["replication_key_value"] = "2025-01-02"
+        state["starting_replication_value"] = "2025-01-02"
+        query = json.loads(responses.calls[0].request.body)["query"]
+
+        responses.reset()
+        responses.add(responses.POST, SEARCH_URL, json=page("3"))
+
+        records, state = self._get_records(
+            {"bookmarks": {PagedStream.name: {"partitions": [state]}}}
+        )
+
+        self.assertEqual(records, ["3"])
+        self.assertNotIn(PAGE_CHECKPOINT_STATE_KEY, state)
+        self.assertIn("pageToken=page-3", responses.calls[0].request.url)
+        self.assertEqual(json.loads(responses.calls[0].request.body)["query"], query)
+
+    @responses.activate
+    def test_invalid_page_token_restarts_query(self):
+        responses.add(
+            responses.POST,
+            SEARCH_URL,
+            status=400,
+            json={
+                "error": {
+                    "details": [
+                        {
+                            "errors": [
+                                {"errorCode": {"requestError": "EXPIRED_PAGE_TOKEN"}}
+                            ]
+                        }
+                    ]
+                }
+            },
+        )
+        responses.add(responses.POST, SEARCH_URL, json=page("1"))
+
+        catalog = {"streams": [{"tap_stream_id": PagedStream.name}]}
+        stream = PagedStream(tap=TapGoogleAds(config=CONFIG, catalog=catalog))
+        stream.context = CONTEXT
+        payload = stream.prepare_request_payload(CONTEXT, None)
+
+        checkpoint = {
+            "query": stream._query_fingerprint(payload),
+            "start_date": stream.start_date,
+            "page_token": "page-2",
+            "checkpointed_at": "2025-01-31T00:00:00+00:00",
+        }
+        stream.get_context_state(CONTEXT)[PAGE_CHECKPOINT_STATE_KEY] = checkpoint
+
+        records = [r["campaign__id"] for r in stream.get_records(CONTEXT)]
+
+        self.assertEqual(records, ["1"])
+        self.assertNotIn("pageToken", responses.calls[1].request.url)
@@ -0,0 +1,150 @@
+import io
+import unittest
+from unittest import mock
+
+import responses
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.plan import QueryPlan
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+}
+
+CUSTOMER_CONTEXTS = [
+    {"customer_id": "2", "parent_customer_id": "1"},
+    {"customer_id": "3", "parent_customer_id": "1"},
+]
+
+
+SEARCH_URL = "https://googleads.googleapis.com/v22/customers/{}/googleAds:search"
+
+
+class TestQueryPlan(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch(
+            "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+            side_effect=lambda request: request,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(
+            DynamicQueryStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {f: {"name": f} for f in fields},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch(
+            "tap_googleads.plan.resolve_customer_contexts",
+            return_value=CUSTOMER_CONTEXTS,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_plan_queries_per_stream_and_customer(self):
+        catalog = {
+            "streams": [
+                {"tap_stream_id": "ad_group_ad", "replication_key": "segments__date"},
+                {"tap_stream_id": "geo_target_constant"},
+            ]
+        }
+        state = {
+            "bookmarks": {
+                "ad_group_ad": {
+                    "partitions": [
+                        {
+                            "context": CUSTOMER_CONTEXTS[1],
+                            "replication_key": "segments__date",
+                            "replication_key_value": "2025-01-20",
+                        }
+                    ]
+                }
+            }
+        }
+        tap = TapGoogleAds(config=CONFIG, catalog=catalog, state=state)
+        output = io.StringIO()
+
+        with mock.patch.object(
+            DynamicQueryStream, "estimate_rows", return_value=25000
+        ) as estimate_rows:
+            QueryPlan(tap, estimate_rows=True).write(output)
+
+        self.assertEqual(estimate_rows.call_count, 3)
+
+        table, queries = output.getvalue().split("\n\n")
+        table_rows = [line.split() for line in table.splitlines()]
+
+        self.assertEqual(
+            table_rows,
+            [
+                ["stream", "customer_id", "queries", "rows", "pages"],
+                ["ad_group_ad", "2", "1", "25000", "3"],
+                ["ad_group_ad", "3", "1", "25000", "3"],
+                ["geo_target_constant", "2", "1", "25000", "3"],
+                ["TOTAL", "2", "3", "75000", "9"],
+            ],
+        )
+
+        campaign_queries = [
+            q for q in queries.splitlines() if q.startswith("ad_group_ad")
+        ]
+        self.assertIn("segments.date >= '2025-01-01'", campaign_queries[0])
+        self.assertIn("segments.date >= '2025-01-20'", campaign_queries[1])
+
+    @responses.activate
+    def test_plan_rows_unknown_for_denied_customer(self):
+        responses.add(
+            responses.POST,
+            SEARCH_URL.format("2"),
+            json={"results": [], "totalResultsCount": "25000"},
+        )
+        responses.add(
+            responses.POST,
+            SEARCH_URL.format("3"),
+            status=403,
+            json={
+                "error": {
+                    "code": 403,
+                    "status": "PERMISSION_DENIED",
+                    "details": [
+                        {
+                            "errors": [
+                                {
+                                    "errorCode": {
+                                        "authorizationError": "USER_PERMISSION_DENIED"
+                                    }
+                                }
+                            ]
+                        }
+                    ],
+                }
+            },
+        )
+        catalog = {"streams": [{"tap_stream_id": "ad_group_ad"}]}
+        tap = TapGoogleAds(config=CONFIG, catalog=catalog)
+        output = io.StringIO()
+
+        QueryPlan(tap, estimate_rows=True).write(output)
+
+        table = output.getvalue().split("\n\n")[0]
+        self.assertEqual(
+            [line.split() for line in table.splitlines()],
+            [
+                ["stream", "customer_id", "queries", "rows", "pages"],
+                ["ad_group_ad", "2", "1", "25000", "3"],
+                ["ad_group_ad", "3", "1", "?", "?"],
+                ["TOTAL", "2", "2", "?", "?"],
+            ],
+        )
+        self.assertEqual(tap.denied_customers.reason("3"), "USER_PERMISSION_DENIED")
@@ -0,0 +1,55 @@
+import logging
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from tap_googleads.profiling import StreamProfiler
+
+
+def parent_work():
+    return sum(range(1000))
+
+
+def child_work():
+    return [str(i) for i in range(1000)]
+
+
+class TestStreamProfiler(unittest.TestCase):
+    def test_nested_stream_profiles_are_exclusive(self):
+        self.addCleanup(tracemalloc.stop)
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = StreamProfiler(directory, logging.getLogger(__name__))
+
+            with profiler.profile("parent"):
+                parent_work()
+
+                for _ in range(2):
+                    with profiler.profile("child"):
+                        child_work()
+
+            profiler.write()
+
+            functions = {
+                stream_name: {
+                    function_name
+                    for _, _, function_name in pstats.Stats(
+                        str(Path(directory) / f"{stream_name}.prof")
+                    ).stats
+                }
+                for stream_name in ("parent", "child")
+            }
+            summary = (Path(directory) / "summary.txt").read_text()
+            allocations = (Path(directory) / "allocations.txt").read_text()
+            self.assertFalse(list(Path(directory).glob("*.alloc.txt")))
+
+        self.assertIn("parent_work", functions["parent"])
+        self.assertNotIn("child_work", functions["parent"])
+        self.assertIn("child_work", functions["child"])
+        self.assertIn("=== child ===", summary)
+        # allocations are aggregated per stream
+        self.assertIn("child: 2 syncs", allocations)
+        self.assertIn("parent: 1 syncs", allocations)
+        self.assertIn("top allocation sites:", allocations)
@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.progress import QueryProgress, estimate_remaining, format_duration
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+}
+
+
+class CampaignsStream(DynamicQueryStream):
+    name = "campaigns"
+    schema = {"properties": {}}
+    gaql = "SELECT campaign.id FROM campaign"
+
+
+class TestProgress(unittest.TestCase):
+    def test_total_results_count_requested_for_first_page(self):
+        catalog = {"streams": [{"tap_stream_id": CampaignsStream.name}]}
+        config = {**CONFIG, "progress_log_interval_seconds": 60}
+        stream = CampaignsStream(tap=TapGoogleAds(config=config, catalog=catalog))
+
+        self.assertTrue(
+            stream.prepare_request_payload(None, None)["returnTotalResultsCount"]
+        )
+        self.assertNotIn(
+            "returnTotalResultsCount", stream.prepare_request_payload(None, "page-2")
+        )
+
+        # progress reporting is opt-in
+        stream = CampaignsStream(tap=TapGoogleAds(config=CONFIG, catalog=catalog))
+
+        self.assertNotIn(
+            "returnTotalResultsCount", stream.prepare_request_payload(None, None)
+        )
+
+    def test_query_progress_eta(self):
+        logger = mock.Mock()
+        progress = QueryProgress(logger, "campaigns", "1", interval=3600)
+
+        with mock.patch.object(
+            QueryProgress, "elapsed", new_callable=mock.PropertyMock, return_value=10
+        ):
+            progress.add_page(10000, total_rows=40000)
+
+            self.assertEqual(progress.eta, 30)
+            self.assertEqual(format_duration(progress.eta), "0:00:30")
+            logger.info.assert_not_called()
+
+            progress.log()
+
+        self.assertEqual(logger.info.call_args.args[3:6], (10000, 40000, 1))
+        self.assertIsNone(estimate_remaining(10, 0, 10))
@@ -25,7 +25,11 @@ class TestTapGoogleadsWithProxyOAuthCredentials(unittest.TestCase):
         }
         responses.reset()
         del test_utils.SINGER_MESSAGES[:]
-        TapGoogleAds.write_message = test_utils.accumulate_singer_messages
+        write_message_patcher = mock.patch.object(
+            TapGoogleAds, "write_message", test_utils.accumulate_singer_messages
+        )
+        write_message_patcher.start()
+        self.addCleanup(write_message_patcher.stop)
 
         responses.add(
             responses.POST,
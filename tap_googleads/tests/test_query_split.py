@@ -0,0 +1,241 @@
+import copy
+import unittest
+from collections import Counter
+from datetime import date, timedelta
+from unittest import mock
+
+from singer_sdk._singerlib import RecordMessage
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream, QueryTooLargeError
+from tap_googleads.query_split import (
+    QUERY_SPLIT_STATE_KEY,
+    QueryPiece,
+    plan_query_pieces,
+    remember_query_split,
+    split_query_piece,
+)
+from tap_googleads.streams import CustomerHierarchyStream
+from tap_googleads.tap import TapGoogleAds
+from tap_googleads.tests.benchmark import fields_metadata
+from tap_googleads.tests.stand_in import DEADLINE_EXCEEDED, ApiStandIn
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-08",
+    "progress_log_interval_seconds": 0,
+    "custom_queries": [
+        {
+            "name": "campaign_clicks",
+            "query": "SELECT campaign.id, metrics.clicks, segments.date FROM campaign",
+            "add_date_filter_to_query": True,
+            "replication_key": "segments__date",
+            "primary_keys": ["campaign__id", "segments__date"],
+        }
+    ],
+}
+
+CATALOG = {
+    "streams": [
+        {"tap_stream_id": "accessible_customers"},
+        {"tap_stream_id": "customer_hierarchy"},
+        {"tap_stream_id": "campaign_clicks", "replication_key": "segments__date"},
+    ]
+}
+
+MANAGER_ID = "9000000000"
+CUSTOMER_ID = "1000000000"
+
+
+class TestQueryPieces(unittest.TestCase):
+    def test_split_by_date_then_campaign(self):
+        piece = QueryPiece(date(2025, 1, 1), date(2025, 1, 3))
+
+        self.assertEqual(
+            split_query_piece(piece, [1, 2]),
+            [
+                QueryPiece(date(2025, 1, 1), date(2025, 1, 1)),
+                QueryPiece(date(2025, 1, 2), date(2025, 1, 3)),
+            ],
+        )
+
+        piece = QueryPiece(date(2025, 1, 1), date(2025, 1, 1), min_campaign_id=20)
+
+        self.assertEqual(
+            split_query_piece(piece, [10, 20, 30, 40]),
+            [
+                QueryPiece(date(2025, 1, 1), date(2025, 1, 1), 20, 30),
+                QueryPiece(date(2025, 1, 1), date(2025, 1, 1), 30),
+            ],
+        )
+        self.assertIsNone(split_query_piece(QueryPiece(max_campaign_id=20), [10, 20]))
+
+    def test_plan_remembered_split(self):
+        query_split = remember_query_split(
+            {},
+            [
+                QueryPiece(date(2025, 1, 1), date(2025, 1, 2)),
+                QueryPiece(date(2025, 1, 3), date(2025, 1, 5)),
+            ],
+        )
+        query_split = remember_query_split(
+            query_split,
+            [QueryPiece(max_campaign_id=30), QueryPiece(min_campaign_id=30)],
+        )
+
+        self.assertEqual(query_split, {"days": 2, "campaign_id_boundaries": [30]})
+        self.assertEqual(
+            plan_query_pieces(date(2025, 1, 1), date(2025, 1, 3), query_split),
+            [
+                QueryPiece(date(2025, 1, 1), date(2025, 1, 2), None, 30),
+                QueryPiece(date(2025, 1, 1), date(2025, 1, 2), 30, None),
+                QueryPiece(date(2025, 1, 3), date(2025, 1, 3), None, 30),
+                QueryPiece(date(2025, 1, 3), date(2025, 1, 3), 30, None),
+            ],
+        )
+
+
+class TestQuerySplit(unittest.TestCase):
+    def setUp(self):
+        CustomerHierarchyStream.seen_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.seen_customer_ids.clear)
+
+        patches = [
+            mock.patch(
+                "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+                side_effect=lambda request: request,
+            ),
+            mock.patch.object(
+                DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _sync(self, stand_in, state=None, config=CONFIG, catalog=CATALOG):
+        tap = TapGoogleAds(config=config, catalog=catalog, state=state)
+        records = []
+
+        def write_message(_, message):
+            if not isinstance(message, RecordMessage):
+                return
+
+            if message.stream == "campaign_clicks":
+                records.append(
+                    (message.record["campaign__id"], message.record["segments__date"])
+                )
+            elif message.stream == "click_view_report":
+                records.append(message.record["clickView__gclid"])
+
+        with stand_in.serve(), mock.patch.object(
+            TapGoogleAds, "write_message", write_message
+        ):
+            try:
+                tap.sync_all()
+            finally:
+                CustomerHierarchyStream.seen_customer_ids.clear()
+
+        return tap, records
+
+    def _stand_in(self, max_rows_per_query=None):
+        return ApiStandIn(
+            {MANAGER_ID: [CUSTOMER_ID]},
+            rows_per_customer=8,
+            campaigns_per_customer=4,
+            max_rows_per_query=max_rows_per_query,
+        )
+
+    def _partition_state(self, tap):
+        (partition,) = tap.state["bookmarks"]["campaign_clicks"]["partitions"]
+        return partition
+
+    def test_query_is_split_and_split_is_remembered(self):
+        _, baseline_records = self._sync(self._stand_in())
+
+        stand_in = self._stand_in(max_rows_per_query=3)
+        tap, records = self._sync(stand_in)
+
+        # split by date down to single days, then in two campaign ID ranges
+        self.assertEqual(Counter(records), Counter(baseline_records))
+        self.assertEqual(len(records), 8 * 4)
+        self.assertEqual(records, sorted(records, key=lambda r: r[1]))
+        self.assertEqual(stand_in.requests.count(f"campaign {CUSTOMER_ID}"), 1)
+        self.assertTrue(stand_in.injected_faults[DEADLINE_EXCEEDED])
+
+        partition = self._partition_state(tap)
+        self.assertEqual(partition["replication_key_value"], "2025-01-08")
+        self.assertEqual(
+            partition[QUERY_SPLIT_STATE_KEY],
+            {"days": 1, "campaign_id_boundaries": [int(CUSTOMER_ID) * 1000 + 2]},
+        )
+
+        # the next sync requests the remembered pieces directly
+        state = copy.deepcopy(tap.state)
+        state["bookmarks"]["campaign_clicks"]["partitions"][0].pop(
+            "replication_key_value"
+        )
+        stand_in = self._stand_in(max_rows_per_query=3)
+        _, records = self._sync(stand_in, state)
+
+        self.assertEqual(Counter(records), Counter(baseline_records))
+        self.assertFalse(stand_in.injected_faults)
+        self.assertEqual(stand_in.requests.count(f"report {CUSTOMER_ID}"), 8 * 2)
+
+    def test_unsplittable_query_fails(self):
+        stand_in = ApiStandIn({MANAGER_ID: [CUSTOMER_ID]}, max_rows_per_query=0)
+
+        with self.assertRaises(QueryTooLargeError):
+            self._sync(stand_in)
+
+        # split down to the first day, with a single campaign
+        self.assertEqual(stand_in.requests.count(f"campaign {CUSTOMER_ID}"), 1)
+        self.assertEqual(
+            stand_in.requests.count(f"report {CUSTOMER_ID}"),
+            stand_in.injected_faults[DEADLINE_EXCEEDED],
+        )
+
+    def test_click_view_query_is_split_by_campaign(self):
+        # click views are only available for the last 90 days
+        start_date = date.today() - timedelta(days=3)
+        stand_in = ApiStandIn(
+            {MANAGER_ID: [CUSTOMER_ID]},
+            rows_per_customer=3,
+            campaigns_per_customer=4,
+            max_rows_per_query=3,
+            start_date=start_date,
+        )
+        config = {
+            **CONFIG,
+            "start_date": start_date.isoformat(),
+            "end_date": date.today().isoformat(),
+            "enable_click_view_report_stream": True,
+        }
+        catalog = {
+            "streams": [
+                {"tap_stream_id": "accessible_customers"},
+                {"tap_stream_id": "customer_hierarchy"},
+                {"tap_stream_id": "click_view_report", "replication_key": "date"},
+            ]
+        }
+        tap, records = self._sync(stand_in, config=config, catalog=catalog)
+
+        self.assertEqual(len(records), 3 * 4)
+        self.assertEqual(len(set(records)), 3 * 4)
+
+        # the first day fails and is split, later days are requested in pieces
+        queries = [q for q in stand_in.queries if "FROM click_view" in q]
+        self.assertEqual(len(queries), 1 + 3 * 2)
+        self.assertEqual(len(set(queries)), len(queries))
+        self.assertEqual(stand_in.injected_faults[DEADLINE_EXCEEDED], 1)
+
+        (partition,) = tap.state["bookmarks"]["click_view_report"]["partitions"]
+        self.assertEqual(
+            partition[QUERY_SPLIT_STATE_KEY],
+            {"days": 1, "campaign_id_boundaries": [int(CUSTOMER_ID) * 1000 + 2]},
+        )
@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.record_hashes import HASH_WRITE_BATCH_SIZE, RecordHashStore
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+}
+
+
+class CampaignsStream(DynamicQueryStream):
+    name = "campaigns"
+    primary_keys = ["campaign__id"]
+    schema = {
+        "properties": {
+            "campaign__id": {"type": ["string", "null"]},
+            "campaign__name": {"type": ["string", "null"]},
+            "customer_id": {"type": ["string", "null"]},
+        }
+    }
+
+    rows = []
+
+    def request_records(self, context):
+        yield from self.rows
+
+
+class TestRecordHashStore(unittest.TestCase):
+    def _sync(self, path, rows, customer_id="1"):
+        catalog = {"streams": [{"tap_stream_id": CampaignsStream.name}]}
+        tap = TapGoogleAds(
+            config={**CONFIG, "record_hash_store_path": path}, catalog=catalog
+        )
+        stream = CampaignsStream(tap=tap)
+        stream.rows = rows
+        context = {"customer_id": customer_id}
+
+        return [r["campaign__id"] for r in stream.get_records(context)]
+
+    def test_unchanged_records_are_suppressed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "hashes.db")
+            rows = [
+                {"campaign": {"id": "1", "name": "a"}},
+                {"campaign": {"id": "2", "name": "b"}},
+            ]
+
+            self.assertEqual(self._sync(path, rows), ["1", "2"])
+            self.assertEqual(self._sync(path, rows), [])
+
+            rows[1] = {"campaign": {"id": "2", "name": "c"}}
+            rows.append({"campaign": {"id": "3", "name": "d"}})
+
+            self.assertEqual(self._sync(path, rows), ["2", "3"])
+
+    def test_records_of_other_customers_are_not_suppressed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "hashes.db")
+            rows = [{"campaign": {"id": "1", "name": "a"}}]
+
+            self.assertEqual(self._sync(path, rows, customer_id="1"), ["1"])
+            self.assertEqual(self._sync(path, rows, customer_id="2"), ["1"])
+            self.assertEqual(self._sync(path, rows, customer_id="1"), [])
+
+    def test_store_can_be_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "hashes.db")
+            stores = [RecordHashStore(path), RecordHashStore(path)]
+            self.addCleanup(lambda: [s._connection.close() for s in stores])
+            records = [
+                {"campaign__id": str(i)} for i in range(HASH_WRITE_BATCH_SIZE + 1)
+            ]
+
+            # a store partway through a partition does not block the other
+            for record in records:
+                self.assertTrue(stores[0].update("campaigns", ["campaign__id"], record))
+
+            other_record = {"campaign__id": "other"}
+            self.assertTrue(
+                stores[1].update("campaigns", ["campaign__id"], other_record)
+            )
+            stores[1].commit()
+            stores[0].commit()
+
+            store = RecordHashStore(path)
+            self.addCleanup(store._connection.close)
+            self.assertFalse(
+                any(
+                    store.update("campaigns", ["campaign__id"], r)
+                    for r in [*records, other_record]
+                )
+            )
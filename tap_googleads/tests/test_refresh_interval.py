@@ -0,0 +1,157 @@
+import copy
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from tap_googleads.dynamic_query_stream import (
+    REFRESHED_AT_STATE_KEY,
+    DynamicQueryStream,
+)
+from tap_googleads.streams import CustomerHierarchyStream
+from tap_googleads.tap import TapGoogleAds
+from tap_googleads.tests.benchmark import fields_metadata
+from tap_googleads.tests.stand_in import PERMISSION_DENIED, ApiStandIn, FaultSchedule
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+    "progress_log_interval_seconds": 0,
+    "custom_queries": [
+        {
+            "name": "campaign_clicks",
+            "query": "SELECT campaign.id, metrics.clicks, segments.date FROM campaign",
+            "add_date_filter_to_query": True,
+            "replication_key": "segments__date",
+            "primary_keys": ["campaign__id", "segments__date"],
+        }
+    ],
+    "min_refresh_interval_hours": {"campaign_clicks": 24},
+}
+
+CATALOG = {
+    "streams": [
+        {"tap_stream_id": "accessible_customers"},
+        {"tap_stream_id": "customer_hierarchy"},
+        {"tap_stream_id": "campaign_clicks", "replication_key": "segments__date"},
+        {"tap_stream_id": "geo_target_constant"},
+    ]
+}
+
+CUSTOMER_IDS = ["1000000000", "1000000001"]
+
+
+class TestRefreshInterval(unittest.TestCase):
+    def setUp(self):
+        CustomerHierarchyStream.seen_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.seen_customer_ids.clear)
+
+        patches = [
+            mock.patch(
+                "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+                side_effect=lambda request: request,
+            ),
+            mock.patch.object(
+                DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+            ),
+            mock.patch.object(TapGoogleAds, "write_message"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _sync(self, state=None, config=None, faults=None):
+        stand_in = ApiStandIn({"9000000000": CUSTOMER_IDS}, faults=faults)
+        tap = TapGoogleAds(
+            config={**CONFIG, **(config or {})}, catalog=CATALOG, state=state
+        )
+
+        with stand_in.serve():
+            tap.sync_all()
+
+        CustomerHierarchyStream.seen_customer_ids.clear()
+        return tap, stand_in.requests
+
+    def test_streams_are_skipped_within_refresh_interval(self):
+        tap, requests = self._sync()
+
+        # geotargets are synced for the first customer only
+        self.assertEqual(requests.count(f"report {CUSTOMER_IDS[0]}"), 1)
+        self.assertEqual(requests.count(f"report {CUSTOMER_IDS[1]}"), 1)
+        self.assertEqual(
+            [r for r in requests if r.startswith("geo_target_constant")],
+            [f"geo_target_constant {CUSTOMER_IDS[0]}"],
+        )
+
+        bookmarks = tap.state["bookmarks"]
+        self.assertIn(REFRESHED_AT_STATE_KEY, bookmarks["geo_target_constant"])
+        self.assertNotIn("partitions", bookmarks["geo_target_constant"])
+
+        # synced within the interval
+        _, requests = self._sync(copy.deepcopy(tap.state))
+
+        self.assertFalse([r for r in requests if r.startswith("report")])
+        self.assertFalse([r for r in requests if r.startswith("geo_target_constant")])
+
+        # synced longer than the interval ago
+        state = copy.deepcopy(tap.state)
+        partition = state["bookmarks"]["campaign_clicks"]["partitions"][0]
+        refreshed_at = datetime.fromisoformat(partition[REFRESHED_AT_STATE_KEY])
+        partition[REFRESHED_AT_STATE_KEY] = (
+            refreshed_at - timedelta(hours=25)
+        ).isoformat()
+        _, requests = self._sync(state)
+
+        self.assertEqual(
+            [r for r in requests if r.startswith("report")],
+            [f"report {partition['context']['customer_id']}"],
+        )
+
+    def test_refresh_is_not_recorded_for_failed_sync(self):
+        # a 403 that does not deny access to the customer, e.g. for the developer
+        # token, is logged rather than raised
+        with mock.patch(
+            "tap_googleads.client.denied_customer_error_code", return_value=None
+        ):
+            tap, _ = self._sync(
+                faults=FaultSchedule(customers={CUSTOMER_IDS[1]: PERMISSION_DENIED})
+            )
+
+        partitions = {
+            p["context"]["customer_id"]: p
+            for p in tap.state["bookmarks"]["campaign_clicks"]["partitions"]
+        }
+        self.assertIn(REFRESHED_AT_STATE_KEY, partitions[CUSTOMER_IDS[0]])
+        self.assertNotIn(REFRESHED_AT_STATE_KEY, partitions[CUSTOMER_IDS[1]])
+        self.assertNotIn(CUSTOMER_IDS[1], tap.denied_customers)
+
+    def test_refresh_interval_can_be_disabled(self):
+        tap, _ = self._sync()
+        min_refresh_interval_hours = {"campaign_clicks": 0, "geo_target_constant": 0}
+        _, requests = self._sync(
+            copy.deepcopy(tap.state),
+            {"min_refresh_interval_hours": min_refresh_interval_hours},
+        )
+
+        self.assertEqual(len([r for r in requests if r.startswith("report")]), 2)
+        self.assertEqual(
+            len([r for r in requests if r.startswith("geo_target_constant")]), 1
+        )
+
+    def test_context_is_synced_once_per_run(self):
+        tap, requests = self._sync(
+            config={"min_refresh_interval_hours": {"geo_target_constant": 0}}
+        )
+
+        self.assertEqual(
+            [r for r in requests if r.startswith("geo_target_constant")],
+            [f"geo_target_constant {CUSTOMER_IDS[0]}"],
+        )
+        self.assertIn(
+            REFRESHED_AT_STATE_KEY, tap.state["bookmarks"]["geo_target_constant"]
+        )
@@ -0,0 +1,265 @@
+import io
+import json
+import unittest
+from unittest import mock
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.runner import (
+    SingerOutputMerger,
+    merge_states,
+    partition_customer_ids,
+    prune_sync_seconds,
+    resolve_customers,
+)
+from tap_googleads.streams import AccessibleCustomers, CustomerHierarchyStream
+from tap_googleads.tap import TapGoogleAds
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+}
+
+CATALOG = {
+    "streams": [
+        {"tap_stream_id": "accessible_customers"},
+        {"tap_stream_id": "customer_hierarchy"},
+    ]
+}
+
+MANAGER_ID = "9000000000"
+CUSTOMER_IDS = ["1000000000", "1000000001"]
+
+
+def partition(customer_id, value):
+    return {
+        "context": {"customer_id": customer_id},
+        "replication_key": "segments__date",
+        "replication_key_value": value,
+    }
+
+
+BASE_STATE = {
+    "bookmarks": {
+        "campaign": {
+            "partitions": [
+                partition("1", "2025-01-01"),
+                partition("2", "2025-01-01"),
+            ]
+        }
+    }
+}
+
+
+class TestRunner(unittest.TestCase):
+    def test_partition_customer_ids(self):
+        customer_ids = [str(i) for i in range(10)]
+        weights = {"0": 9, **{c: 1 for c in customer_ids[1:]}}
+        partitions = partition_customer_ids(customer_ids, 3, weights)
+
+        self.assertEqual(sorted(sum(partitions, [])), customer_ids)
+        self.assertEqual(partitions[0], ["0"])
+        self.assertEqual([len(p) for p in partitions[1:]], [5, 4])
+
+        self.assertEqual(len(partition_customer_ids(["1"], 3)), 1)
+
+    def test_merge_states(self):
+        worker_states = [
+            {
+                "bookmarks": {
+                    "campaign": {
+                        "partitions": [
+                            partition("1", "2025-02-01"),
+                            partition("2", "2025-01-01"),
+                        ]
+                    }
+                }
+            },
+            {
+                "bookmarks": {
+                    "campaign": {
+                        "partitions": [
+                            partition("1", "2025-01-01"),
+                            partition("2", "2025-02-02"),
+                            partition("3", "2025-02-03"),
+                        ]
+                    }
+                }
+            },
+        ]
+
+        merged_state = merge_states(BASE_STATE, worker_states)
+
+        self.assertEqual(
+            merged_state["bookmarks"]["campaign"]["partitions"],
+            [
+                partition("1", "2025-02-01"),
+                partition("2", "2025-02-02"),
+                partition("3", "2025-02-03"),
+            ],
+        )
+        self.assertEqual(
+            BASE_STATE["bookmarks"]["campaign"]["partitions"][0],
+            partition("1", "2025-01-01"),
+        )
+
+    def test_merge_states_merges_objects_by_key(self):
+        base_state = {"bookmarks": {"customer_hierarchy": {"sync_seconds": {"1": 5}}}}
+        worker_states = [
+            {"bookmarks": {"customer_hierarchy": {"sync_seconds": {"1": 10}}}},
+            {"bookmarks": {"customer_hierarchy": {"sync_seconds": {"1": 5, "2": 20}}}},
+        ]
+
+        merged_state = merge_states(base_state, worker_states)
+
+        self.assertEqual(
+            merged_state["bookmarks"]["customer_hierarchy"],
+            {"sync_seconds": {"1": 10, "2": 20}},
+        )
+
+    def test_prune_sync_seconds(self):
+        state = {
+            "bookmarks": {"customer_hierarchy": {"sync_seconds": {"1": 5, "2": 6}}}
+        }
+
+        prune_sync_seconds(state, {"2", "3"})
+
+        self.assertEqual(
+            state["bookmarks"]["customer_hierarchy"], {"sync_seconds": {"2": 6}}
+        )
+
+    def test_output_merger(self):
+        output = io.StringIO()
+        merger = SingerOutputMerger(BASE_STATE, output)
+        schema = {
+            "type": "SCHEMA",
+            "stream": "campaign",
+            "schema": {},
+            "key_properties": [],
+        }
+        record = {"type": "RECORD", "stream": "campaign", "record": {"id": 1}}
+
+        for worker in (0, 1):
+            merger.process(worker, json.dumps(schema))
+            merger.process(worker, json.dumps(record))
+
+        merger.process(
+            1,
+            json.dumps(
+                {
+                    "type": "STATE",
+                    "value": {
+                        "bookmarks": {
+                            "campaign": {"partitions": [partition("3", "2025-02-03")]}
+                        }
+                    },
+                }
+            ),
+        )
+
+        messages = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        self.assertEqual(
+            [m["type"] for m in messages], ["SCHEMA", "RECORD", "RECORD", "STATE"]
+        )
+        self.assertEqual(
+            len(messages[-1]["value"]["bookmarks"]["campaign"]["partitions"]), 3
+        )
+
+    def test_output_merger_merges_state_changes(self):
+        merger = SingerOutputMerger(BASE_STATE, io.StringIO())
+
+        for worker, customer_id, value in (
+            (0, "1", "2025-02-01"),
+            (1, "2", "2025-02-02"),
+            (0, "1", "2025-02-03"),
+        ):
+            state = {
+                "bookmarks": {
+                    "campaign": {
+                        "partitions": [
+                            partition("1", "2025-01-01"),
+                            partition("2", "2025-01-01"),
+                            partition(customer_id, value),
+                        ]
+                    }
+                }
+            }
+            merger.process(worker, json.dumps({"type": "STATE", "value": state}))
+
+        self.assertEqual(
+            merger.state["bookmarks"]["campaign"]["partitions"],
+            [partition("1", "2025-02-03"), partition("2", "2025-02-02")],
+        )
+        self.assertEqual(
+            merger.state, merge_states(BASE_STATE, merger.worker_states.values())
+        )
+
+
+class TestResolvedCustomers(unittest.TestCase):
+    def setUp(self):
+        for customer_ids in (
+            CustomerHierarchyStream.seen_customer_ids,
+            CustomerHierarchyStream.skipped_customer_ids,
+        ):
+            customer_ids.clear()
+            self.addCleanup(customer_ids.clear)
+
+        patch = mock.patch.object(
+            DynamicQueryStream,
+            "get_fields_metadata",
+            side_effect=lambda fields: {f: {"name": f} for f in fields},
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_worker_syncs_resolved_customers(self):
+        rows = [
+            {"customerClient": {"id": c, "manager": False, "status": "ENABLED"}}
+            for c in CUSTOMER_IDS
+        ]
+        tap = TapGoogleAds(config=CONFIG, catalog=CATALOG)
+
+        with mock.patch.object(
+            AccessibleCustomers,
+            "get_records",
+            return_value=[{"resourceNames": [f"customers/{MANAGER_ID}"]}],
+        ), mock.patch.object(
+            CustomerHierarchyStream, "request_records", return_value=rows
+        ) as request_records:
+            customers = resolve_customers(tap)
+
+            # as written to the worker file, with the last customer resolved as dormant
+            customers[-1]["dormant"] = True
+            worker = TapGoogleAds(
+                config={**CONFIG, "customer_ids": CUSTOMER_IDS}, catalog=CATALOG
+            )
+            worker.resolved_customers = json.loads(
+                json.dumps({c["context"]["customer_id"]: c for c in customers})
+            )
+            request_records.reset_mock()
+
+            stream = worker.streams[CustomerHierarchyStream.name]
+            manager_context = {"customer_id": MANAGER_ID}
+            contexts = [
+                child_context
+                for record in stream.get_records(manager_context)
+                for child_context in stream.generate_child_contexts(
+                    record, manager_context
+                )
+            ]
+
+        # the hierarchy is not requested, nor are dormant customers checked again
+        request_records.assert_not_called()
+        self.assertEqual(
+            contexts,
+            [
+                {"customer_id": c, "parent_customer_id": MANAGER_ID}
+                for c in CUSTOMER_IDS
+            ],
+        )
+        self.assertEqual(contexts, [c["context"] for c in customers])
+        self.assertEqual(worker.dormant_customer_ids, {CUSTOMER_IDS[-1]})
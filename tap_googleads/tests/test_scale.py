@@ -0,0 +1,169 @@
+"""Offline scale test of syncing large customer hierarchies.
+
+The Google Ads API is replaced by a local stand-in (see `stand_in.py`) serving
+several managers, each with its own client customers. Hierarchies of two sizes
+are synced, so that memory and state growth per customer can be told apart from
+fixed overhead.
+
+The larger hierarchy has 200 client customers by default; set
+`TAP_GOOGLEADS_SCALE_CUSTOMERS` to test e.g. 10000.
+"""
+
+import json
+import os
+import tracemalloc
+import unittest
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from unittest import mock
+
+from singer_sdk._singerlib import RecordMessage
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.streams import CustomerHierarchyStream
+from tap_googleads.tap import TapGoogleAds
+from tap_googleads.tests.benchmark import fields_metadata
+from tap_googleads.tests.stand_in import ApiStandIn
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+    "progress_log_interval_seconds": 0,
+    "custom_queries": [
+        {
+            "name": "campaign_clicks",
+            "query": "SELECT campaign.id, metrics.clicks, segments.date FROM campaign",
+            "add_date_filter_to_query": True,
+            "replication_key": "segments__date",
+            "primary_keys": ["campaign__id", "segments__date"],
+        }
+    ],
+}
+
+CUSTOMERS = int(os.environ.get("TAP_GOOGLEADS_SCALE_CUSTOMERS", 200))
+MANAGERS = 4
+HIERARCHY_PAGE_SIZE = 50
+
+# budgets per client customer, beyond the fixed overhead of a sync
+MAX_PEAK_MEMORY_GROWTH_PER_CUSTOMER = 32 * 2**10
+MAX_STATE_BYTES_PER_CUSTOMER = 256
+
+CATALOG = {
+    "streams": [
+        {"tap_stream_id": "accessible_customers"},
+        {"tap_stream_id": "customer_hierarchy"},
+        {"tap_stream_id": "campaign_clicks", "replication_key": "segments__date"},
+    ]
+}
+
+
+def hierarchy(customers: int, managers: int, first_id: int) -> Dict[str, List[str]]:
+    """Return managers with client customers spread evenly across them."""
+    manager_ids = [str(9000000000 + first_id + i) for i in range(managers)]
+
+    return {
+        manager_id: [
+            str(1000000000 + first_id + i) for i in range(j, customers, managers)
+        ]
+        for j, manager_id in enumerate(manager_ids)
+    }
+
+
+@dataclass
+class SyncResult:
+    peak_memory: int
+    state_bytes: int
+    requests: int = 0
+    requests_before_first_record: Optional[int] = None
+    record_customer_ids: set = field(default_factory=set)
+
+
+class TestHierarchyScale(unittest.TestCase):
+    def setUp(self):
+        for customer_ids in (
+            CustomerHierarchyStream.seen_customer_ids,
+            CustomerHierarchyStream.skipped_customer_ids,
+        ):
+            customer_ids.clear()
+            self.addCleanup(customer_ids.clear)
+
+        patches = [
+            mock.patch(
+                "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+                side_effect=lambda request: request,
+            ),
+            mock.patch.object(
+                DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _sync(self, customers: int, first_id: int) -> SyncResult:
+        stand_in = ApiStandIn(
+            hierarchy(customers, MANAGERS, first_id), page_size=HIERARCHY_PAGE_SIZE
+        )
+        tap = TapGoogleAds(config=CONFIG, catalog=CATALOG)
+        result = SyncResult(peak_memory=0, state_bytes=0)
+
+        def write_message(_, message):
+            if not (
+                isinstance(message, RecordMessage)
+                and message.stream == "campaign_clicks"
+            ):
+                return
+
+            result.record_customer_ids.add(message.record["customer_id"])
+
+            if result.requests_before_first_record is None:
+                result.requests_before_first_record = len(stand_in.requests)
+
+        with stand_in.serve(), mock.patch.object(
+            TapGoogleAds, "write_message", write_message
+        ):
+            tracemalloc.start()
+
+            try:
+                tap.sync_all()
+                result.peak_memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        result.requests = len(stand_in.requests)
+        result.state_bytes = len(json.dumps(tap.state))
+
+        self.assertEqual(result.record_customer_ids, set(stand_in.client_ids))
+        self.assertEqual(
+            len(CustomerHierarchyStream.seen_customer_ids), customers + MANAGERS
+        )
+        self.assertFalse(CustomerHierarchyStream.skipped_customer_ids)
+        CustomerHierarchyStream.seen_customer_ids.clear()
+
+        return result
+
+    def test_large_hierarchy(self):
+        customers = max(CUSTOMERS // 2, MANAGERS)
+        small = self._sync(customers, first_id=0)
+        large = self._sync(2 * customers, first_id=customers)
+
+        self.assertLessEqual(
+            (large.peak_memory - small.peak_memory) / customers,
+            MAX_PEAK_MEMORY_GROWTH_PER_CUSTOMER,
+        )
+        self.assertLessEqual(
+            (large.state_bytes - small.state_bytes) / customers,
+            MAX_STATE_BYTES_PER_CUSTOMER,
+        )
+
+        # customers are synced as soon as the hierarchy of their manager is read,
+        # before the hierarchies of other managers are requested
+        hierarchy_pages = -(-(2 * customers // MANAGERS + 1) // HIERARCHY_PAGE_SIZE)
+        self.assertEqual(large.requests_before_first_record, 1 + hierarchy_pages + 1)
+        self.assertLess(large.requests_before_first_record, large.requests / 2)
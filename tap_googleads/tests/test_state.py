@@ -0,0 +1,196 @@
+import json
+import unittest
+from unittest import mock
+
+from singer_sdk._singerlib import StateMessage
+from singer_sdk._singerlib.encoding import SimpleSingerWriter
+
+from tap_googleads.dynamic_query_stream import DynamicQueryStream
+from tap_googleads.state import COMPACT_PARTITIONS_KEY, compact_state, expand_state
+from tap_googleads.streams import CustomerHierarchyStream
+from tap_googleads.tap import TapGoogleAds
+from tap_googleads.tests.benchmark import fields_metadata
+from tap_googleads.tests.stand_in import ApiStandIn
+
+CONFIG = {
+    "oauth_credentials": {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "refresh_token": "test_refresh_token",
+    },
+    "developer_token": "test_developer_token",
+    "start_date": "2025-01-01",
+    "end_date": "2025-01-31",
+    "progress_log_interval_seconds": 0,
+    "custom_queries": [
+        {
+            "name": "campaign_clicks",
+            "query": "SELECT campaign.id, metrics.clicks, segments.date FROM campaign",
+            "add_date_filter_to_query": True,
+            "replication_key": "segments__date",
+            "primary_keys": ["campaign__id", "segments__date"],
+        }
+    ],
+}
+
+CATALOG = {
+    "streams": [
+        {"tap_stream_id": "accessible_customers"},
+        {"tap_stream_id": "customer_hierarchy"},
+        {"tap_stream_id": "campaign_clicks", "replication_key": "segments__date"},
+    ]
+}
+
+
+def partition(customer_id, parent_customer_id=None, **values):
+    context = {"customer_id": customer_id}
+
+    if parent_customer_id:
+        context["parent_customer_id"] = parent_customer_id
+
+    return {
+        "context": context,
+        "replication_key": "segments__date",
+        "replication_key_value": "2025-01-31",
+        **values,
+    }
+
+
+def sorted_partitions(state):
+    partitions = state["bookmarks"]["campaign_clicks"].get("partitions", [])
+    return sorted(partitions, key=lambda p: json.dumps(p, sort_keys=True))
+
+
+STATE = {
+    "bookmarks": {
+        "campaign_clicks": {
+            "partitions": [
+                partition("1", "9"),
+                partition("2", "9", replication_key_value="2025-01-30"),
+                partition(
+                    "3", "8", progress_markers={"Note": "Progress is not resumable."}
+                ),
+                partition("4"),
+                # synced under another parent before
+                partition("1", "8", replication_key_value="2025-01-01"),
+                {"context": {"customer_id": "5", "date": "2025-01-01"}},
+            ]
+        },
+        "accessible_customers": {},
+        "campaign_history": {"replication_key_value": "2025-01-31"},
+    }
+}
+
+
+class TestCompactState(unittest.TestCase):
+    def test_round_trip(self):
+        state = compact_state(STATE)
+        compact_partitions = state["bookmarks"]["campaign_clicks"][
+            COMPACT_PARTITIONS_KEY
+        ]
+
+        self.assertEqual(
+            compact_partitions["defaults"],
+            {
+                "replication_key": "segments__date",
+                "replication_key_value": "2025-01-31",
+            },
+        )
+        self.assertEqual(compact_partitions["parents"], {"9": ["1", "2"], "8": ["3"]})
+        self.assertEqual(compact_partitions["customers"]["1"], {})
+        self.assertEqual(compact_partitions["customers"]["2"], "2025-01-30")
+        self.assertEqual(len(state["bookmarks"]["campaign_clicks"]["partitions"]), 2)
+        self.assertEqual(
+            sorted_partitions(expand_state(state)), sorted_partitions(STATE)
+        )
+        self.assertEqual(
+            state["bookmarks"]["campaign_history"],
+            STATE["bookmarks"]["campaign_history"],
+        )
+
+    def test_compact_state_is_smaller(self):
+        state = {
+            "bookmarks": {
+                "campaign_clicks": {
+                    "partitions": [
+                        partition(str(1000000000 + i), "9000000000")
+                        for i in range(1000)
+                    ]
+                }
+            }
+        }
+
+        self.assertLess(
+            len(json.dumps(compact_state(state))), len(json.dumps(state)) / 3
+        )
+
+    def test_compact_state_is_loaded(self):
+        tap = TapGoogleAds(config=CONFIG, catalog=CATALOG, state=compact_state(STATE))
+
+        self.assertEqual(sorted_partitions(tap.state), sorted_partitions(STATE))
+
+
+class TestStateMessages(unittest.TestCase):
+    def setUp(self):
+        CustomerHierarchyStream.seen_customer_ids.clear()
+        self.addCleanup(CustomerHierarchyStream.seen_customer_ids.clear)
+
+        patches = [
+            mock.patch(
+                "tap_googleads.auth.ProactiveRefreshMixin.authenticate_request",
+                side_effect=lambda request: request,
+            ),
+            mock.patch.object(
+                DynamicQueryStream, "get_fields_metadata", side_effect=fields_metadata
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _state_messages(self, **config):
+        stand_in = ApiStandIn(
+            {"9000000000": [str(1000000000 + i) for i in range(10)]},
+            rows_per_customer=3,
+        )
+        tap = TapGoogleAds(config={**CONFIG, **config}, catalog=CATALOG)
+        states = []
+
+        # messages as written, after the tap has compacted state
+        def write_message(_, message):
+            if isinstance(message, StateMessage):
+                states.append(message.value)
+
+        with stand_in.serve(), mock.patch.object(
+            SimpleSingerWriter, "write_message", write_message
+        ):
+            tap.sync_all()
+
+        CustomerHierarchyStream.seen_customer_ids.clear()
+        return tap, states
+
+    def test_state_messages_are_throttled(self):
+        _, states = self._state_messages()
+        tap, throttled_states = self._state_messages(
+            state_message_interval_seconds=3600
+        )
+
+        self.assertGreater(len(states), 10)
+        # the initial state, and the final state withheld until the end of the sync
+        self.assertEqual(len(throttled_states), 2)
+        self.assertEqual(
+            sorted_partitions(throttled_states[-1]), sorted_partitions(states[-1])
+        )
+        self.assertEqual(
+            sorted_partitions(throttled_states[-1]), sorted_partitions(tap.state)
+        )
+
+    def test_compact_state_messages(self):
+        tap, states = self._state_messages(compact_state=True)
+        stream_state = states[-1]["bookmarks"]["campaign_clicks"]
+
+        self.assertNotIn("partitions", stream_state)
+        self.assertEqual(len(stream_state[COMPACT_PARTITIONS_KEY]["customers"]), 10)
+        self.assertEqual(
+            sorted_partitions(expand_state(states[-1])), sorted_partitions(tap.state)
+        )